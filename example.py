@@ -56,6 +56,8 @@ def run_example():
     print(f"관련 키워드: {', '.join(bug_analysis.get('keywords', ['없음']))}")
     print(f"의심 함수: {', '.join(bug_analysis.get('suspected_functions', ['없음']))}")
     
+    analyzer.close()
+    
     print("\n[✅] 예제 실행 완료")
     print("\n실제 사용 시에는 use_multi_llm_analyzer.py 파일을 실행하여 전체 분석 파이프라인을 사용하세요.")
     print("예시: python use_multi_llm_analyzer.py --bug_report 버그파일.txt --source_dir 소스코드경로")
@@ -1,18 +1,360 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import logging
 import os
+import re
+import sys
 import time
-from typing import List, Dict, Any, Tuple, Optional
+import hashlib
+import heapq
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Optional, Callable, Iterable, Iterator
+
+try:
+    import orjson as _json_fast  # 빠른 JSON 인코딩/디코딩 (선택 사항)
+except ImportError:
+    _json_fast = json
+
+try:
+    import ahocorasick  # pyahocorasick (선택 사항)
+except ImportError:
+    ahocorasick = None
+
+try:
+    import numpy as np  # TF-IDF 사전 필터 (선택 사항)
+    from sklearn.feature_extraction.text import TfidfVectorizer
+except ImportError:
+    np = None
+    TfidfVectorizer = None
+
+try:
+    import charset_normalizer  # 인코딩 감지 (선택 사항)
+except ImportError:
+    charset_normalizer = None
+
+class _ConsoleSafeFormatter(logging.Formatter):
+    """
+    콘솔 인코딩으로 출력할 수 없는 문자(cp949 콘솔의 이모지 등)를 제거하는 포매터
+    UTF 계열 콘솔에서는 메시지를 그대로 출력
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        encoding = getattr(sys.stdout, 'encoding', None) or 'utf-8'
+        if encoding.lower().startswith('utf'):
+            return message
+        return message.encode(encoding, errors='ignore').decode(encoding)
+
+def get_logger() -> logging.Logger:
+    """
+    분석기 공용 로거 ('llm_analyzer')
+    처음 호출될 때 stdout 핸들러를 INFO 레벨로 한 번만 등록
+    """
+    logger = logging.getLogger('llm_analyzer')
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(_ConsoleSafeFormatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+class TokenBucket:
+    """
+    초당 rps개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷 (스레드 안전)
+    penalize()를 호출하면 일정 시간 동안 채워지는 속도를 줄임
+    rps가 0이면 속도 제한 없이 항상 바로 토큰을 줌
+    """
+    
+    def __init__(self, rps: float, burst: int):
+        if rps < 0:
+            raise ValueError(f"rps는 0 이상이어야 합니다: {rps}")
+        self.rps = rps
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._penalty_factor = 1.0
+        self._penalty_until = 0.0
+        self._cond = threading.Condition()
+    
+    def _rate(self, now: float) -> float:
+        if now < self._penalty_until:
+            return self.rps * self._penalty_factor
+        self._penalty_factor = 1.0
+        return self.rps
+    
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate(now))
+        self._updated = now
+    
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        # 제한 없음 (채워지는 속도가 0이라 기다려도 토큰이 생기지 않음)
+        if self.rps == 0:
+            return
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                self._cond.wait((1 - self._tokens) / self._rate(now))
+    
+    def penalize(self, factor: float = 0.5, duration: float = 10.0):
+        """duration초 동안 채워지는 속도를 factor배로 줄이고 쌓인 토큰을 비움 (반복 호출 시 누적)"""
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            self._penalty_factor = max(self._penalty_factor * factor, 1 / 16)
+            self._penalty_until = now + duration
+            self._tokens = min(self._tokens, 0.0)
+
+class CircuitBreaker:
+    """
+    연속 실패가 fail_threshold회에 이르면 recovery_timeout초 동안 요청을 차단하는 서킷 브레이커
+    차단 시간이 지나면 요청 하나를 시험 삼아 허용하고, 성공하면 다시 닫힘
+    """
+    
+    def __init__(self, fail_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.fail_threshold = fail_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+    
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+    
+    def allow(self) -> bool:
+        """지금 요청을 보내도 되는지 여부"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at >= self.recovery_timeout:
+                # 시험 요청 하나만 통과시키고 나머지는 다시 recovery_timeout 동안 차단
+                self._opened_at = now
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_threshold:
+                self._opened_at = time.monotonic()
+
+class StreamingJsonParser:
+    """
+    조각조각 도착하는 JSON 텍스트를 점진적으로 파싱하는 스택 기반 파서
+    
+    feed()로 텍스트를 넣을 때마다 새로 완성된 값의 (경로, 값) 목록을 반환합니다.
+    첫 '{' 또는 '[' 이전의 텍스트(```json 등)는 무시하고, 작은따옴표 문자열,
+    따옴표 없는 키, Python 리터럴(True/False/None), 끝에 붙은 쉼표도 허용합니다.
+    value 속성은 아직 닫히지 않은 괄호를 닫힌 것으로 간주한 현재까지의 값입니다.
+    """
+    
+    _LITERALS = {
+        'true': True, 'false': False, 'null': None,
+        'True': True, 'False': False, 'None': None
+    }
+    _DELIMITERS = ' \t\r\n,:]}'
+    
+    def __init__(self):
+        self._buffer = ""
+        self._stack = []  # [컨테이너, 경로, 대기 중인 키] 목록
+        self._started = False
+        self.value = None
+        self.done = False
+    
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """텍스트 조각을 추가하고 새로 완성된 (경로, 값) 목록 반환"""
+        events = []
+        if self.done:
+            return events
+        
+        buf = self._buffer + text
+        i, n = 0, len(buf)
+        
+        while i < n and not self.done:
+            ch = buf[i]
+            
+            # 첫 JSON 괄호 이전의 텍스트는 건너뜀
+            if not self._started:
+                if ch in '{[':
+                    self._started = True
+                else:
+                    i += 1
+                continue
+            
+            if ch in ' \t\r\n,:':
+                i += 1
+            elif ch in '{[':
+                container = {} if ch == '{' else []
+                path = self._attach(container)
+                self._stack.append([container, path, None])
+                i += 1
+            elif ch in '}]':
+                if self._stack:
+                    container, path, _ = self._stack.pop()
+                    events.append((path, container))
+                    if not self._stack:
+                        self.done = True
+                i += 1
+            elif ch in '"\'':
+                end = self._find_string_end(buf, i)
+                if end < 0:
+                    break  # 문자열이 아직 닫히지 않음
+                value = self._decode_string(buf[i:end + 1])
+                i = end + 1
+                
+                frame = self._stack[-1] if self._stack else None
+                if frame is not None and isinstance(frame[0], dict) and frame[2] is None:
+                    frame[2] = value  # 객체의 키
+                else:
+                    events.append((self._attach(value), value))
+            else:
+                j = i
+                while j < n and buf[j] not in self._DELIMITERS:
+                    j += 1
+                if j == n:
+                    break  # 숫자/리터럴이 아직 끝나지 않았을 수 있음
+                token = buf[i:j]
+                i = j
+                
+                # 따옴표 없는 객체 키 허용 ({key: 1})
+                frame = self._stack[-1] if self._stack else None
+                if frame is not None and isinstance(frame[0], dict) and frame[2] is None:
+                    frame[2] = token
+                    continue
+                
+                value = self._decode_scalar(token)
+                events.append((self._attach(value), value))
+        
+        self._buffer = buf[i:] if not self.done else ""
+        return events
+    
+    def _attach(self, value: Any) -> str:
+        """현재 컨테이너에 값을 붙이고 그 값의 경로 반환"""
+        if not self._stack:
+            self.value = value
+            return "$"
+        
+        frame = self._stack[-1]
+        container, path = frame[0], frame[1]
+        if isinstance(container, dict):
+            key = frame[2] if frame[2] is not None else ""
+            container[key] = value
+            frame[2] = None
+            return f"{path}.{key}"
+        
+        container.append(value)
+        return f"{path}[{len(container) - 1}]"
+    
+    @staticmethod
+    def _find_string_end(buf: str, start: int) -> int:
+        """start 위치의 따옴표와 짝이 맞는 닫는 따옴표 위치 (없으면 -1)"""
+        quote = buf[start]
+        i = start + 1
+        while i < len(buf):
+            if buf[i] == '\\':
+                i += 2
+                continue
+            if buf[i] == quote:
+                return i
+            i += 1
+        return -1
+    
+    @staticmethod
+    def _decode_string(token: str) -> str:
+        if token[0] == "'":
+            body = token[1:-1].replace("\\'", "'").replace('"', '\\"')
+            token = f'"{body}"'
+        try:
+            return json.loads(token, strict=False)
+        except ValueError:
+            return token[1:-1]
+    
+    @classmethod
+    def _decode_scalar(cls, token: str) -> Any:
+        if token in cls._LITERALS:
+            return cls._LITERALS[token]
+        try:
+            return json.loads(token)
+        except ValueError:
+            return token
+
 
 class LLMCodeAnalyzer:
     """
     LLM을 사용하여 버그 리포트와 소스코드의 관련성을 분석하는 클래스
     """
     
+    DEFAULT_SYSTEM_PROMPT = "당신은 전문 소프트웨어 개발자이자 버그 분석가입니다. 버그 리포트와 코드를 분석하여 문제 원인을 파악합니다."
+    
+    # 스트리밍 중 관련성 점수가 이보다 낮으면 나머지 생성을 취소
+    EARLY_EXIT_SCORE = 3
+    
+    # 한 번의 요청에 묶어서 평가할 코드 청크 수와 배치 응답 토큰 한도
+    # (배치에 담기는 코드 길이는 BATCH_MAX_TOKENS * 4 문자 이내로 제한)
+    CHUNK_BATCH_SIZE = 4
+    BATCH_MAX_TOKENS = 2000
+    
+    # TF-IDF 사전 필터가 LLM 분석 후보로 남기는 코드 청크 수
+    PREFILTER_TOP_K = 10
+    
+    # 프롬프트에 넣는 컨텍스트 지식의 대략적인 토큰 한도 (문자 수 // 4 기준)
+    CONTEXT_TOKEN_BUDGET = 800
+    
+    # 느슨한 JSON 보정용 패턴: 문자열은 그대로 두고 그 밖의 Python 리터럴,
+    # 따옴표 없는 키, 닫는 괄호 앞의 쉼표만 골라냄
+    _CODE_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.S)
+    _FUZZY_TOKEN_RE = re.compile(
+        r'"(?:\\.|[^"\\])*"'
+        r"|'(?:\\.|[^'\\])*'"
+        r'|\b(?:True|False|None)\b'
+        r'|(?<=[{,])\s*[A-Za-z_][A-Za-z0-9_]*\s*(?=:)'
+        r'|,\s*(?=[}\]])',
+        re.S
+    )
+    _PY_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+    
+    # 파일명 키워드 → 스크립트 카테고리 (위에서부터 먼저 일치하는 항목 사용)
+    _CATEGORY_TABLE = (
+        ('dialogs', ('dialog', 'conversation', 'talk')),
+        ('quests', ('quest', 'mission')),
+        ('items', ('item', 'equip', 'weapon')),
+        ('skills', ('skill', 'ability', 'spell')),
+    )
+    # 카테고리별 이름 그룹 정규식 (전방 탐색으로 겹치는 키워드도 모두 찾음)
+    _CATEGORY_RE = re.compile('(?=' + '|'.join(f"(?P<{category}>{'|'.join(map(re.escape, keywords))})"
+                                               for category, keywords in _CATEGORY_TABLE) + ')')
+    
+    # 스크립트 파일 한 줄 파싱 패턴 (줄 앞뒤 공백은 패턴에서 제외)
+    # 그룹: 1=섹션 이름([섹션]), 2/3=키/값(key=value), 4=일반 텍스트 (// 주석 줄은 그룹 없음)
+    _SCRIPT_LINE_RE = re.compile(
+        r'^[^\S\n]*(?://[^\n]*|\[([^\n]*)\]|([^\n=]*?)[^\S\n]*=[^\S\n]*([^\n]*?)|([^\n]*?))[^\S\n]*$',
+        re.MULTILINE)
+    
     def __init__(self, api_url: str = "http://192.168.102.166:1234", 
                  model_name: str = "eeve-korean-instruct-10.8b-v1.0",
                  knowledge_file: str = None,
-                 script_dir: str = None):
+                 script_dir: str = None,
+                 max_workers: int = 8,
+                 cache_dir: Optional[str] = ".llm_cache",
+                 requests_per_second: float = 10.0,
+                 skip_connection_test: bool = False):
         """
         LLM 코드 분석기 초기화
         
@@ -21,10 +363,50 @@ class LLMCodeAnalyzer:
             model_name: 사용할 모델 이름
             knowledge_file: 개발자 지식 파일 경로 (없으면 기본값 사용)
             script_dir: 게임 스크립트 파일 디렉토리 경로
+            max_workers: 동시에 보낼 수 있는 최대 LLM 요청 수
+            cache_dir: LLM 응답 캐시 디렉토리 (None이면 디스크 캐시 사용 안 함)
+            requests_per_second: 초당 최대 LLM 요청 수 (429 응답을 받으면 10초간 절반으로 줄임, 0이면 제한 없음)
+            skip_connection_test: True이면 초기화 시 LLM 서버 연결 테스트를 생략
         """
+        self.log = get_logger()
         self.api_url = api_url.rstrip("/") + "/v1/chat/completions"
         self.model_name = model_name
-        self.headers = {"Content-Type": "application/json"}
+        self.headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        
+        # 동시 요청 제한 (서버 요청 제한 방지)
+        self.max_workers = max(1, max_workers)
+        self._request_slots = threading.BoundedSemaphore(self.max_workers)
+        
+        # 요청 속도 제한과 서버 장애 시 요청 차단
+        self._bucket = TokenBucket(requests_per_second, burst=self.max_workers)
+        self._breaker = CircuitBreaker(fail_threshold=5, recovery_timeout=30)
+        
+        # 연결 재사용을 위한 세션 (모든 LLM 요청이 같은 커넥션 풀 사용)
+        self.session = requests.Session()
+        # 재시도가 모두 실패하면 마지막 응답을 그대로 받아 429와 5xx를 구분해 처리
+        retry = Retry(total=2, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset(["GET", "POST"]),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # LLM 응답 캐시 (메모리 LRU + 디스크)
+        self._memory_cache = OrderedDict()
+        self._memory_cache_size = 256
+        self._cache_lock = threading.Lock()
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        if self._cache_dir:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # TF-IDF 사전 필터 인덱스 (같은 코드 청크 목록이면 버그마다 다시 만들지 않음)
+        self._tfidf_chunks = None
+        self._vec = None
+        self._chunk_matrix = None
+        
+        # 프롬프트용 컨텍스트 지식 캐시 (지식/스크립트를 다시 로드하면 초기화)
+        self._context_knowledge_cached = None
         
         # 개발자 지식 로드
         self.dev_knowledge = self.load_developer_knowledge(knowledge_file) if knowledge_file else {}
@@ -33,29 +415,47 @@ class LLMCodeAnalyzer:
         self.game_scripts = self.load_game_scripts(script_dir) if script_dir else {}
         
         # 연결 테스트
-        self.test_connection()
+        if not skip_connection_test:
+            self.test_connection()
     
     def test_connection(self) -> bool:
-        """LLM 서버 연결 테스트"""
+        """
+        LLM 서버 연결 테스트
+        /v1/models 조회로 서버와 모델 존재 여부만 확인 (엔드포인트가 없으면 짧은 생성 요청으로 대체)
+        """
         try:
-            print(f"[🔄] LLM 서버 연결 테스트 중 ({self.api_url})...")
+            self.log.info("[🔄] LLM 서버 연결 테스트 중 (%s)...", self.api_url)
             
-            # 간단한 프롬프트로 연결 테스트
-            response = self.ask_llm("안녕하세요", max_tokens=10)
-            if response:
-                print(f"[✅] LLM 서버 연결 성공 (모델: {self.model_name})")
-                return True
-            else:
-                print(f"[❌] LLM 응답 없음")
+            models_url = self.api_url.rsplit('/v1/', 1)[0] + '/v1/models'
+            response = self.session.get(models_url, timeout=3)
+            
+            if response.status_code == 404:
+                # /models를 지원하지 않는 서버는 간단한 프롬프트로 연결 테스트
+                response = self.ask_llm("안녕하세요", max_tokens=10, use_cache=False)
+                if response:
+                    self.log.info("[✅] LLM 서버 연결 성공 (모델: %s)", self.model_name)
+                    return True
+                else:
+                    self.log.error("[❌] LLM 응답 없음")
+                    return False
+            
+            response.raise_for_status()
+            model_ids = [model.get('id') for model in _json_fast.loads(response.content).get('data', [])]
+            if self.model_name not in model_ids:
+                self.log.warning("[⚠️] LLM 서버에 모델이 없습니다: %s (사용 가능: %s)", self.model_name, ', '.join(map(str, model_ids)))
                 return False
+            
+            self.log.info("[✅] LLM 서버 연결 성공 (모델: %s)", self.model_name)
+            return True
                 
         except Exception as e:
-            print(f"[❌] LLM 서버 연결 실패: {e}")
+            self.log.error("[❌] LLM 서버 연결 실패: %s", e)
             return False
     
     def ask_llm(self, prompt: str, system_prompt: str = None, 
                 temperature: float = 0.3, max_tokens: int = 2000, 
-                timeout: int = 60) -> Optional[str]:
+                timeout: int = 60, use_cache: bool = True,
+                stream: bool = False) -> Optional[str]:
         """
         LLM API에 질문하고 응답 받기
         
@@ -65,50 +465,248 @@ class LLMCodeAnalyzer:
             temperature: 온도 (창의성 정도, 낮을수록 결정적인 응답)
             max_tokens: 최대 토큰 수
             timeout: API 요청 타임아웃 (초)
+            use_cache: 같은 요청의 이전 응답이 있으면 재사용할지 여부
+            stream: 응답을 스트리밍(SSE)으로 받을지 여부
             
         Returns:
             LLM 응답 텍스트 또는 오류 시 None
         """
         if system_prompt is None:
-            system_prompt = "당신은 전문 소프트웨어 개발자이자 버그 분석가입니다. 버그 리포트와 코드를 분석하여 문제 원인을 파악합니다."
+            system_prompt = self.DEFAULT_SYSTEM_PROMPT
+        
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens)
+        
+        # 캐시 확인 (모델/프롬프트/온도가 같으면 같은 응답으로 간주)
+        cache_key = self._cache_key(system_prompt, prompt, temperature, max_tokens) if use_cache else None
+        if cache_key:
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            if stream:
+                answer = "".join(self._stream_completion(payload, timeout))
+            else:
+                answer = self._post_completion(payload, timeout)
             
+            if cache_key and answer:
+                self._store_cached_response(cache_key, answer)
+            return answer
+                
+        except requests.exceptions.Timeout:
+            self.log.warning("[⚠️] LLM API 요청 시간 초과 (%s초)", timeout)
+            return None
+        except requests.exceptions.RequestException as e:
+            self.log.error("[❌] LLM API 요청 오류: %s", e)
+            return None
+        except Exception as e:
+            self.log.error("[❌] 예상치 못한 오류: %s", e)
+            return None
+    
+    def ask_llm_stream_json(self, prompt: str, system_prompt: str = None,
+                            temperature: float = 0.3, max_tokens: int = 2000,
+                            timeout: int = 60, use_cache: bool = True) -> Iterator[Tuple[str, Any]]:
+        """
+        LLM 응답을 스트리밍으로 받으면서 JSON 값이 완성될 때마다 (경로, 값)을 반환
+        
+        경로는 "$.relevance_score", "$.referenced_code[0].line" 형식이며,
+        최상위 값이 완성되면 마지막으로 ("$", 전체 값)을 반환합니다.
+        호출 측에서 반복을 중단하면 연결을 닫아 서버의 남은 생성을 취소합니다.
+        """
+        if system_prompt is None:
+            system_prompt = self.DEFAULT_SYSTEM_PROMPT
+        
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens)
+        parser = StreamingJsonParser()
+        
+        cache_key = self._cache_key(system_prompt, prompt, temperature, max_tokens) if use_cache else None
+        cached = self._get_cached_response(cache_key) if cache_key else None
+        if cached is not None:
+            yield from parser.feed(cached)
+            return
+        
+        pieces = []
+        deltas = self._stream_completion(payload, timeout)
+        try:
+            for delta in deltas:
+                pieces.append(delta)
+                events = parser.feed(delta)
+                
+                # 최상위 값이 닫히면 캐시에 저장하고 남은 토큰은 기다리지 않음
+                if parser.done:
+                    if cache_key:
+                        self._store_cached_response(cache_key, "".join(pieces))
+                    yield from events
+                    return
+                yield from events
+        except requests.exceptions.Timeout:
+            self.log.warning("[⚠️] LLM API 요청 시간 초과 (%s초)", timeout)
+            return
+        except requests.exceptions.RequestException as e:
+            self.log.error("[❌] LLM API 요청 오류: %s", e)
+            return
+        finally:
+            # 중간에 반복이 중단된 경우에도 연결을 닫아 생성 취소
+            deltas.close()
+        
+        # 닫히지 않은 괄호가 남았으면 자동으로 닫힌 것으로 간주
+        if parser.value is not None:
+            yield ("$", parser.value)
+    
+    def _build_payload(self, prompt: str, system_prompt: str,
+                       temperature: float, max_tokens: int) -> Dict[str, Any]:
+        """chat completions 요청 본문 생성"""
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt}
         ]
         
-        payload = {
+        return {
             "model": self.model_name,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens
         }
+    
+    def _send_request(self, payload: Dict[str, Any], timeout: int, stream: bool = False) -> Optional[requests.Response]:
+        """
+        속도 제한과 서킷 브레이커를 거쳐 LLM 서버로 요청 전송
+        서킷 브레이커가 열려 있으면 서버를 호출하지 않고 None 반환
+        """
+        if not self._breaker.allow():
+            self.log.warning("[⚠️] LLM 서버 연속 오류로 요청을 잠시 차단합니다 (서킷 브레이커 열림)")
+            return None
         
+        self._bucket.acquire()
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
                 headers=self.headers,
-                json=payload,
-                timeout=timeout
+                data=_json_fast.dumps(payload),
+                timeout=timeout,
+                stream=stream
             )
-            response.raise_for_status()
-            
-            result = response.json()
-            if "choices" in result and len(result["choices"]) > 0:
-                return result["choices"][0]["message"]["content"]
-            else:
-                print(f"[⚠️] 유효하지 않은 LLM 응답 형식: {result}")
-                return None
-                
-        except requests.exceptions.Timeout:
-            print(f"[⚠️] LLM API 요청 시간 초과 ({timeout}초)")
+        except requests.exceptions.RequestException:
+            self._breaker.record_failure()
+            raise
+        
+        # 429는 서버 장애가 아니라 요청 한도 초과이므로 요청 속도만 줄임
+        if response.status_code == 429:
+            self._bucket.penalize(factor=0.5, duration=10)
+            self.log.warning("[⚠️] LLM 서버 요청 한도 초과(429) - 10초간 요청 속도를 절반으로 줄입니다")
+        elif response.status_code >= 500:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return response
+    
+    def _post_completion(self, payload: Dict[str, Any], timeout: int) -> Optional[str]:
+        """일반(비스트리밍) 요청을 보내고 응답 텍스트 반환"""
+        with self._request_slots:
+            response = self._send_request(payload, timeout)
+        if response is None:
             return None
-        except requests.exceptions.RequestException as e:
-            print(f"[❌] LLM API 요청 오류: {e}")
+        response.raise_for_status()
+        
+        result = _json_fast.loads(response.content)
+        if "choices" in result and len(result["choices"]) > 0:
+            return result["choices"][0]["message"]["content"]
+        else:
+            self.log.warning("[⚠️] 유효하지 않은 LLM 응답 형식: %s", result)
             return None
-        except Exception as e:
-            print(f"[❌] 예상치 못한 오류: {e}")
+    
+    def _stream_completion(self, payload: Dict[str, Any], timeout: int) -> Iterator[str]:
+        """
+        스트리밍 요청을 보내고 SSE(data: {...}) 프레임의 delta.content를 순서대로 반환
+        (제너레이터가 닫히면 연결도 닫힘)
+        """
+        payload = dict(payload, stream=True)
+        
+        with self._request_slots:
+            response = self._send_request(payload, timeout, stream=True)
+            if response is None:
+                return
+            try:
+                response.raise_for_status()
+                
+                # 스트리밍을 지원하지 않는 서버는 일반 응답을 그대로 반환
+                if "text/event-stream" not in response.headers.get("Content-Type", ""):
+                    result = _json_fast.loads(response.content)
+                    if result.get("choices"):
+                        yield result["choices"][0]["message"]["content"]
+                    return
+                
+                for line in response.iter_lines():
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    
+                    frame = _json_fast.loads(data)
+                    if not frame.get("choices"):
+                        continue
+                    delta = frame["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+            finally:
+                response.close()
+
+    def _cache_key(self, system_prompt: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        """LLM 요청 내용으로 캐시 키(SHA-256) 생성"""
+        key_source = json.dumps({
+            'm': self.model_name,
+            's': system_prompt,
+            'p': prompt,
+            't': temperature,
+            'n': max_tokens
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+    
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """메모리 캐시 → 디스크 캐시 순으로 저장된 응답 조회"""
+        with self._cache_lock:
+            if key in self._memory_cache:
+                self._memory_cache.move_to_end(key)
+                return self._memory_cache[key]
+        
+        if not self._cache_dir:
             return None
+        
+        cache_file = self._cache_dir / f"{key}.json"
+        try:
+            with open(cache_file, 'rb') as f:
+                answer = _json_fast.loads(f.read()).get('content')
+        except (OSError, ValueError):
+            return None
+        
+        if answer:
+            self._remember_response(key, answer)
+        return answer
+    
+    def _store_cached_response(self, key: str, answer: str):
+        """응답을 메모리와 디스크 캐시에 저장"""
+        self._remember_response(key, answer)
+        
+        if not self._cache_dir:
+            return
+        
+        cache_file = self._cache_dir / f"{key}.json"
+        tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'content': answer}, f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            self.log.warning("[⚠️] LLM 응답 캐시 저장 실패: %s", e)
+    
+    def _remember_response(self, key: str, answer: str):
+        """메모리 LRU 캐시에 응답 저장 (오래된 항목부터 제거)"""
+        with self._cache_lock:
+            self._memory_cache[key] = answer
+            self._memory_cache.move_to_end(key)
+            while len(self._memory_cache) > self._memory_cache_size:
+                self._memory_cache.popitem(last=False)
 
     def analyze_bug_report(self, report_text: str) -> Dict[str, Any]:
         """
@@ -120,7 +718,7 @@ class LLMCodeAnalyzer:
         Returns:
             분석 결과 딕셔너리
         """
-        print(f"[🔍] 버그 리포트 분석 중... ({len(report_text)} 문자)")
+        self.log.info("[🔍] 버그 리포트 분석 중... (%s 문자)", len(report_text))
         
         prompt = f"""
 다음은 소프트웨어 버그 리포트입니다. 리포트를 분석하여 다음 정보를 JSON 형식으로 제공해주세요:
@@ -153,22 +751,23 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
         try:
             response = self.ask_llm(prompt)
             if not response:
-                print("[❌] 버그 리포트 분석 실패: LLM 응답 없음")
+                self.log.error("[❌] 버그 리포트 분석 실패: LLM 응답 없음")
                 return self._create_default_analysis()
             
-            # JSON 추출 (응답이 ```json으로 감싸져 있을 수 있음)
-            json_str = self._extract_json(response)
-            analysis = json.loads(json_str)
+            # JSON 추출 (응답이 ```json으로 감싸져 있거나 형식이 조금 틀릴 수 있음)
+            analysis = self._parse_fuzzy_json(response)
+            if not isinstance(analysis, dict):
+                raise ValueError("JSON 객체가 아닌 응답")
             
-            print(f"[✅] 버그 리포트 분석 완료")
-            print(f"  - 키워드: {', '.join(analysis.get('keywords', [])[:5])}{'...' if len(analysis.get('keywords', [])) > 5 else ''}")
-            print(f"  - 의심 함수: {', '.join(analysis.get('suspected_functions', []))}")
-            print(f"  - 버그 유형: {analysis.get('bug_type', '알 수 없음')}")
+            self.log.info("[✅] 버그 리포트 분석 완료")
+            self.log.info("  - 키워드: %s%s", ', '.join(analysis.get('keywords', [])[:5]), '...' if len(analysis.get('keywords', [])) > 5 else '')
+            self.log.info("  - 의심 함수: %s", ', '.join(analysis.get('suspected_functions', [])))
+            self.log.info("  - 버그 유형: %s", analysis.get('bug_type', '알 수 없음'))
             
             return analysis
             
         except Exception as e:
-            print(f"[❌] 버그 리포트 분석 중 오류 발생: {e}")
+            self.log.error("[❌] 버그 리포트 분석 중 오류 발생: %s", e)
             return self._create_default_analysis()
     
     def match_with_code_context(self, bug_analysis: Dict[str, Any], code_chunks: List[Dict[str, Any]], 
@@ -179,34 +778,322 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
         if not bug_analysis or not code_chunks:
             return []
         
-        print(f"[🔄] 코드 문맥 분석 중... (코드 청크: {len(code_chunks)}개)")
+        self.log.info("[🔄] 코드 문맥 분석 중... (코드 청크: %s개)", len(code_chunks))
         
         # 개발자 지식과 게임 스크립트 정보 포맷팅
         context_knowledge = self._format_context_knowledge()
         
         # 1. 의심 함수나 키워드가 직접 포함된 코드 청크 먼저 필터링
         filtered_chunks = self._prefilter_chunks(bug_analysis, code_chunks)
-        print(f"[ℹ️] 키워드 일치 코드 청크: {len(filtered_chunks)}개")
+        self.log.info("[ℹ️] 키워드 일치 코드 청크: %s개", len(filtered_chunks))
+        
+        # 청크가 너무 많으면 점수가 높은 일부만 처리 (LLM 컨텍스트 제한 고려)
+        chunks_to_analyze = self._select_top_chunks(bug_analysis, filtered_chunks, 10)
+        self.log.info("[ℹ️] LLM 분석 대상 코드 청크: %s개", len(chunks_to_analyze))
+        
+        # 2. 짧은 점수 전용 요청으로 모든 후보를 빠르게 평가하고 상위 N개만 추림
+        shortlisted = self._rank_chunks_cheap(bug_analysis, chunks_to_analyze)[:top_n]
+        
+        # 3. 추린 청크만 상세 분석 (근거, 의심 라인, 참조 코드 포함)
+        ranked_chunks = self._analyze_chunks_detailed(bug_analysis, shortlisted, context_knowledge)
+        
+        # 4. 관련성 점수로 정렬하고 상위 N개 반환
+        ranked_chunks.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+        top_results = ranked_chunks[:top_n]
+        
+        self.log.info("[✅] 코드 문맥 분석 완료")
+        for i, result in enumerate(top_results, 1):
+            file_name = os.path.basename(result['file_path'])
+            self.log.info("  #%s: %s (점수: %s/10)", i, file_name, result.get('relevance_score', 0))
+        
+        return top_results
+    
+    def _rank_chunks_cheap(self, bug_analysis: Dict[str, Any], chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        점수만 묻는 짧은 요청으로 코드 청크를 병렬 평가해 점수가 높은 순으로 정렬
+        (점수를 받지 못한 청크는 맨 뒤로)
+        """
+        if not chunks:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(len(chunks), self.max_workers))) as executor:
+            scores = list(executor.map(lambda chunk: self._score_chunk_cheap(chunk, bug_analysis), chunks))
+        
+        for chunk, score in zip(chunks, scores):
+            self.log.debug("[🔍] 빠른 평가: %s (%s~%s줄) - %s점", os.path.basename(chunk['file_path']),
+                           chunk['start_line'], chunk['end_line'], score)
+        
+        order = sorted(range(len(chunks)), key=lambda i: -1 if scores[i] is None else scores[i], reverse=True)
+        return [chunks[i] for i in order]
+    
+    def _score_chunk_cheap(self, chunk: Dict[str, Any], bug_analysis: Dict[str, Any]) -> Optional[int]:
+        """
+        코드 청크의 버그 관련성 점수(0~10)만 짧게 요청
+        응답을 해석할 수 없으면 None
+        """
+        code_content = chunk['content']
+        if len(code_content) > 3000:
+            code_content = code_content[:3000] + "...(중략)..."
         
-        # 청크가 너무 많으면 일부만 처리 (LLM 컨텍스트 제한 고려)
-        chunks_to_analyze = filtered_chunks[:min(len(filtered_chunks), 10)]
-        print(f"[ℹ️] LLM 분석 대상 코드 청크: {len(chunks_to_analyze)}개")
+        prompt = f"""
+[버그 정보]
+- 키워드: {', '.join(bug_analysis.get('keywords', []))}
+- 의심 함수: {', '.join(bug_analysis.get('suspected_functions', []))}
+- 문제 요약: {bug_analysis.get('summary', '알 수 없음')}
+
+[코드] {os.path.basename(chunk['file_path'])} ({chunk['start_line']}~{chunk['end_line']}줄)
+```cpp
+{code_content}
+```
+
+위 코드가 버그와 관련된 정도를 0-10 사이의 정수로 평가하세요. 설명 없이 JSON만 반환하세요.
+JSON 형식: {{"s": <int>}}
+"""
         
-        # 결과를 저장할 리스트
+        response = self.ask_llm(prompt, max_tokens=32, temperature=0.0)
+        if not response:
+            return None
+        
+        try:
+            parsed = self._parse_fuzzy_json(response)
+            score = parsed.get('s') if isinstance(parsed, dict) else None
+            return max(0, min(10, int(score))) if score is not None else None
+        except (ValueError, TypeError):
+            # JSON이 아니어도 숫자 하나만 답한 경우는 점수로 사용
+            digits = re.search(r'\d+', response)
+            return max(0, min(10, int(digits.group()))) if digits else None
+    
+    def _analyze_chunks_detailed(self, bug_analysis: Dict[str, Any], chunks: List[Dict[str, Any]],
+                                 context_knowledge: str) -> List[Dict[str, Any]]:
+        """
+        코드 청크별 상세 분석 (근거, 의심 라인, 참조 코드)
+        배치 응답에서 결과를 찾지 못한 청크는 개별 요청으로 재시도
+        """
+        if not chunks:
+            return []
+        
+        # 코드 청크를 여러 개씩 묶어 한 번의 요청으로 평가 (배치 요청은 병렬로 전송)
         ranked_chunks = []
+        batches = self._make_chunk_batches(chunks)
+        retry_chunks = []
         
-        # 2. LLM을 사용하여 각 코드 청크의 버그 관련성 평가
-        for i, chunk in enumerate(chunks_to_analyze):
-            file_name = os.path.basename(chunk['file_path'])
-            print(f"[🔍] 코드 분석 중: {file_name} ({i+1}/{len(chunks_to_analyze)})")
+        with ThreadPoolExecutor(max_workers=max(1, min(len(chunks), self.max_workers))) as executor:
+            futures = {
+                executor.submit(self._batch_score_chunks, bug_analysis, batch, context_knowledge): batch
+                for batch in batches
+            }
+            
+            # 제출이 모두 끝난 뒤 완료 순서대로 결과 수집
+            for i, future in enumerate(as_completed(futures), 1):
+                batch = futures[future]
+                self.log.debug("[🔍] 코드 분석 완료: 배치 %s/%s (%s개 청크)", i, len(batches), len(batch))
+                
+                try:
+                    batch_results = future.result()
+                except Exception as e:
+                    self.log.warning("[⚠️] 코드 청크 배치 분석 중 오류: %s", e)
+                    batch_results = None
+                
+                # 배치 응답에서 결과를 찾지 못한 청크는 개별 요청으로 재시도
+                for chunk_id, chunk in enumerate(batch, 1):
+                    analysis_result = batch_results.get(chunk_id) if batch_results else None
+                    if analysis_result is None:
+                        retry_chunks.append(chunk)
+                    else:
+                        ranked_chunks.append(self._merge_chunk_result(chunk, analysis_result))
             
-            # 코드 청크가 너무 길면 짧게 자름 (LLM 컨텍스트 한계 고려)
+            if retry_chunks:
+                self.log.info("[ℹ️] 배치 응답이 올바르지 않은 코드 청크 %s개를 개별 분석합니다", len(retry_chunks))
+                futures = {
+                    executor.submit(self._stream_chunk_analysis, self._build_chunk_prompt(chunk, bug_analysis, context_knowledge)): chunk
+                    for chunk in retry_chunks
+                }
+                
+                for i, future in enumerate(as_completed(futures), 1):
+                    chunk = futures[future]
+                    file_name = os.path.basename(chunk['file_path'])
+                    self.log.debug("[🔍] 코드 분석 완료: %s (%s/%s)", file_name, i, len(retry_chunks))
+                    
+                    try:
+                        analysis_result = future.result()
+                        if not analysis_result:
+                            continue
+                        
+                        ranked_chunks.append(self._merge_chunk_result(chunk, analysis_result))
+                        
+                    except Exception as e:
+                        self.log.warning("[⚠️] 코드 청크 분석 중 오류: %s", e)
+                        continue
+        
+        return ranked_chunks
+    
+    def _merge_chunk_result(self, chunk: Dict[str, Any], analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        코드 청크에 LLM 분석 결과를 합친 사본 생성
+        """
+        chunk_result = chunk.copy()
+        chunk_result.update({
+            'relevance_score': analysis_result.get('relevance_score', 0),
+            'reasoning': analysis_result.get('reasoning', '분석 결과 없음'),
+            'suspected_lines': analysis_result.get('suspected_lines', []),
+            'referenced_code': analysis_result.get('referenced_code', []),
+            'confidence': analysis_result.get('confidence', '알 수 없음')
+        })
+        return chunk_result
+    
+    def _make_chunk_batches(self, chunks: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        코드 청크를 CHUNK_BATCH_SIZE개씩 묶되, 묶음의 코드 길이가 BATCH_MAX_TOKENS * 4 문자를 넘지 않도록 분할
+        """
+        char_budget = self.BATCH_MAX_TOKENS * 4
+        batches = []
+        current = []
+        current_chars = 0
+        
+        for chunk in chunks:
+            chunk_chars = min(len(chunk['content']), 3000)
+            if current and (len(current) >= self.CHUNK_BATCH_SIZE or current_chars + chunk_chars > char_budget):
+                batches.append(current)
+                current = []
+                current_chars = 0
+            current.append(chunk)
+            current_chars += chunk_chars
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _batch_score_chunks(self, bug_analysis: Dict[str, Any], chunks: List[Dict[str, Any]],
+                            context_knowledge: str) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        여러 코드 청크를 하나의 프롬프트로 묶어 버그 관련성 평가
+        결과는 chunk_id(1부터 시작) -> 분석 결과 딕셔너리, 응답이 올바르지 않으면 None
+        """
+        code_sections = []
+        for chunk_id, chunk in enumerate(chunks, 1):
             code_content = chunk['content']
             if len(code_content) > 3000:
                 code_content = code_content[:3000] + "...(중략)..."
             
-            # 7B 모델에 최적화된 프롬프트 - 개발자 지식 추가
-            prompt = f"""
+            code_sections.append(f"""[코드 #{chunk_id}]
+- chunk_id: {chunk_id}
+- 파일: {os.path.basename(chunk['file_path'])}
+- 위치: {chunk['start_line']}~{chunk['end_line']}줄
+
+```cpp
+{code_content}
+```
+""")
+        
+        prompt = f"""
+당신은 C++ 코드를 분석하는 도구입니다. 아래 지시를 정확히 따르세요.
+
+[작업]
+주어진 {len(chunks)}개의 코드가 각각 버그와 관련되어 있는지 분석하세요.
+
+[버그 정보]
+- 키워드: {', '.join(bug_analysis.get('keywords', []))}
+- 문제 요약: {bug_analysis.get('summary', '알 수 없음')}
+
+[컨텍스트 지식]
+{context_knowledge}
+
+{chr(10).join(code_sections)}
+⚠️ 중요 지침 ⚠️:
+- 각 코드는 서로 독립적으로, 오직 제공된 코드 내용만을 바탕으로 분석하세요.
+- 컨텍스트 지식은 개념이나 용어 이해를 위한 참고로만 사용하세요.
+- 존재하지 않는 함수, 클래스 또는 변수를 언급하지 마세요.
+- 추측하지 말고 코드에 명시적으로 나타난 것만 참조하세요.
+- 확신이 없는 경우 "알 수 없음" 또는 "확실하지 않음"이라고 명시하세요.
+- 참조하는 모든 코드에 대해 정확한 줄 번호를 명시하세요 (예: "42번 줄의 함수 호출").
+
+모든 코드에 대해 chunk_id별로 하나씩, 다음 JSON 형식으로만 응답해주세요:
+
+```json
+{{
+  "results": [
+    {{
+      "chunk_id": 코드 번호,
+      "relevance_score": 0-10 사이의 점수(높을수록 관련성 높음),
+      "reasoning": "이 코드가 버그와 관련이 있거나 없는 이유에 대한 간략한 설명",
+      "suspected_lines": [명확한 근거가 있는 의심스러운 라인 번호만 포함, 없으면 빈 배열],
+      "referenced_code": [
+        {{
+          "line": 정확한 라인 번호,
+          "code": "실제 해당 라인의 코드",
+          "reason": "이 코드가 의심되는 이유"
+        }}
+      ],
+      "confidence": "높음/중간/낮음 (분석의 확신도)"
+    }}
+  ]
+}}
+```
+
+오직 JSON 형식만 반환하고 다른 설명이나 주석은 포함하지 마세요.
+"""
+        
+        response = self.ask_llm(prompt, max_tokens=self.BATCH_MAX_TOKENS)
+        if not response:
+            return None
+        
+        try:
+            parsed = self._parse_fuzzy_json(response)
+        except Exception as e:
+            self.log.warning("[⚠️] 배치 분석 결과 JSON 파싱 실패: %s", e)
+            return None
+        
+        # {"results": [...]} 형태가 기본이지만 배열만 반환하는 경우도 허용
+        items = parsed.get('results') if isinstance(parsed, dict) else parsed
+        if not isinstance(items, list):
+            self.log.warning("[⚠️] 배치 분석 결과에 results 배열이 없습니다")
+            return None
+        
+        results = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                chunk_id = int(item.get('chunk_id'))
+            except (TypeError, ValueError):
+                continue
+            if 1 <= chunk_id <= len(chunks):
+                results[chunk_id] = item
+        
+        return results
+    
+    def _stream_chunk_analysis(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        코드 청크 분석 응답을 스트리밍으로 파싱
+        관련성 점수가 EARLY_EXIT_SCORE 미만으로 확정되면 나머지 생성을 기다리지 않고 중단
+        """
+        partial = {}
+        for path, value in self.ask_llm_stream_json(prompt):
+            if path == "$":
+                return value if isinstance(value, dict) else None
+            
+            # 최상위 필드만 따로 모아 둠 (조기 중단 시 결과로 사용)
+            if path.count(".") == 1 and "[" not in path:
+                partial[path[2:]] = value
+            
+            if path == "$.relevance_score" and isinstance(value, (int, float)) \
+                    and value < self.EARLY_EXIT_SCORE:
+                self.log.debug("[ℹ️] 관련성 점수 %s점 - 나머지 응답 생성 취소", value)
+                return partial
+        
+        return partial or None
+    
+    def _build_chunk_prompt(self, chunk: Dict[str, Any], bug_analysis: Dict[str, Any], context_knowledge: str) -> str:
+        """
+        코드 청크 하나의 버그 관련성 평가 프롬프트 생성
+        """
+        # 코드 청크가 너무 길면 짧게 자름 (LLM 컨텍스트 한계 고려)
+        code_content = chunk['content']
+        if len(code_content) > 3000:
+            code_content = code_content[:3000] + "...(중략)..."
+        
+        # 7B 모델에 최적화된 프롬프트 - 개발자 지식 추가
+        prompt = f"""
 당신은 C++ 코드를 분석하는 도구입니다. 아래 지시를 정확히 따르세요.
 
 [작업]
@@ -256,45 +1143,8 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
 
 오직 JSON 형식만 반환하고 다른 설명이나 주석은 포함하지 마세요.
 """
-            try:
-                response = self.ask_llm(prompt)
-                if not response:
-                    continue
-                
-                # JSON 추출 및 파싱
-                json_str = self._extract_json(response)
-                analysis_result = json.loads(json_str)
-                
-                # 분석 결과 저장
-                chunk_result = chunk.copy()
-                chunk_result.update({
-                    'relevance_score': analysis_result.get('relevance_score', 0),
-                    'reasoning': analysis_result.get('reasoning', '분석 결과 없음'),
-                    'suspected_lines': analysis_result.get('suspected_lines', []),
-                    'referenced_code': analysis_result.get('referenced_code', []),
-                    'confidence': analysis_result.get('confidence', '알 수 없음')
-                })
-                
-                ranked_chunks.append(chunk_result)
-                
-                # 잠시 대기 (API 요청 제한 방지)
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"[⚠️] 코드 청크 분석 중 오류: {e}")
-                continue
-        
-        # 3. 관련성 점수로 정렬하고 상위 N개 반환
-        ranked_chunks.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-        top_results = ranked_chunks[:top_n]
-        
-        print(f"[✅] 코드 문맥 분석 완료")
-        for i, result in enumerate(top_results, 1):
-            file_name = os.path.basename(result['file_path'])
-            print(f"  #{i}: {file_name} (점수: {result.get('relevance_score', 0)}/10)")
-        
-        return top_results
-    
+        return prompt
+
     def generate_fix_suggestion(self, bug_report: str, top_match: Dict[str, Any]) -> str:
         """
         가장 관련성 높은 코드에 대한 수정 제안 생성
@@ -356,11 +1206,11 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
             if not response:
                 return "수정 제안 생성에 실패했습니다."
             
-            print(f"[✅] 수정 제안 생성 완료 ({len(response)} 문자)")
+            self.log.info("[✅] 수정 제안 생성 완료 (%s 문자)", len(response))
             return response
             
         except Exception as e:
-            print(f"[❌] 수정 제안 생성 중 오류: {e}")
+            self.log.error("[❌] 수정 제안 생성 중 오류: %s", e)
             return f"수정 제안 생성 중 오류 발생: {e}"
     
     def _prefilter_chunks(self, bug_analysis: Dict[str, Any], code_chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -370,47 +1220,208 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
         keywords = bug_analysis.get('keywords', [])
         functions = bug_analysis.get('suspected_functions', [])
         
+        # 이전 버그 분석에서 남은 TF-IDF 점수 제거 (이번 필터에서 다시 계산된 청크만 점수를 가짐)
+        for chunk in code_chunks:
+            chunk.pop('_tfidf_score', None)
+        
         # 키워드나 함수가 없으면 모든 청크 반환
         if not keywords and not functions:
             return code_chunks
         
-        filtered = []
-        search_terms = set(keywords + functions)
+        search_terms = {term.lower() for term in keywords + functions if term}
+        if not search_terms:
+            return code_chunks
         
-        for chunk in code_chunks:
-            content = chunk['content'].lower()
-            
-            # 검색어가 코드 내용에 포함되어 있는지 확인
-            if any(term.lower() in content for term in search_terms):
-                filtered.append(chunk)
+        # TF-IDF 코사인 유사도로 관련성 높은 청크만 순서대로 추림
+        shortlist = self._tfidf_shortlist(keywords + functions, code_chunks)
+        if shortlist:
+            return shortlist
+        
+        # 모든 검색어를 한 번에 찾는 매처로 각 청크를 한 번만 스캔 (UTF-8 바이트 단위 비교)
+        search_bytes = {term.encode('utf-8').lower() for term in search_terms}
+        matches = self._build_term_matcher(search_bytes)
+        filtered = [chunk for chunk in code_chunks if matches(self._content_lc(chunk))]
         
         # 필터링된 결과가 너무 적으면 원본 청크 반환
         return filtered if filtered else code_chunks
     
-    def _extract_json(self, text: str) -> str:
-        """LLM 응답에서 JSON 부분 추출"""
-        # JSON 블록 추출 시도
-        if "```json" in text:
-            start = text.find("```json") + 7
-            end = text.find("```", start)
-            if end != -1:
-                return text[start:end].strip()
-        elif "```" in text:
-            start = text.find("```") + 3
-            end = text.find("```", start)
-            if end != -1:
-                return text[start:end].strip()
-        
-        # 중괄호로 감싸진 부분 찾기
-        if "{" in text and "}" in text:
-            start = text.find("{")
-            # 가장 마지막 닫는 괄호 찾기
-            end = text.rfind("}") + 1
-            if start < end:
-                return text[start:end].strip()
-        
-        # JSON 추출 실패 시 원본 반환
-        return text
+    def _select_top_chunks(self, bug_analysis: Dict[str, Any], chunks: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+        """
+        TF-IDF 점수가 높은 순으로 상위 k개 청크 선택
+        TF-IDF 점수가 없으면 검색어 등장 횟수 기준 (전체 정렬 없이 힙으로 선택)
+        """
+        if all('_tfidf_score' in chunk for chunk in chunks):
+            return heapq.nlargest(k, chunks, key=lambda c: c['_tfidf_score'])
+        
+        terms = bug_analysis.get('keywords', []) + bug_analysis.get('suspected_functions', [])
+        term_bytes = {term.encode('utf-8').lower() for term in terms if term}
+        return heapq.nlargest(k, chunks, key=lambda c: sum(self._content_lc(c).count(t) for t in term_bytes))
+    
+    @staticmethod
+    def build_chunk_index(code_chunks: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Any, Any]:
+        """
+        코드 청크를 한 번만 순회하며 목록으로 모으고 TF-IDF 사전 필터 인덱스를 학습
+        제너레이터를 넘기면 청크가 생성되는 대로 토큰화하므로, 로드가 끝난 뒤 전체를 다시 훑지 않음
+        (분석기 초기화 전에 백그라운드 스레드에서 호출할 수 있도록 인스턴스 상태를 쓰지 않음)
+        
+        Returns:
+            (청크 목록, 벡터라이저, 청크 TF-IDF 행렬), scikit-learn이 없거나 어휘가 비어 있으면 벡터라이저와 행렬은 None
+        """
+        if TfidfVectorizer is None:
+            return list(code_chunks), None, None
+        
+        chunks = code_chunks if isinstance(code_chunks, list) else []
+        
+        def contents():
+            for chunk in code_chunks:
+                if chunks is not code_chunks:
+                    chunks.append(chunk)
+                yield chunk['content']
+        
+        vec = TfidfVectorizer(lowercase=True, token_pattern=r'[A-Za-z_][A-Za-z_0-9]*',
+                              ngram_range=(1, 1), sublinear_tf=True)
+        try:
+            chunk_matrix = vec.fit_transform(contents())
+        except ValueError:
+            # 식별자가 하나도 없는 경우 (빈 어휘)
+            return chunks, None, None
+        return chunks, vec, chunk_matrix
+    
+    def set_chunk_index(self, index: Tuple[List[Dict[str, Any]], Any, Any]) -> List[Dict[str, Any]]:
+        """
+        build_chunk_index 결과를 사전 필터 인덱스로 등록하고 청크 목록 반환
+        (이후 match_with_code_context에 반환된 목록을 넘기면 TF-IDF를 다시 학습하지 않음)
+        """
+        chunks, vec, chunk_matrix = index
+        self._vec, self._chunk_matrix, self._tfidf_chunks = vec, chunk_matrix, chunks
+        return chunks
+    
+    def _tfidf_shortlist(self, terms: List[str], code_chunks: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        검색어와 TF-IDF 코사인 유사도가 높은 상위 PREFILTER_TOP_K개 청크를 점수순으로 반환
+        (scikit-learn이 없거나 검색어가 코드 어휘에 없으면 None)
+        """
+        if TfidfVectorizer is None:
+            return None
+        
+        if self._tfidf_chunks is not code_chunks:
+            self.set_chunk_index(self.build_chunk_index(code_chunks))
+        if self._vec is None:
+            return None
+        
+        query = self._vec.transform([' '.join(term for term in terms if term)])
+        if query.nnz == 0:
+            return None
+        
+        # 행 벡터가 L2 정규화되어 있으므로 내적이 곧 코사인 유사도
+        scores = (self._chunk_matrix @ query.T).toarray().ravel()
+        k = min(self.PREFILTER_TOP_K, len(scores))
+        top_idx = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top_idx = top_idx[np.argsort(-scores[top_idx], kind='stable')]
+        
+        shortlist = []
+        for idx in top_idx:
+            if scores[idx] <= 0:
+                break
+            chunk = code_chunks[idx]
+            chunk['_tfidf_score'] = float(scores[idx])
+            shortlist.append(chunk)
+        return shortlist
+    
+    def _build_term_matcher(self, search_terms: Iterable[bytes]) -> Callable[[bytes], bool]:
+        """
+        검색어(바이트) 중 하나라도 포함되어 있는지 한 번의 스캔으로 확인하는 함수 생성
+        (pyahocorasick이 있으면 Aho-Corasick 오토마톤, 없으면 바이트 정규식 OR 패턴 사용)
+        """
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            if ahocorasick.unicode:
+                # PyPI 배포판(유니코드 빌드)은 str만 검색하므로 latin-1로 바이트를 문자 하나씩 그대로 옮겨 검색
+                # (1:1 대응이라 바이트 부분 문자열 일치와 결과가 같고, UTF-8 디코딩보다 훨씬 빠름)
+                for term in search_terms:
+                    automaton.add_word(term.decode('latin-1'), True)
+                automaton.make_automaton()
+                return lambda data: next(automaton.iter(data.decode('latin-1')), None) is not None
+            
+            for term in search_terms:
+                automaton.add_word(term, term)
+            automaton.make_automaton()
+            return lambda data: next(automaton.iter(data), None) is not None
+        
+        pattern = re.compile(b'|'.join(map(re.escape, search_terms)))
+        return lambda data: pattern.search(data) is not None
+    
+    def _content_lc(self, chunk: Dict[str, Any]) -> bytes:
+        """청크 내용의 소문자 UTF-8 바이트 (청크에 캐시하여 버그마다 다시 만들지 않음)"""
+        content_lc = chunk.get('_lc')
+        if content_lc is None:
+            content_lc = chunk['_lc'] = chunk['content'].encode('utf-8', errors='ignore').lower()
+        return content_lc
+    
+    def _parse_fuzzy_json(self, text: str) -> Any:
+        """
+        LLM 응답에서 JSON을 찾아 느슨하게 파싱
+        (코드 펜스, 작은따옴표, 따옴표 없는 키, Python 리터럴, 끝 쉼표, 닫히지 않은 괄호 보정)
+        
+        Raises:
+            ValueError: JSON으로 해석할 수 없는 경우
+        """
+        # 1. ```json ... ``` 코드 펜스 제거
+        fence = self._CODE_FENCE_RE.search(text)
+        if fence and ('{' in fence.group(1) or '[' in fence.group(1)):
+            text = fence.group(1)
+        
+        # 2. 첫 번째 '{' 또는 '['부터 시작
+        starts = [pos for pos in (text.find('{'), text.find('[')) if pos != -1]
+        if not starts:
+            raise ValueError("응답에서 JSON을 찾을 수 없습니다")
+        text = text[min(starts):]
+        
+        # 3. 문자열 밖의 Python 리터럴/작은따옴표/따옴표 없는 키/끝 쉼표 보정
+        text = self._FUZZY_TOKEN_RE.sub(self._fix_fuzzy_token, text)
+        
+        # 4. 최상위 값이 끝나는 위치에서 자르고, 닫히지 않은 괄호는 닫아 줌
+        closers = []
+        in_string = False
+        i = 0
+        while i < len(text):
+            ch = text[i]
+            if in_string:
+                if ch == '\\':
+                    i += 1
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch in '{[':
+                closers.append('}' if ch == '{' else ']')
+            elif ch in '}]' and closers:
+                closers.pop()
+                if not closers:
+                    text = text[:i + 1]
+                    break
+            i += 1
+        
+        if in_string:
+            text += '"'
+        text += ''.join(reversed(closers))
+        
+        return json.loads(text, strict=False)
+    
+    def _fix_fuzzy_token(self, match: "re.Match") -> str:
+        token = match.group(0)
+        if token.startswith('"'):
+            return token
+        if token.startswith("'"):
+            body = token[1:-1].replace("\\'", "'").replace('"', '\\"')
+            return f'"{body}"'
+        if token in self._PY_LITERALS:
+            return self._PY_LITERALS[token]
+        if token.startswith(','):
+            return ''
+        # 따옴표 없는 키
+        key = token.strip()
+        return token.replace(key, f'"{key}"', 1)
     
     def _create_default_analysis(self) -> Dict[str, Any]:
         """기본 버그 분석 결과 생성 (분석 실패 시)"""
@@ -432,6 +1443,7 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
         Returns:
             카테고리별 지식 정보를 담은 딕셔너리
         """
+        self._context_knowledge_cached = None
         knowledge = {
             "classes": [],  # 클래스 정보
             "functions": [],  # 함수 정보
@@ -466,23 +1478,46 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
                         "description": description
                     })
             
-            print(f"[✅] 개발자 지식 로드 완료: {sum(len(v) for v in knowledge.values())}개 항목")
+            self.log.info("[✅] 개발자 지식 로드 완료: %s개 항목", sum(len(v) for v in knowledge.values()))
             
             # 각 카테고리별 항목 수 출력
             for category, items in knowledge.items():
                 if items:
-                    print(f"  - {category}: {len(items)}개")
+                    self.log.info("  - %s: %s개", category, len(items))
             
             return knowledge
         
         except FileNotFoundError:
-            print(f"[ℹ️] 개발자 지식 파일({file_path})이 없습니다. 기본 분석을 진행합니다.")
+            self.log.info("[ℹ️] 개발자 지식 파일(%s)이 없습니다. 기본 분석을 진행합니다.", file_path)
             return knowledge
         except Exception as e:
-            print(f"[⚠️] 개발자 지식 로드 중 오류 발생: {e}")
+            self.log.warning("[⚠️] 개발자 지식 로드 중 오류 발생: %s", e)
             return knowledge
 
     def _format_context_knowledge(self) -> str:
+        """
+        프롬프트에 넣을 컨텍스트 지식 문자열 (한 번 만들어 캐시)
+        대략적인 토큰 수(len // 4)가 CONTEXT_TOKEN_BUDGET을 넘으면
+        게임 스크립트 샘플을 먼저 빼고, 그래도 길면 클래스 목록을 줄임
+        """
+        if self._context_knowledge_cached is not None:
+            return self._context_knowledge_cached
+        
+        context_knowledge = self._render_context_knowledge()
+        if len(context_knowledge) // 4 > self.CONTEXT_TOKEN_BUDGET and self.game_scripts:
+            context_knowledge = self._render_context_knowledge(include_scripts=False)
+            self.log.info("[ℹ️] 컨텍스트 지식이 길어 게임 스크립트 샘플을 제외했습니다")
+        
+        for max_classes in (5, 2, 0):
+            if len(context_knowledge) // 4 <= self.CONTEXT_TOKEN_BUDGET:
+                break
+            context_knowledge = self._render_context_knowledge(include_scripts=False, max_classes=max_classes)
+            self.log.info("[ℹ️] 컨텍스트 지식이 길어 클래스 정보를 %s개로 줄였습니다", max_classes)
+        
+        self._context_knowledge_cached = context_knowledge
+        return context_knowledge
+    
+    def _render_context_knowledge(self, include_scripts: bool = True, max_classes: int = 10) -> str:
         """
         개발자 지식과 게임 스크립트 정보를 포함하는 형식으로 포맷팅
         """
@@ -495,7 +1530,7 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
             # 클래스 정보
             if self.dev_knowledge.get("classes"):
                 dev_knowledge_text.append("- 클래스 및 구조체 정보:")
-                for item in self.dev_knowledge["classes"][:10]:  # 너무 길지 않게 제한
+                for item in self.dev_knowledge["classes"][:max_classes]:  # 너무 길지 않게 제한
                     dev_knowledge_text.append(f"  * {item['name']}: {item['description']}")
             
             # 함수 정보
@@ -514,7 +1549,7 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
                 context_parts.append("## 개발자 제공 지식\n" + "\n".join(dev_knowledge_text))
         
         # 2. 게임 스크립트 정보 포맷팅
-        if self.game_scripts and any(self.game_scripts.values()):
+        if include_scripts and self.game_scripts and any(self.game_scripts.values()):
             script_text = ["## 게임 스크립트 정보"]
             
             # 각 카테고리별 샘플 정보 추가
@@ -558,6 +1593,7 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
         Returns:
             스크립트 정보를 담은 딕셔너리
         """
+        self._context_knowledge_cached = None
         scripts = {
             "dialogs": [],       # 대화 스크립트
             "quests": [],        # 퀘스트 정보
@@ -567,10 +1603,10 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
         }
         
         if not os.path.isdir(script_dir):
-            print(f"[⚠️] 스크립트 디렉토리가 존재하지 않습니다: {script_dir}")
+            self.log.warning("[⚠️] 스크립트 디렉토리가 존재하지 않습니다: %s", script_dir)
             return scripts
         
-        print(f"[📜] 게임 스크립트 로드 중: {script_dir}")
+        self.log.info("[📜] 게임 스크립트 로드 중: %s", script_dir)
         
         try:
             # 디렉토리에서 모든 txt 파일 탐색
@@ -580,118 +1616,120 @@ JSON 형식만 반환하고, 다른 설명은 포함하지 마세요.
                     if file.endswith('.txt'):
                         script_files.append(os.path.join(root, file))
             
-            print(f"[ℹ️] 발견된 스크립트 파일: {len(script_files)}개")
+            self.log.info("[ℹ️] 발견된 스크립트 파일: %s개", len(script_files))
             
-            # 각 파일 처리
-            for script_file in script_files:
-                file_name = os.path.basename(script_file)
-                category = self._determine_script_category(file_name)
-                
-                try:
-                    # 다양한 인코딩 시도 (대부분 ANSI/CP949 사용)
-                    content = self._read_file_with_encoding(script_file)
-                    
-                    if content:
-                        # 스크립트 파일 내용 파싱
-                        parsed_content = self._parse_script_content(content, file_name)
-                        
-                        if parsed_content:
-                            scripts[category].append({
-                                'file': file_name,
-                                'content': parsed_content
-                            })
-                
-                except Exception as e:
-                    print(f"[⚠️] 스크립트 파일 처리 중 오류: {file_name} - {e}")
-                    continue
+            # 각 파일 처리 (읽기/디코딩/파싱은 스레드 풀에서, 결과 추가는 순서대로)
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for script_file, (category, parsed_content) in zip(
+                        script_files, executor.map(self._process_script_file, script_files)):
+                    if parsed_content:
+                        scripts[category].append({
+                            'file': os.path.basename(script_file),
+                            'content': parsed_content
+                        })
             
             # 카테고리별 스크립트 수 출력
             for category, items in scripts.items():
                 if items:
-                    print(f"  - {category}: {len(items)}개 파일")
+                    self.log.info("  - %s: %s개 파일", category, len(items))
             
             total_scripts = sum(len(items) for items in scripts.values())
-            print(f"[✅] 총 {total_scripts}개 스크립트 파일 로드 완료")
+            self.log.info("[✅] 총 %s개 스크립트 파일 로드 완료", total_scripts)
             
             return scripts
         
         except Exception as e:
-            print(f"[❌] 스크립트 로드 중 오류 발생: {e}")
+            self.log.error("[❌] 스크립트 로드 중 오류 발생: %s", e)
             return scripts
 
+    def _process_script_file(self, script_file: str) -> Tuple[str, Dict[str, Any]]:
+        """스크립트 파일 하나를 읽고 파싱하여 (카테고리, 파싱 결과) 반환"""
+        file_name = os.path.basename(script_file)
+        category = self._determine_script_category(file_name)
+        
+        try:
+            # 다양한 인코딩 시도 (대부분 ANSI/CP949 사용)
+            content = self._read_file_with_encoding(script_file)
+            
+            if content:
+                # 스크립트 파일 내용 파싱
+                return category, self._parse_script_content(content, file_name)
+        
+        except Exception as e:
+            self.log.warning("[⚠️] 스크립트 파일 처리 중 오류: %s - %s", file_name, e)
+        
+        return category, {}
+
     def _determine_script_category(self, file_name: str) -> str:
         """파일명을 기반으로 스크립트 카테고리 결정"""
         file_name_lower = file_name.lower()
         
-        if any(kw in file_name_lower for kw in ['dialog', 'conversation', 'talk']):
-            return 'dialogs'
-        elif any(kw in file_name_lower for kw in ['quest', 'mission']):
-            return 'quests'
-        elif any(kw in file_name_lower for kw in ['item', 'equip', 'weapon']):
-            return 'items'
-        elif any(kw in file_name_lower for kw in ['skill', 'ability', 'spell']):
-            return 'skills'
-        else:
-            return 'misc'
+        # 파일명을 한 번만 스캔해 등장하는 카테고리를 모으고, 여러 개면 표의 우선순위대로 선택
+        found = {match.lastgroup for match in self._CATEGORY_RE.finditer(file_name_lower)}
+        return next((category for category, _ in self._CATEGORY_TABLE if category in found), 'misc')
 
     def _read_file_with_encoding(self, file_path: str) -> str:
-        """다양한 인코딩을 시도하여 파일 읽기"""
-        encodings = ['cp949', 'euc-kr', 'utf-8']
+        """파일을 한 번만 읽고 메모리에서 여러 인코딩으로 디코딩 시도"""
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except Exception as e:
+            self.log.warning("[⚠️] 파일 읽기 실패: %s - %s", file_path, e)
+            return ""
         
-        for encoding in encodings:
+        # UTF-8 BOM이 있으면 바로 디코딩
+        if data[:3] == b'\xef\xbb\xbf':
+            return data.decode('utf-8-sig', errors='replace')
+        
+        # 다양한 인코딩 시도 (대부분 ANSI/CP949 사용)
+        for encoding in ('cp949', 'euc-kr', 'utf-8'):
             try:
-                with open(file_path, 'r', encoding=encoding, errors='replace') as f:
-                    return f.read()
+                return data.decode(encoding)
             except UnicodeDecodeError:
                 continue
-            except Exception:
-                break
         
-        # 바이너리 모드로 시도
-        try:
-            with open(file_path, 'rb') as f:
-                content = f.read()
-                # 인코딩 추측 시도
-                return content.decode('cp949', errors='replace')
-        except Exception as e:
-            print(f"[⚠️] 파일 읽기 실패: {file_path} - {e}")
-            return ""
+        # 모두 실패하면 인코딩 감지 후 디코딩
+        if charset_normalizer is not None:
+            best = charset_normalizer.from_bytes(data).best()
+            if best is not None:
+                return str(best)
+        
+        return data.decode('cp949', errors='replace')
 
     def _parse_script_content(self, content: str, file_name: str) -> Dict[str, Any]:
         """스크립트 파일 내용 파싱"""
         # 간단한 키-값 페어 파싱
         result = {}
         
-        # 줄 단위로 파싱
-        lines = content.split('\n')
+        # 줄 단위 분리/공백 제거 없이 정규식 한 번의 스캔으로 줄 종류 판별
         current_section = "default"
         
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('//'):
-                continue
+        for match in self._SCRIPT_LINE_RE.finditer(content):
+            kind = match.lastindex
             
             # 섹션 헤더 확인
-            if line.startswith('[') and line.endswith(']'):
-                current_section = line[1:-1].strip()
+            if kind == 1:
+                current_section = match.group(1).strip()
                 result[current_section] = []
                 continue
             
+            # 섹션 헤더가 나오기 전의 내용, 빈 줄, 주석은 무시
+            if current_section not in result or kind is None or (kind == 4 and not match.group(4)):
+                continue
+            
             # 키-값 쌍 파싱
-            if '=' in line:
-                key, value = line.split('=', 1)
-                if current_section in result:
-                    result[current_section].append({
-                        'key': key.strip(),
-                        'value': value.strip()
-                    })
+            if kind == 3:
+                result[current_section].append({
+                    'key': match.group(2),
+                    'value': match.group(3)
+                })
             else:
                 # 일반 텍스트인 경우
-                if current_section in result:
-                    result[current_section].append({
-                        'key': '',
-                        'value': line
-                    })
+                result[current_section].append({
+                    'key': '',
+                    'value': match.group(4)
+                })
         
         return result
 
@@ -2,8 +2,155 @@ import os
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
-from typing import Dict, Any, List, Optional
+import hashlib
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Iterable, Iterator, Tuple
+
+try:
+    import orjson as _json_fast  # 빠른 JSON 인코딩/디코딩 (선택 사항)
+except ImportError:
+    _json_fast = json
+
+try:
+    from charset_normalizer import from_bytes as _detect_charset  # 인코딩 감지 (선택 사항)
+except ImportError:
+    _detect_charset = None
+
+try:
+    import ahocorasick  # pyahocorasick (선택 사항)
+except ImportError:
+    ahocorasick = None
+
+try:
+    import tiktoken  # 토큰 단위 프롬프트 자르기 (선택 사항)
+except ImportError:
+    tiktoken = None
+
+# LLM 응답에서 JSON 부분을 찾는 정규식 (응답마다 다시 컴파일하지 않도록 모듈 수준에서 한 번만 컴파일)
+_JSON_ARRAY_RE = re.compile(r'\[\s*\{.*\}\s*\]', re.DOTALL)
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\[\s*\{.*\}\s*\])\s*```', re.DOTALL)
+_JSON_LIST_RE = re.compile(r'\[.*\]', re.DOTALL)
+_CODE_BLOCK_RE = re.compile(r'```(?:json)?(.*?)```', re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# 프롬프트용 코드 압축 정규식 (문자열 리터럴은 그대로 두고 //, /* */ 주석만 제거)
+_CODE_COMMENT_RE = re.compile(r'("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')|//[^\n]*|/\*.*?\*/', re.DOTALL)
+_CODE_SPACES_RE = re.compile(r'[ \t]+')
+
+# 게임 스크립트 한 줄 파싱 정규식 (줄 앞뒤 공백은 패턴에서 제외)
+# 그룹: 1=섹션 이름([섹션명]), 2/3=키/값(key=value), 4=일반 텍스트 (// 주석 줄은 그룹 없음)
+_SCRIPT_LINE_RE = re.compile(
+    r'^[^\S\n]*(?://[^\n]*|\[([^\n]*)\]|([^\n=]*?)[^\S\n]*=[^\S\n]*([^\n]*?)|([^\n]*?))[^\S\n]*$',
+    re.MULTILINE)
+
+# 스크립트 파일명 키워드로 카테고리 결정 (앞에 있는 카테고리가 우선)
+_CATEGORY_TABLE = (
+    ('dialogs', ('dialog', 'conversation', 'talk', '대화')),
+    ('quests', ('quest', 'mission', '퀘스트', '임무')),
+    ('items', ('item', 'equip', 'weapon', '아이템', '장비', '무기')),
+    ('skills', ('skill', 'ability', 'spell', '스킬', '능력')),
+)
+# 카테고리별 이름 그룹 정규식 (전방 탐색으로 겹치는 키워드도 모두 찾음)
+_CATEGORY_RE = re.compile('(?=' + '|'.join(f"(?P<{category}>{'|'.join(map(re.escape, keywords))})"
+                                           for category, keywords in _CATEGORY_TABLE) + ')')
+
+# 번역 캐시 키 정규화용 (앞뒤 공백 제거, 연속 공백을 하나로)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _normalize_text(text: str) -> str:
+    """번역 캐시 키로 쓰기 위해 텍스트의 공백 정규화"""
+    return _WHITESPACE_RE.sub(' ', text.strip())
+
+# 토큰 한도에 맞춰 자른 텍스트 끝에 붙이는 표시
+_TRUNCATION_MARK = "... (텍스트가 너무 길어 잘림)"
+
+def _find_json(text: str) -> Tuple[str, Any]:
+    """
+    텍스트에서 JSON 부분을 찾아 (JSON 텍스트, 파싱한 객체) 반환
+    응답 전체가 JSON인지 확인하며 파싱한 객체는 그대로 넘기고, 그 밖의 경우 객체는 None
+    """
+    # 응답 전체가 이미 JSON이면 그대로 사용 (JSON 모드 응답)
+    stripped = text.strip()
+    if stripped[:1] in ('{', '['):
+        try:
+            return stripped, _json_fast.loads(stripped)
+        except ValueError:
+            pass
+    
+    # JSON 블록 추출 시도
+    block = _CODE_BLOCK_RE.search(text)
+    if block:
+        return block.group(1).strip(), None
+    
+    # 중괄호로 감싸진 부분 찾기
+    braces = _JSON_OBJECT_RE.search(text)
+    if braces:
+        return braces.group().strip(), None
+    
+    # JSON 추출 실패 시 원본 반환
+    return text, None
+
+def _extract_and_parse_json(text: str) -> Any:
+    """
+    LLM 응답에서 JSON을 추출해 파싱 (파싱 실패 시 예외 발생)
+    응답 전체가 JSON이면 확인할 때 파싱한 객체를 그대로 반환해 두 번 파싱하지 않음
+    """
+    json_text, parsed = _find_json(text)
+    if parsed is not None:
+        return parsed
+    return _json_fast.loads(json_text)
+
+class ResultObjectScanner:
+    """
+    스트리밍으로 도착하는 LLM 응답에서 완성된 JSON 객체({...})를 중괄호 깊이로 찾아내는 스캐너
+    
+    feed()로 텍스트 조각을 넣을 때마다 새로 닫힌 객체 중 chunk_index 키가 있는
+    분석 결과 항목만 반환합니다. 문자열 안의 중괄호는 무시합니다.
+    """
+    
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._starts = []
+        self._in_string = False
+        self._escape = False
+    
+    def feed(self, piece: str) -> List[Dict[str, Any]]:
+        self.text += piece
+        text = self.text
+        found = []
+        
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self._starts.append(i)
+            elif ch == '}' and self._starts:
+                start = self._starts.pop()
+                try:
+                    obj = _json_fast.loads(text[start:i + 1])
+                except ValueError:
+                    continue
+                if isinstance(obj, dict) and 'chunk_index' in obj:
+                    found.append(obj)
+        
+        self._pos = len(text)
+        return found
 
 class MultiLLMCodeAnalyzer:
     """
@@ -14,7 +161,12 @@ class MultiLLMCodeAnalyzer:
                  translator_url: str = "http://192.168.102.166:1234", 
                  translator_model: str = "eeve-korean-instruct-10.8b-v1.0",
                  knowledge_file: str = None,
-                 script_dir: str = None):
+                 script_dir: str = None,
+                 max_workers: int = 8,
+                 cache_dir: Optional[str] = ".llm_cache",
+                 cache_ttl: Optional[float] = None,
+                 max_prompt_tokens: int = 4000,
+                 keepalive_interval: Optional[float] = 30.0):
         """
         다중 LLM 코드 분석기 초기화
         
@@ -23,12 +175,59 @@ class MultiLLMCodeAnalyzer:
             translator_model: 번역기 LLM 모델 이름
             knowledge_file: 개발자 지식 파일 경로 (없으면 기본값 사용)
             script_dir: 게임 스크립트 파일 디렉토리 경로
+            max_workers: 동시에 보낼 수 있는 최대 LLM 요청 수
+            cache_dir: LLM 응답 캐시 디렉토리 (None이면 디스크 캐시 사용 안 함)
+            cache_ttl: 캐시된 응답의 유효 시간(초), None이면 만료 없음
+            max_prompt_tokens: 코드 분석 LLM에 보내는 프롬프트의 기본 최대 토큰 수
+            keepalive_interval: 유휴 연결 유지를 위해 서버에 HEAD 요청을 보내는 간격(초), None이면 사용 안 함
         """
         # API 설정
         self.translator_url = translator_url.rstrip("/") + "/v1/chat/completions"
         self.translator_model = translator_model
         self.headers = {"Content-Type": "application/json"}
         
+        # 동시 요청 제한 (서버 요청 제한 방지)
+        self.max_workers = max(1, max_workers)
+        
+        # 프롬프트 토큰 한도 (tiktoken이 있으면 정확한 토큰 수, 없으면 문자 수로 근사)
+        self.max_prompt_tokens = max_prompt_tokens
+        self._enc = None
+        if tiktoken is not None:
+            try:
+                self._enc = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                print(f"[ℹ️] tiktoken 인코딩을 불러오지 못해 문자 수 기준으로 프롬프트를 자릅니다: {e}")
+        
+        # prepare_chunks로 전처리한 청크 목록과 병렬 배열 (파일 경로, 소문자 내용)
+        self._prepared_chunks = None
+        self._files_arr = []
+        self._contents_lower_arr = []
+        self._contents_buffer = ''
+        self._chunk_starts = []
+        
+        # 연결 재사용을 위한 세션 (번역기/코드 분석 LLM 요청이 모두 같은 커넥션 풀 사용)
+        # 429/5xx 응답은 지수 백오프로 재시도 (POST도 재시도 대상에 포함)
+        self._session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset(["GET", "POST"]))
+        adapter = HTTPAdapter(pool_connections=100, pool_maxsize=1000, max_retries=retry)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # LLM 응답 캐시 (메모리 LRU + 디스크)
+        self.cache_ttl = cache_ttl
+        self._memory_cache = OrderedDict()
+        self._memory_cache_size = 256
+        self._cache_lock = threading.Lock()
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        
+        # 번역 결과 LRU 캐시 (공백을 정규화한 원문 기준, 반복되는 문구는 번역기를 다시 호출하지 않음)
+        self._translation_cache = OrderedDict()
+        self._translation_cache_size = 4096
+        if self._cache_dir:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+        
         # 코드 분석 LLM 저장소
         self.code_llms = {}
         
@@ -38,24 +237,92 @@ class MultiLLMCodeAnalyzer:
         
         # 번역기 연결 테스트
         self._test_translator_connection()
+        
+        # 서버가 유휴 연결을 끊지 않도록 주기적으로 /v1/models에 HEAD 요청 (백그라운드 스레드)
+        self._keepalive_interval = keepalive_interval
+        self._keepalive_stop = threading.Event()
+        self._keepalive_thread = None
+        if keepalive_interval:
+            self._keepalive_thread = threading.Thread(target=self._keepalive, name="llm-keepalive", daemon=True)
+            self._keepalive_thread.start()
+    
+    def close(self):
+        """연결 유지 스레드를 멈추고 커넥션 풀을 닫음 (이후 요청은 새 연결을 사용)"""
+        self._keepalive_stop.set()
+        if self._keepalive_thread is not None:
+            self._keepalive_thread.join(timeout=5)
+            self._keepalive_thread = None
+        self._session.close()
+    
+    def _keepalive(self):
+        """번역기와 코드 분석 LLM 서버에 주기적으로 가벼운 HEAD 요청을 보내 커넥션 풀을 유지"""
+        while not self._keepalive_stop.wait(self._keepalive_interval):
+            try:
+                urls = [self.translator_url] + [llm.url for llm in list(self.code_llms.values())]
+            except RuntimeError:
+                # LLM 추가와 겹친 경우 다음 주기에 다시 시도
+                continue
+            
+            for models_url in dict.fromkeys(url.rsplit('/v1/', 1)[0] + '/v1/models' for url in urls):
+                if self._keepalive_stop.is_set():
+                    return
+                try:
+                    self._session.head(models_url, timeout=5)
+                except requests.exceptions.RequestException:
+                    pass
     
-    def add_code_llm(self, name: str, api_url: str, model_name: str, specialty: str = "general") -> bool:
+    def __enter__(self) -> "MultiLLMCodeAnalyzer":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def add_code_llm(self, name: str, api_url: str, model_name: str, specialty: str = "general",
+                     verify: Optional[str] = "models", supports_korean: Optional[bool] = None) -> bool:
         """
         코드 분석용 LLM 추가
+        
+        Args:
+            verify: 연결 확인 방법 - "models"(/v1/models 조회, 기본값), "generate"(짧은 생성 요청), None(확인 안 함)
+            supports_korean: 한국어 입출력 가능 여부 (None이면 specialty가 "bilingual"일 때 True)
+                             True면 수정 제안 생성 시 번역기를 거치지 않고 한국어로 직접 요청
         """
         try:
             # LLM 정보를 객체로 저장
             class LLM:
-                def __init__(self, name, url, model, specialty):
+                def __init__(self, name, url, model, specialty, chat, stream_chat, truncate, supports_korean=False):
                     self.name = name
                     self.url = url
                     self.model = model
                     self.specialty = specialty
+                    self.supports_korean = supports_korean
+                    self._chat = chat
+                    self._stream_chat = stream_chat
+                    self._truncate = truncate
+                    self.supports_response_format = True
                 
-                def ask(self, prompt, system_prompt=None, temperature=0.3, max_tokens=2000):
-                    return self._call_llm_api(prompt, system_prompt, temperature, max_tokens)
+                def ask(self, prompt, system_prompt=None, temperature=0.3, max_tokens=2000, no_cache=False,
+                        response_format=None, max_in_tokens=None):
+                    return self._call_llm_api(prompt, system_prompt, temperature, max_tokens, no_cache, response_format,
+                                              max_in_tokens)
                 
-                def _call_llm_api(self, prompt, system_prompt=None, temperature=0.3, max_tokens=2000):
+                def ask_stream(self, prompt, system_prompt=None, temperature=0.3, max_tokens=2000, no_cache=False,
+                               response_format=None, max_in_tokens=None):
+                    """응답 텍스트를 생성되는 대로 조각 단위로 반환 (요청 실패 시 예외 발생)"""
+                    payload = self._build_payload(prompt, system_prompt, temperature, max_tokens, response_format,
+                                                  max_in_tokens)
+                    if payload is None:
+                        return
+                    
+                    try:
+                        yield from self._stream_chat(self.url, payload, no_cache=no_cache)
+                    except requests.exceptions.HTTPError as e:
+                        if not self._drop_response_format(payload, e):
+                            raise
+                        yield from self._stream_chat(self.url, payload, no_cache=no_cache)
+                
+                def _build_payload(self, prompt, system_prompt, temperature, max_tokens, response_format,
+                                   max_in_tokens=None):
                     if system_prompt is None:
                         system_prompt = "You are a helpful assistant specializing in code analysis."
                     
@@ -67,9 +334,8 @@ class MultiLLMCodeAnalyzer:
                             print(f"[⚠️] 프롬프트 변환 오류: {e}")
                             return None
 
-                    # 프롬프트 길이 제한 및 유효성 확인
-                    if len(prompt) > 15000:  # 모델 컨텍스트 제한 고려
-                        prompt = prompt[:15000] + "... (텍스트가 너무 길어 잘림)"
+                    # 프롬프트 길이 제한 (모델 컨텍스트 제한 고려, 토큰 수 기준)
+                    prompt = self._truncate(prompt, max_in_tokens)
                     
                     messages = [
                         {"role": "system", "content": system_prompt},
@@ -79,31 +345,44 @@ class MultiLLMCodeAnalyzer:
                     # 디버깅 로그
                     print(f"[🔍] LLM 요청 전송: {self.name}, 프롬프트 길이: {len(prompt)} 자, 최대 토큰: {max_tokens}")
                     
+                    payload = {
+                        "model": self.model,
+                        "messages": messages,
+                        "temperature": temperature,
+                        "max_tokens": max_tokens
+                    }
+                    if response_format and self.supports_response_format:
+                        payload["response_format"] = response_format
+                    return payload
+                
+                def _drop_response_format(self, payload, error):
+                    """response_format을 지원하지 않는 서버(400)면 해당 필드를 빼고 True 반환"""
+                    if "response_format" not in payload or error.response is None or error.response.status_code != 400:
+                        return False
+                    print(f"[ℹ️] {self.name}: JSON 모드(response_format)를 지원하지 않아 일반 모드로 재요청합니다.")
+                    self.supports_response_format = False
+                    del payload["response_format"]
+                    return True
+                
+                def _call_llm_api(self, prompt, system_prompt=None, temperature=0.3, max_tokens=2000, no_cache=False,
+                                  response_format=None, max_in_tokens=None):
+                    payload = self._build_payload(prompt, system_prompt, temperature, max_tokens, response_format,
+                                                  max_in_tokens)
+                    if payload is None:
+                        return None
+                    
                     try:
-                        response = requests.post(
-                            self.url,
-                            headers={"Content-Type": "application/json"},
-                            json={
-                                "model": self.model,
-                                "messages": messages,
-                                "temperature": temperature,
-                                "max_tokens": max_tokens
-                            },
-                            timeout=60
-                        )
-                        
-                        print(f"[📡] LLM 응답 상태 코드: {response.status_code}")
-                        
-                        response.raise_for_status()
+                        try:
+                            answer = self._chat(self.url, payload, no_cache=no_cache)
+                        except requests.exceptions.HTTPError as e:
+                            # response_format을 지원하지 않는 서버(400)는 해당 필드 없이 다시 요청
+                            if not self._drop_response_format(payload, e):
+                                raise
+                            answer = self._chat(self.url, payload, no_cache=no_cache)
                         
-                        result = response.json()
-                        if "choices" in result and len(result["choices"]) > 0:
-                            answer = result["choices"][0]["message"]["content"]
+                        if answer is not None:
                             print(f"[✅] LLM 응답 수신: {len(answer)} 자")
-                            return answer
-                        else:
-                            print(f"[⚠️] 유효하지 않은 LLM 응답 형식: {result}")
-                            return None
+                        return answer
                     except Exception as e:
                         print(f"[❌] LLM API 요청 오류: {e}")
                         return None
@@ -112,11 +391,29 @@ class MultiLLMCodeAnalyzer:
             llm_url = api_url.rstrip("/") + "/v1/chat/completions"
             
             # LLM 인스턴스 생성
-            llm = LLM(name, llm_url, model_name, specialty)
+            if supports_korean is None:
+                supports_korean = specialty == "bilingual"
+            llm = LLM(name, llm_url, model_name, specialty, self._cached_chat, self._stream_chat,
+                      self._truncate_prompt, supports_korean)
+            
+            if verify is None:
+                self.code_llms[name] = llm
+                print(f"[✅] 코드 분석 LLM '{name}' 추가 (연결 확인 생략)")
+                return True
+            
+            # /v1/models 조회로 서버 응답만 확인 (엔드포인트가 없으면 생성 테스트로 대체)
+            if verify == "models":
+                model_ids = self._probe_models(llm_url)
+                if model_ids is not None:
+                    if model_name not in model_ids:
+                        print(f"[⚠️] 코드 분석 LLM '{name}' 서버 모델 목록에 {model_name}이(가) 없습니다.")
+                    print(f"[✅] 코드 분석 LLM '{name}' 추가 및 연결 확인 성공")
+                    self.code_llms[name] = llm
+                    return True
             
             # 간단한 연결 테스트
             test_prompt = "Write a simple hello world function in Python."
-            response = llm.ask(test_prompt, max_tokens=50)
+            response = llm.ask(test_prompt, max_tokens=50, no_cache=True)
             
             if response:
                 print(f"[✅] 코드 분석 LLM '{name}' 추가 및 테스트 성공")
@@ -176,8 +473,7 @@ Respond only with the JSON.
         # 3. 결과 파싱 및 한국어로 번역
         try:
             # JSON 추출
-            json_str = self._extract_json(analysis_result)
-            analysis = json.loads(json_str)
+            analysis = _extract_and_parse_json(analysis_result)
             
             # 요약 부분 한국어로 번역
             if "summary" in analysis:
@@ -193,6 +489,19 @@ Respond only with the JSON.
             print(f"[❌] 분석 결과 처리 중 오류: {e}")
             return self._create_default_analysis()
     
+    def analyze_bug_reports(self, report_texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        여러 버그 리포트를 동시에 분석 (입력과 같은 순서로 결과 반환)
+        
+        리포트마다 영어 번역 → 코드 LLM 분석 → 요약 한국어 번역 순서로 진행되며,
+        한 리포트가 코드 LLM을 기다리는 동안 다른 리포트의 번역이 진행되도록 겹쳐 실행합니다.
+        """
+        if not report_texts:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(len(report_texts), self.max_workers))) as executor:
+            return list(executor.map(self.analyze_bug_report, report_texts))
+    
     def match_with_code_context(self, bug_report: str, bug_analysis: Dict[str, Any], code_chunks: List[Dict[str, Any]], top_n: int = 5) -> List[Dict[str, Any]]:
         """
         버그 리포트와 가장 관련성이 높은 코드 청크를 찾아 반환합니다.
@@ -247,11 +556,8 @@ Respond only with the JSON.
         # 청크 그룹화 처리 (한 번에 최대 10개까지 처리)
         chunk_groups = [filtered_chunks[i:i+10] for i in range(0, len(filtered_chunks), 10)]
         
-        for group_idx, chunk_group in enumerate(chunk_groups):
-            print(f"[🔄] 청크 그룹 {group_idx+1}/{len(chunk_groups)} 분석 중 ({len(chunk_group)}개)")
-            
-            # LLM에 분석 프롬프트 구성
-            prompt = f"""
+        # 모든 그룹이 공유하는 프롬프트 앞부분 (서버의 프리픽스 KV 캐시가 재사용되도록 그룹마다 동일하게 유지)
+        preface = f"""
 You are a specialized code analysis agent analyzing bug reports and source code.
 
 I'm going to provide you with bug information and code chunks. Your task is to analyze each code chunk to determine how relevant it is to the bug report.
@@ -260,107 +566,75 @@ I'm going to provide you with bug information and code chunks. Your task is to a
 - Keywords: {', '.join(keywords) if keywords else 'No specific keywords'}
 - Bug Summary: {summary}
 
+# ANALYSIS INSTRUCTIONS
+For each code chunk, analyze:
+1. How relevant it is to the bug description (score from 0-10)
+2. Why it might be connected to the bug
+3. Any specific code patterns or functions that match with the bug report
+
+# RESPONSE FORMAT
+Respond with a single JSON object as follows:
+```json
+{{
+  "results": [
+    {{
+      "chunk_index": 1,
+      "relevance_score": 8,
+      "reasoning": "This chunk contains the function mentioned in the bug report and handles the problematic scenario",
+      "referenced_code": "specific lines or elements from the code that are relevant"
+    }},
+    ...
+  ]
+}}
+```
+Order the results by relevance_score from highest to lowest.
+
 # CODE CHUNKS TO ANALYZE
 """
+        
+        # 프롬프트 전체가 max_prompt_tokens 안에 들어가도록 공통 앞부분을 뺀 나머지를 그룹의 청크 수로 나눠 배분
+        # (넘치면 요청 시 프롬프트 끝이 잘려 마지막 청크들이 분석되지 않음)
+        preface_tokens = self._count_tokens(preface)
+        mark_tokens = self._count_tokens(_TRUNCATION_MARK)
+        
+        prompts = []
+        for chunk_group in chunk_groups:
+            chunk_budget = (self.max_prompt_tokens - preface_tokens) // len(chunk_group)
             
-            # 각 코드 청크 정보 추가
+            # 그룹마다 달라지는 코드 청크는 프롬프트 끝에 추가
+            parts = [preface]
             for idx, chunk in enumerate(chunk_group):
                 file_name = chunk.get('file', 'Unknown file')
                 start_line = chunk.get('start_line', 0)
                 end_line = chunk.get('end_line', 0)
-                content = chunk.get('content', '').strip()
                 
-                # 콘텐츠가 너무 길면 자름
-                if len(content) > 1500:
-                    content = content[:1500] + "... (truncated)"
-                
-                prompt += f"""
+                header = f"""
 CHUNK {idx+1}:
 - File: {file_name}
 - Lines: {start_line}-{end_line}
 ```
-{content}
-```
 """
-            
-            # 프롬프트 마무리 - 분석 및 응답 형식 안내
-            prompt += """
-# ANALYSIS INSTRUCTIONS
-For each code chunk, analyze:
-1. How relevant it is to the bug description (score from 0-10)
-2. Why it might be connected to the bug
-3. Any specific code patterns or functions that match with the bug report
-
-# RESPONSE FORMAT
-Respond in JSON format as follows:
-```json
-[
-  {
-    "chunk_index": 1,
-    "relevance_score": 8,
-    "reasoning": "This chunk contains the function mentioned in the bug report and handles the problematic scenario",
-    "referenced_code": "specific lines or elements from the code that are relevant"
-  },
-  ...
-]
+                footer = """
 ```
-Order the chunks by relevance_score from highest to lowest.
 """
-            
-            # LLM 호출
-            try:
-                response = analysis_llm.ask(prompt)
-                
-                # JSON 응답 추출 시도
-                try:
-                    # "[" 와 "]" 사이의 JSON 데이터 추출
-                    json_str = re.search(r'\[\s*\{.*\}\s*\]', response, re.DOTALL)
-                    if json_str:
-                        json_data = json.loads(json_str.group())
-                    else:
-                        # "```json" 와 "```" 사이의 데이터 추출 시도
-                        json_str = re.search(r'```(?:json)?\s*(\[\s*\{.*\}\s*\])\s*```', response, re.DOTALL)
-                        if json_str:
-                            json_data = json.loads(json_str.group(1))
-                        else:
-                            print(f"[⚠️] JSON 형식 응답을 찾을 수 없습니다. 원본 응답: {response[:100]}...")
-                            continue
-                            
-                    # 분석 결과를 코드 청크에 매핑
-                    for item in json_data:
-                        chunk_idx = item.get('chunk_index', 0) - 1  # 1-indexed to 0-indexed
-                        if 0 <= chunk_idx < len(chunk_group):
-                            chunk = chunk_group[chunk_idx]
-                            
-                            # 한국어 번역 시도
-                            reasoning_ko = ""
-                            referenced_code_ko = ""
-                            
-                            try:
-                                reasoning_ko = self._translate_to_korean(item.get('reasoning', ''))
-                                referenced_code_ko = self._translate_to_korean(item.get('referenced_code', ''))
-                            except Exception as e:
-                                print(f"[⚠️] 번역 중 오류: {e}")
-                                reasoning_ko = item.get('reasoning', '')
-                                referenced_code_ko = item.get('referenced_code', '')
-                            
-                            ranked_matches.append({
-                                'file': chunk.get('file', ''),
-                                'file_path': chunk.get('file_path', ''),
-                                'start_line': chunk.get('start_line', 0),
-                                'end_line': chunk.get('end_line', 0),
-                                'content': chunk.get('content', ''),
-                                'relevance_score': item.get('relevance_score', 0),
-                                'reasoning': reasoning_ko,
-                                'referenced_code': referenced_code_ko
-                            })
-                    
-                except json.JSONDecodeError as e:
-                    print(f"[❌] JSON 파싱 오류: {e}")
-                    print(f"[ℹ️] 원본 응답: {response[:100]}...")
+                # 주석/공백을 제거해 압축하고, 그래도 길면 청크 몫(최대 500토큰)에 맞춰 토큰 수 기준으로 자름
+                content_budget = chunk_budget - self._count_tokens(header) - self._count_tokens(footer) - mark_tokens
+                content = self._truncate_prompt(self._compress_code(chunk.get('content', '')),
+                                                max(0, min(500, content_budget)))
                 
-            except Exception as e:
-                print(f"[❌] LLM API 요청 오류: {e}")
+                parts.append(header + content + footer)
+            prompts.append(''.join(parts))
+        
+        # 모든 그룹 프롬프트를 스트리밍으로 동시에 전송 (완성된 결과 항목은 생성이 끝나기 전에 바로 번역 요청)
+        print(f"[🔄] 청크 그룹 {len(chunk_groups)}개 병렬 분석 중 (동시 요청 최대 {self.max_workers}개)")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as translator_pool, \
+                ThreadPoolExecutor(max_workers=max(1, min(len(prompts), self.max_workers))) as executor:
+            group_matches = list(executor.map(
+                lambda args: self._analyze_chunk_group(analysis_llm, *args, translator_pool),
+                zip(range(len(prompts)), prompts, chunk_groups)))
+        
+        for matches in group_matches:
+            ranked_matches.extend(matches)
         
         # 최종 결과 정렬 및 반환
         if ranked_matches:
@@ -387,6 +661,118 @@ Order the chunks by relevance_score from highest to lowest.
                 })
             return default_results
     
+    def _compress_code(self, code: str) -> str:
+        """프롬프트 토큰을 줄이기 위해 코드의 주석, 빈 줄, 연속 공백 제거"""
+        code = _CODE_COMMENT_RE.sub(lambda m: m.group(1) or '', code)
+        code = _CODE_SPACES_RE.sub(' ', code)
+        return '\n'.join(line.strip() for line in code.splitlines() if line.strip())
+    
+    def _analyze_chunk_group(self, analysis_llm: Any, group_idx: int, prompt: str,
+                             chunk_group: List[Dict[str, Any]], translator_pool: ThreadPoolExecutor) -> List[Dict[str, Any]]:
+        """
+        청크 그룹 하나를 스트리밍으로 분석
+        결과 항목이 완성되는 즉시 번역을 요청하고, 스트리밍 중 항목을 찾지 못하면 전체 응답을 다시 해석
+        """
+        scanner = ResultObjectScanner()
+        pending = []  # (청크, 분석 항목, 번역 Future)
+        
+        try:
+            for piece in analysis_llm.ask_stream(prompt, response_format={"type": "json_object"}):
+                for item in scanner.feed(piece):
+                    chunk_idx = item.get('chunk_index', 0) - 1  # 1-indexed to 0-indexed
+                    if 0 <= chunk_idx < len(chunk_group):
+                        future = translator_pool.submit(self._translate_batch_to_korean,
+                                                        [item.get('reasoning', ''), item.get('referenced_code', '')])
+                        pending.append((chunk_group[chunk_idx], item, future))
+        except Exception as e:
+            print(f"[❌] LLM API 요청 오류: {e}")
+        
+        response = scanner.text
+        if response:
+            print(f"[✅] LLM 응답 수신: {len(response)} 자")
+        
+        matches = []
+        if pending:
+            for chunk, item, future in pending:
+                try:
+                    reasoning_ko, referenced_code_ko = future.result()
+                except Exception as e:
+                    print(f"[⚠️] 번역 중 오류: {e}")
+                    reasoning_ko, referenced_code_ko = item.get('reasoning', ''), item.get('referenced_code', '')
+                matches.append(self._build_match(chunk, item, reasoning_ko, referenced_code_ko))
+            return matches
+        
+        # 스트리밍 중 결과 항목을 찾지 못한 경우 전체 응답을 해석하고 그룹 단위로 한 번에 번역
+        matched_items = self._parse_group_response(group_idx, response, chunk_group)
+        texts = []
+        for _, item in matched_items:
+            texts.append(item.get('reasoning', ''))
+            texts.append(item.get('referenced_code', ''))
+        
+        try:
+            translated = self._translate_batch_to_korean(texts)
+        except Exception as e:
+            print(f"[⚠️] 번역 중 오류: {e}")
+            translated = texts
+        
+        for i, (chunk, item) in enumerate(matched_items):
+            matches.append(self._build_match(chunk, item, translated[2 * i], translated[2 * i + 1]))
+        return matches
+    
+    def _parse_group_response(self, group_idx: int, response: Optional[str],
+                              chunk_group: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """청크 그룹 분석 응답 전체를 해석하여 (청크, 분석 항목) 목록 반환 (실패 시 빈 목록)"""
+        if not response:
+            print(f"[⚠️] 청크 그룹 {group_idx+1} 분석 응답이 없습니다.")
+            return []
+        
+        # JSON 응답 추출 시도
+        try:
+            # JSON 모드 응답은 {"results": [...]} 객체 그대로 파싱
+            json_data = self._parse_results_object(response)
+            
+            if json_data is None:
+                # JSON 모드를 지원하지 않는 서버 대비: "[" 와 "]" 사이의 JSON 데이터 추출
+                json_str = _JSON_ARRAY_RE.search(response)
+                if json_str:
+                    json_data = _json_fast.loads(json_str.group())
+                else:
+                    # "```json" 와 "```" 사이의 데이터 추출 시도
+                    json_str = _JSON_FENCE_RE.search(response)
+                    if json_str:
+                        json_data = _json_fast.loads(json_str.group(1))
+                    else:
+                        print(f"[⚠️] JSON 형식 응답을 찾을 수 없습니다. 원본 응답: {response[:100]}...")
+                        return []
+            
+        except json.JSONDecodeError as e:
+            print(f"[❌] JSON 파싱 오류: {e}")
+            print(f"[ℹ️] 원본 응답: {response[:100]}...")
+            return []
+        
+        # 분석 결과를 코드 청크에 매핑
+        matched_items = []
+        for item in json_data:
+            if not isinstance(item, dict):
+                continue
+            chunk_idx = item.get('chunk_index', 0) - 1  # 1-indexed to 0-indexed
+            if 0 <= chunk_idx < len(chunk_group):
+                matched_items.append((chunk_group[chunk_idx], item))
+        return matched_items
+    
+    def _build_match(self, chunk: Dict[str, Any], item: Dict[str, Any], reasoning_ko: Any, referenced_code_ko: Any) -> Dict[str, Any]:
+        """코드 청크와 번역된 분석 결과로 매칭 결과 항목 생성"""
+        return {
+            'file': chunk.get('file', ''),
+            'file_path': chunk.get('file_path', ''),
+            'start_line': chunk.get('start_line', 0),
+            'end_line': chunk.get('end_line', 0),
+            'content': chunk.get('content', ''),
+            'relevance_score': item.get('relevance_score', 0),
+            'reasoning': reasoning_ko,
+            'referenced_code': referenced_code_ko
+        }
+    
     def generate_fix_suggestion(self, bug_report: str, top_match: Dict[str, Any]) -> str:
         """
         버그 리포트와 가장 관련성이 높은 코드 청크에 대한 수정 제안을 생성합니다.
@@ -414,15 +800,6 @@ Order the chunks by relevance_score from highest to lowest.
         if len(code_content) > 3000:
             code_content = code_content[:3000] + "\n// ... (너무 긴 코드는 생략됨) ..."
             
-        # 버그 리포트 영어로 번역 시도
-        bug_report_en = bug_report
-        try:
-            bug_report_en = self._translate_to_english(bug_report)
-            print("[ℹ️] 버그 리포트 영어 번역 완료")
-        except Exception as e:
-            print(f"[⚠️] 버그 리포트 번역 중 오류: {e}")
-            # 원본 텍스트 유지
-        
         # 의심 라인 정보 컴파일
         start_line = top_match.get('start_line', 0)
         end_line = top_match.get('end_line', 0)
@@ -447,6 +824,21 @@ Order the chunks by relevance_score from highest to lowest.
             
         print(f"[🧠] 코드 수정 제안에 사용할 LLM: {fix_llm.name}")
         
+        # 한국어를 지원하는 LLM이면 번역 없이 원본 리포트를 그대로 전달하고 한국어로 응답 요청
+        bug_report_en = bug_report
+        if fix_llm.supports_korean:
+            language_instruction = "\nWrite your entire response in Korean."
+        else:
+            language_instruction = ""
+            
+            # 버그 리포트 영어로 번역 시도
+            try:
+                bug_report_en = self._translate_to_english(bug_report)
+                print("[ℹ️] 버그 리포트 영어 번역 완료")
+            except Exception as e:
+                print(f"[⚠️] 버그 리포트 번역 중 오류: {e}")
+                # 원본 텍스트 유지
+        
         # 수정 제안 프롬프트 작성
         prompt = f"""
 You are an expert C++ bug-fixing assistant. Analyze the bug report and code to suggest a fix.
@@ -483,13 +875,18 @@ Respond with the following structure:
 
 Your response should be detailed, accurate, and only reference parts of code that are visible in the provided snippet.
 Do not invent function names or code that isn't shown in the snippet.
-If you cannot determine a fix with confidence, explain what additional information would be needed.
+If you cannot determine a fix with confidence, explain what additional information would be needed.{language_instruction}
 """
         
         try:
             # LLM 응답 가져오기
             response = fix_llm.ask(prompt)
             
+            # 한국어로 직접 응답한 경우 번역 생략
+            if fix_llm.supports_korean:
+                print("[✅] 수정 제안 생성 완료")
+                return response
+            
             # 한국어로 번역
             try:
                 translated_response = self._translate_to_korean(response)
@@ -509,9 +906,18 @@ If you cannot determine a fix with confidence, explain what additional informati
         try:
             print(f"[🔄] 번역기 LLM 서버 연결 테스트 중...")
             
-            # 간단한 번역 테스트
+            # /v1/models 조회로 서버와 모델 확인
+            model_ids = self._probe_models(self.translator_url)
+            if model_ids is not None:
+                if self.translator_model not in model_ids:
+                    print(f"[⚠️] 번역기 LLM 서버 모델 목록에 {self.translator_model}이(가) 없습니다.")
+                    return False
+                print(f"[✅] 번역기 LLM 서버 연결 성공 (모델: {self.translator_model})")
+                return True
+            
+            # /v1/models를 지원하지 않는 서버는 간단한 번역 테스트
             test_text = "안녕하세요, 테스트입니다."
-            english = self._translate_to_english(test_text)
+            english = self._translate_to_english(test_text, no_cache=True)
             
             if english:
                 print(f"[✅] 번역기 LLM 서버 연결 성공 (모델: {self.translator_model})")
@@ -525,22 +931,135 @@ If you cannot determine a fix with confidence, explain what additional informati
             print(f"[❌] 번역기 LLM 서버 연결 실패: {e}")
             return False
     
-    def _translate_to_english(self, korean_text: str) -> Optional[str]:
+    def _probe_models(self, completions_url: str) -> Optional[List[str]]:
+        """
+        /v1/models 조회로 서버 응답을 확인하고 모델 ID 목록 반환
+        서버에 해당 엔드포인트가 없으면(404) None
+        
+        Raises:
+            requests.exceptions.RequestException: 연결 실패 또는 404 이외의 오류 응답
+        """
+        models_url = completions_url.rsplit('/v1/', 1)[0] + '/v1/models'
+        response = self._session.get(models_url, timeout=5)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return [model.get('id') for model in _json_fast.loads(response.content).get('data', [])]
+    
+    def _translate_to_english(self, korean_text: str, no_cache: bool = False) -> Optional[str]:
         """한국어를 영어로 번역"""
         system_prompt = "당신은 한국어를 영어로 번역하는 전문가입니다."
         prompt = f"다음 한국어 텍스트를 영어로 번역해주세요:\n\n{korean_text}"
         
-        return self._call_translator_llm(system_prompt, prompt)
+        return self._translate("en", korean_text, system_prompt, prompt, no_cache=no_cache)
         
     def _translate_to_korean(self, english_text: str) -> Optional[str]:
         """영어를 한국어로 번역"""
         system_prompt = "당신은 영어를 한국어로 번역하는 전문가입니다."
         prompt = f"다음 영어 텍스트를 한국어로 번역해주세요:\n\n{english_text}"
         
-        return self._call_translator_llm(system_prompt, prompt)
+        return self._translate("ko", english_text, system_prompt, prompt)
+    
+    def _translate(self, direction: str, text: str, system_prompt: str, prompt: str,
+                   no_cache: bool = False) -> Optional[str]:
+        """번역기 호출 (같은 원문의 번역이 캐시에 있으면 재사용, 실패한 번역은 캐시하지 않음)"""
+        if not no_cache:
+            cached = self._get_cached_translation(direction, text)
+            if cached is not None:
+                return cached
+        
+        translated = self._call_translator_llm(system_prompt, prompt, no_cache=no_cache)
+        if translated:
+            self._store_translation(direction, text, translated)
+        return translated
+    
+    def _translate_batch_to_korean(self, texts: List[Any]) -> List[Any]:
+        """
+        여러 영어 텍스트를 한 번의 요청으로 한국어 번역 (입력과 같은 순서/길이의 리스트 반환)
+        캐시에 없는 텍스트만 중복 없이 요청하고, 배치 응답을 해석할 수 없으면 항목별로 번역
+        번역에 실패한 항목은 원문 유지
+        """
+        # 빈 텍스트는 번역하지 않음
+        indices = [i for i, text in enumerate(texts) if text]
+        if not indices:
+            return list(texts)
+        
+        sources = [texts[i] if isinstance(texts[i], str) else str(texts[i]) for i in indices]
+        translations = [self._get_cached_translation("ko", text) for text in sources]
+        
+        # 캐시에 없는 텍스트만 정규화 기준으로 중복을 제거해 번역 요청
+        missing = list({_normalize_text(text): text
+                        for text, translated in zip(sources, translations) if translated is None}.values())
+        if missing:
+            batch = self._request_batch_translation(missing)
+            if batch is None:
+                print("[⚠️] 일괄 번역 응답 형식이 올바르지 않아 항목별로 번역합니다.")
+                # 번역 요청은 소켓 대기 중 GIL을 놓는 블로킹 I/O이므로 스레드로 동시에 전송
+                with ThreadPoolExecutor(max_workers=min(16, len(missing))) as executor:
+                    batch = list(executor.map(self._translate_to_korean, missing))
+            
+            translated_by_key = {}
+            for text, translated in zip(missing, batch):
+                if translated:
+                    translated = translated if isinstance(translated, str) else str(translated)
+                    self._store_translation("ko", text, translated)
+                    translated_by_key[_normalize_text(text)] = translated
+            
+            translations = [translated if translated is not None else translated_by_key.get(_normalize_text(text))
+                            for text, translated in zip(sources, translations)]
+        
+        result = list(texts)
+        for i, translated in zip(indices, translations):
+            if translated:
+                result[i] = translated
+        return result
+    
+    def _request_batch_translation(self, sources: List[str]) -> Optional[List[Any]]:
+        """텍스트 목록을 JSON 배열로 한 번에 번역 요청 (응답 형식이 올바르지 않으면 None)"""
+        system_prompt = ("당신은 영어를 한국어로 번역하는 전문가입니다. "
+                         "입력으로 주어지는 JSON 배열의 각 문자열을 한국어로 번역하여, "
+                         "같은 길이와 같은 순서의 JSON 배열로만 응답하세요.")
+        prompt = json.dumps(sources, ensure_ascii=False)
+        
+        translations = None
+        response = self._call_translator_llm(system_prompt, prompt)
+        if response:
+            try:
+                translations = _json_fast.loads(response)
+            except json.JSONDecodeError:
+                # 설명이나 코드 펜스가 붙은 경우 배열 부분만 추출
+                array_match = _JSON_LIST_RE.search(response)
+                if array_match:
+                    try:
+                        translations = _json_fast.loads(array_match.group())
+                    except json.JSONDecodeError:
+                        translations = None
+        
+        if not isinstance(translations, list) or len(translations) != len(sources):
+            return None
+        return translations
+    
+    def _get_cached_translation(self, direction: str, text: str) -> Optional[str]:
+        """번역 캐시 조회 (정규화한 원문 기준)"""
+        key = (direction, _normalize_text(text))
+        with self._cache_lock:
+            translated = self._translation_cache.get(key)
+            if translated is not None:
+                self._translation_cache.move_to_end(key)
+            return translated
+    
+    def _store_translation(self, direction: str, text: str, translated: str):
+        """번역 결과를 LRU 캐시에 저장 (가장 오래 사용하지 않은 항목부터 제거)"""
+        key = (direction, _normalize_text(text))
+        with self._cache_lock:
+            self._translation_cache[key] = translated
+            self._translation_cache.move_to_end(key)
+            if len(self._translation_cache) > self._translation_cache_size:
+                self._translation_cache.popitem(last=False)
     
     def _call_translator_llm(self, system_prompt: str, prompt: str, 
-                           temperature: float = 0.3, max_tokens: int = 2000) -> Optional[str]:
+                           temperature: float = 0.3, max_tokens: int = 2000,
+                           no_cache: bool = False) -> Optional[str]:
         """번역기 LLM API 호출"""
         messages = [
             {"role": "system", "content": system_prompt},
@@ -555,20 +1074,7 @@ If you cannot determine a fix with confidence, explain what additional informati
         }
         
         try:
-            response = requests.post(
-                self.translator_url,
-                headers=self.headers,
-                json=payload,
-                timeout=60
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            if "choices" in result and len(result["choices"]) > 0:
-                return result["choices"][0]["message"]["content"]
-            else:
-                print(f"[⚠️] 유효하지 않은 LLM 응답 형식: {result}")
-                return None
+            return self._cached_chat(self.translator_url, payload, no_cache=no_cache)
                 
         except Exception as e:
             print(f"[❌] LLM API 요청 오류: {e}")
@@ -582,8 +1088,8 @@ If you cannot determine a fix with confidence, explain what additional informati
             return None
             
         llm_info = self.code_llms[llm_name]
-        url = llm_info["url"]
-        model = llm_info["model"]
+        url = llm_info.url
+        model = llm_info.model
         
         if system_prompt is None:
             system_prompt = "You are an expert software engineer specializing in code analysis."
@@ -601,48 +1107,192 @@ If you cannot determine a fix with confidence, explain what additional informati
         }
         
         try:
-            response = requests.post(
-                url,
-                headers=self.headers,
-                json=payload,
-                timeout=60
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            if "choices" in result and len(result["choices"]) > 0:
-                return result["choices"][0]["message"]["content"]
-            else:
-                print(f"[⚠️] 유효하지 않은 LLM 응답 형식: {result}")
-                return None
+            return self._cached_chat(url, payload)
                 
         except Exception as e:
             print(f"[❌] LLM API 요청 오류: {e}")
             return None
     
-    def _extract_json(self, text: str) -> str:
-        """텍스트에서 JSON 부분 추출"""
-        # JSON 블록 추출 시도
-        if "```json" in text:
-            start = text.find("```json") + 7
-            end = text.find("```", start)
-            if end != -1:
-                return text[start:end].strip()
-        elif "```" in text:
-            start = text.find("```") + 3
-            end = text.find("```", start)
-            if end != -1:
-                return text[start:end].strip()
-        
-        # 중괄호로 감싸진 부분 찾기
-        if "{" in text and "}" in text:
-            start = text.find("{")
-            end = text.rfind("}") + 1
-            if start < end:
-                return text[start:end].strip()
-        
-        # JSON 추출 실패 시 원본 반환
-        return text
+    def _count_tokens(self, text: str) -> int:
+        """텍스트의 토큰 수 (tiktoken이 없으면 _truncate_prompt와 같이 토큰당 4자로 근사해 올림)"""
+        if self._enc is not None:
+            return len(self._enc.encode(text, disallowed_special=()))
+        return -(-len(text) // 4)
+    
+    def _truncate_prompt(self, prompt: str, max_in_tokens: Optional[int] = None) -> str:
+        """
+        프롬프트를 토큰 수 기준으로 자르기 (max_in_tokens가 None이면 max_prompt_tokens 사용)
+        tiktoken이 없으면 토큰당 약 4자로 근사하여 문자 수로 자름
+        """
+        if max_in_tokens is None:
+            max_in_tokens = self.max_prompt_tokens
+        
+        if self._enc is not None:
+            ids = self._enc.encode(prompt, disallowed_special=())
+            if len(ids) <= max_in_tokens:
+                return prompt
+            return self._enc.decode(ids[:max_in_tokens]) + _TRUNCATION_MARK
+        
+        max_chars = max_in_tokens * 4
+        if len(prompt) <= max_chars:
+            return prompt
+        return prompt[:max_chars] + _TRUNCATION_MARK
+    
+    def _cached_chat(self, url: str, payload: Dict[str, Any], no_cache: bool = False) -> Optional[str]:
+        """
+        채팅 완성 요청 (같은 서버/요청 내용이면 캐시된 응답 반환)
+        
+        Raises:
+            requests.exceptions.RequestException: 요청 실패 시
+        """
+        key = None
+        if not no_cache:
+            key = self._cache_key(url, payload)
+            cached = self._get_cached_response(key)
+            if cached is not None:
+                return cached
+        
+        response = self._session.post(
+            url,
+            headers=self.headers,
+            data=_json_fast.dumps(payload),
+            timeout=60
+        )
+        response.raise_for_status()
+        
+        result = _json_fast.loads(response.content)
+        if "choices" in result and len(result["choices"]) > 0:
+            answer = result["choices"][0]["message"]["content"]
+        else:
+            print(f"[⚠️] 유효하지 않은 LLM 응답 형식: {result}")
+            return None
+        
+        if key is not None and answer:
+            self._store_cached_response(key, answer)
+        return answer
+    
+    def _stream_chat(self, url: str, payload: Dict[str, Any], no_cache: bool = False) -> Iterator[str]:
+        """
+        스트리밍 채팅 완성 요청 - SSE(data: {...}) 프레임의 delta.content를 도착하는 대로 반환
+        캐시된 응답이 있으면 한 번에 반환하고, 끝까지 받은 응답은 캐시에 저장
+        
+        Raises:
+            requests.exceptions.RequestException: 요청 실패 시
+        """
+        key = None
+        if not no_cache:
+            key = self._cache_key(url, payload)
+            cached = self._get_cached_response(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        pieces = []
+        response = self._session.post(
+            url,
+            headers=self.headers,
+            data=_json_fast.dumps(dict(payload, stream=True)),
+            timeout=60,
+            stream=True
+        )
+        try:
+            response.raise_for_status()
+            
+            # 스트리밍을 지원하지 않는 서버는 일반 응답을 그대로 반환
+            if "text/event-stream" not in response.headers.get("Content-Type", ""):
+                result = _json_fast.loads(response.content)
+                if result.get("choices"):
+                    pieces.append(result["choices"][0]["message"]["content"])
+                    yield pieces[-1]
+            else:
+                for line in response.iter_lines():
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    
+                    frame = _json_fast.loads(data)
+                    if not frame.get("choices"):
+                        continue
+                    delta = frame["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        pieces.append(delta)
+                        yield delta
+        finally:
+            response.close()
+        
+        if key is not None and pieces:
+            self._store_cached_response(key, "".join(pieces))
+    
+    def _cache_key(self, url: str, payload: Dict[str, Any]) -> str:
+        """요청 서버와 내용으로 캐시 키(BLAKE2b) 생성"""
+        key_source = json.dumps({'url': url, 'payload': payload}, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(key_source.encode('utf-8')).hexdigest()
+    
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """메모리 캐시 → 디스크 캐시 순으로 저장된 응답 조회 (cache_ttl이 지난 응답은 무시)"""
+        now = time.time()
+        with self._cache_lock:
+            entry = self._memory_cache.get(key)
+            if entry is not None:
+                if self.cache_ttl is None or now - entry[1] <= self.cache_ttl:
+                    self._memory_cache.move_to_end(key)
+                    return entry[0]
+                del self._memory_cache[key]
+        
+        if not self._cache_dir:
+            return None
+        
+        cache_file = self._cache_dir / f"{key}.json"
+        try:
+            with open(cache_file, 'rb') as f:
+                data = _json_fast.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        answer = data.get('content')
+        created = data.get('created', 0)
+        if not answer or (self.cache_ttl is not None and now - created > self.cache_ttl):
+            return None
+        
+        self._remember_response(key, answer, created)
+        return answer
+    
+    def _store_cached_response(self, key: str, answer: str):
+        """응답을 메모리 캐시와 디스크 캐시에 저장"""
+        created = time.time()
+        self._remember_response(key, answer, created)
+        
+        if not self._cache_dir:
+            return
+        
+        cache_file = self._cache_dir / f"{key}.json"
+        tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'content': answer, 'created': created}, f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"[⚠️] LLM 응답 캐시 저장 실패: {e}")
+    
+    def _remember_response(self, key: str, answer: str, created: float):
+        """메모리 LRU 캐시에 응답 저장"""
+        with self._cache_lock:
+            self._memory_cache[key] = (answer, created)
+            self._memory_cache.move_to_end(key)
+            while len(self._memory_cache) > self._memory_cache_size:
+                self._memory_cache.popitem(last=False)
+    
+    def _parse_results_object(self, text: str) -> Optional[List[Dict[str, Any]]]:
+        """JSON 모드 응답({"results": [...]})에서 결과 목록 추출 (형식이 다르면 None)"""
+        try:
+            parsed = _json_fast.loads(text)
+        except ValueError:
+            return None
+        
+        results = parsed.get('results') if isinstance(parsed, dict) else None
+        return results if isinstance(results, list) else None
     
     def _create_default_analysis(self) -> Dict[str, Any]:
         """기본 버그 분석 결과 생성 (분석 실패 시)"""
@@ -654,6 +1304,44 @@ If you cannot determine a fix with confidence, explain what additional informati
             "summary": "분석에 실패했습니다."
         }
     
+    def prepare_chunks(self, code_chunks: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        코드 청크를 한 번만 전처리 (로드 직후 호출)
+        파일 경로 키를 맞추고 소문자 내용을 미리 만들어, 사전 필터링이 딕셔너리 조회 없이
+        파일/소문자 내용 병렬 배열만 스캔하도록 함
+        제너레이터를 넘기면 청크가 생성되는 대로 전처리하며, 전처리한 청크 목록을 반환
+        (이후 match_with_code_context에는 반환된 목록을 전달)
+        """
+        chunks = code_chunks if isinstance(code_chunks, list) else []
+        files_arr = []
+        contents_lower_arr = []
+        for chunk in code_chunks:
+            if chunks is not code_chunks:
+                chunks.append(chunk)
+            
+            # 파일 경로 키 일관성 유지
+            if 'file_path' in chunk and 'file' not in chunk:
+                chunk['file'] = chunk['file_path']
+            elif 'file' in chunk and 'file_path' not in chunk:
+                chunk['file_path'] = chunk['file']
+            
+            files_arr.append(chunk.get('file_path', ''))
+            contents_lower_arr.append(self._content_lower(chunk))
+        
+        # 소문자 내용을 구분자(\0)로 이어 붙인 단일 버퍼와 각 청크의 시작 오프셋
+        chunk_starts = []
+        offset = 0
+        for content_lower in contents_lower_arr:
+            chunk_starts.append(offset)
+            offset += len(content_lower) + 1
+        
+        self._prepared_chunks = chunks
+        self._files_arr = files_arr
+        self._contents_lower_arr = contents_lower_arr
+        self._contents_buffer = '\0'.join(contents_lower_arr)
+        self._chunk_starts = chunk_starts
+        return chunks
+    
     def _prefilter_chunks(self, bug_analysis: Dict[str, Any], code_chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         버그 분석 키워드/의심 함수가 포함된 코드 청크 필터링
@@ -665,25 +1353,71 @@ If you cannot determine a fix with confidence, explain what additional informati
         if not keywords and not functions:
             return code_chunks
         
-        filtered = []
-        search_terms = set(keywords + functions)
+        search_terms = {term.lower() for term in keywords + functions if term}
+        if not search_terms:
+            return code_chunks
         
-        for chunk in code_chunks:
-            # 파일 경로 키 일관성 유지
-            if 'file_path' in chunk and 'file' not in chunk:
-                chunk['file'] = chunk['file_path']
-            elif 'file' in chunk and 'file_path' not in chunk:
-                chunk['file_path'] = chunk['file']
-                
-            content = chunk['content'].lower()
-            
-            # 검색어가 코드 내용에 포함되어 있는지 확인
-            if any(term.lower() in content for term in search_terms if term):
-                filtered.append(chunk)
+        # 청크 목록이 바뀌었을 때만 소문자 배열을 다시 준비
+        if self._prepared_chunks is not code_chunks:
+            self.prepare_chunks(code_chunks)
+        
+        # 모든 검색어를 한 번에 찾는 탐색기로 이어 붙인 소문자 버퍼를 한 번만 스캔
+        # (일치 위치는 청크 시작 오프셋으로 청크를 찾고, 다음 탐색은 다음 청크 시작부터 계속)
+        find = self._build_term_finder(search_terms)
+        buffer = self._contents_buffer
+        starts = self._chunk_starts
+        filtered = []
+        pos = 0
+        while True:
+            hit = find(buffer, pos)
+            if hit < 0:
+                break
+            chunk_idx = bisect_right(starts, hit) - 1
+            filtered.append(code_chunks[chunk_idx])
+            if chunk_idx + 1 >= len(starts):
+                break
+            pos = starts[chunk_idx + 1]
         
         # 필터링된 결과가 너무 적으면 원본 청크 반환
         return filtered if len(filtered) >= 3 else code_chunks
     
+    def _build_term_finder(self, search_terms: Iterable[str]) -> Callable[[str, int], int]:
+        """
+        pos 이후에서 검색어 중 하나가 처음 나타나는 위치를 한 번의 스캔으로 찾는 함수 생성 (없으면 -1)
+        (pyahocorasick이 있으면 Aho-Corasick 오토마톤, 없으면 정규식 OR 패턴 사용)
+        """
+        # 청크 구분자(\0)가 들어간 검색어는 청크 경계를 넘어 일치할 수 있으므로 제외
+        search_terms = [term for term in search_terms if '\0' not in term]
+        if not search_terms:
+            return lambda text, pos: -1
+        
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for term in search_terms:
+                automaton.add_word(term, True)
+            automaton.make_automaton()
+            
+            def find(text, pos):
+                # 오토마톤은 일치한 검색어의 마지막 문자 위치를 반환
+                for end, _ in automaton.iter(text, pos):
+                    return end
+                return -1
+            return find
+        
+        pattern = re.compile('|'.join(map(re.escape, search_terms)))
+        
+        def find(text, pos):
+            match = pattern.search(text, pos)
+            return match.start() if match else -1
+        return find
+    
+    def _content_lower(self, chunk: Dict[str, Any]) -> str:
+        """청크 내용의 소문자 버전 (청크에 캐시하여 버그마다 다시 만들지 않음)"""
+        content_lower = chunk.get('_content_lower')
+        if content_lower is None:
+            content_lower = chunk['_content_lower'] = chunk['content'].lower()
+        return content_lower
+    
     def _load_developer_knowledge(self, file_path: str) -> Dict[str, List[Dict[str, str]]]:
         """
         개발자가 제공한 도메인 지식을 로드합니다.
@@ -706,11 +1440,9 @@ If you cannot determine a fix with confidence, explain what additional informati
         try:
             print(f"[📚] 개발자 지식 파일 로드 중: {file_path}")
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
-            for line in lines:
-                line = line.strip()
+            # 파일 전체를 한 번에 매핑해서 읽고 바이트 단위로 줄 분리
+            for raw_line in self._read_file_bytes(file_path).splitlines():
+                line = raw_line.decode('utf-8', 'replace').strip()
                 
                 # 빈 줄 무시
                 if not line:
@@ -793,54 +1525,43 @@ If you cannot determine a fix with confidence, explain what additional informati
             print(f"[ℹ️] 발견된 스크립트 파일: {len(script_files)}개")
             
             # 각 파일 처리 (최대 50개까지만 처리)
+            # 파일 읽기는 스레드 풀에서 겹쳐 수행하고, 파싱은 순서 유지를 위해 현재 스레드에서 수행
             max_files = min(len(script_files), 50)
-            for script_file in script_files[:max_files]:
+            with ThreadPoolExecutor(max_workers=max(1, min(16, max_files))) as executor:
+                results = list(executor.map(self._read_script, script_files[:max_files]))
+            
+            for script_file, category, content in results:
                 file_name = os.path.basename(script_file)
-                category = self._determine_script_category(file_name)
                 
                 try:
-                    # 다양한 인코딩 시도 (대부분 ANSI/CP949 사용)
-                    content = ""
-                    for encoding in ['cp949', 'euc-kr', 'utf-8']:
-                        try:
-                            with open(script_file, 'r', encoding=encoding, errors='replace') as f:
-                                content = f.read()
-                                break
-                        except UnicodeDecodeError:
-                            continue
-                    
                     if content:
                         # 간단한 파싱 - 섹션과 키-값 쌍 추출
                         sections = {}
                         current_section = "default"
                         sections[current_section] = []
                         
-                        for line in content.split('\n'):
-                            line = line.strip()
+                        # 줄 단위 분리/공백 제거 없이 정규식 한 번의 스캔으로 줄 종류 판별
+                        for match in _SCRIPT_LINE_RE.finditer(content):
+                            kind = match.lastindex
                             
-                            # 빈 줄이나 주석 무시
-                            if not line or line.startswith('//'):
-                                continue
-                                
                             # 섹션 헤더 확인 ([섹션명] 형식)
-                            if line.startswith('[') and line.endswith(']'):
-                                current_section = line[1:-1].strip()
+                            if kind == 1:
+                                current_section = match.group(1).strip()
                                 if current_section not in sections:
                                     sections[current_section] = []
-                                continue
                             
                             # 키-값 쌍 파싱 (key=value 형식)
-                            if '=' in line:
-                                key, value = line.split('=', 1)
+                            elif kind == 3:
                                 sections[current_section].append({
-                                    'key': key.strip(),
-                                    'value': value.strip()
+                                    'key': match.group(2),
+                                    'value': match.group(3)
                                 })
-                            else:
-                                # 일반 텍스트 라인 처리
+                            
+                            # 일반 텍스트 라인 처리 (빈 줄과 주석은 무시)
+                            elif kind == 4 and match.group(4):
                                 sections[current_section].append({
                                     'key': '',
-                                    'value': line
+                                    'value': match.group(4)
                                 })
                         
                         # 섹션 데이터가 비어있지 않은 경우만 추가
@@ -868,17 +1589,52 @@ If you cannot determine a fix with confidence, explain what additional informati
             print(f"[❌] 스크립트 로드 중 오류 발생: {e}")
             return scripts
             
+    def _read_script(self, script_file: str) -> Tuple[str, str, str]:
+        """스크립트 파일 하나를 읽어 (경로, 카테고리, 내용) 반환 (읽기 실패 시 빈 내용)"""
+        file_name = os.path.basename(script_file)
+        category = self._determine_script_category(file_name)
+        
+        try:
+            return script_file, category, self._read_script_text(script_file)
+        except Exception as e:
+            print(f"[⚠️] 스크립트 파일 처리 중 오류: {file_name} - {e}")
+            return script_file, category, ""
+    
+    def _read_file_bytes(self, file_path: str) -> bytes:
+        """파일 전체를 버퍼 없이 한 번에 읽기"""
+        with open(file_path, 'rb', buffering=0) as f:
+            return f.read()
+    
+    def _read_script_text(self, script_file: str) -> str:
+        """
+        스크립트 파일을 한 번만 읽고 메모리에서 디코딩
+        대부분의 스크립트가 쓰는 CP949, 다음으로 UTF-8을 엄격하게 시도하고,
+        둘 다 실패할 때만 인코딩을 감지 (감지도 실패하면 CP949로 깨진 문자만 대체)
+        """
+        data = self._read_file_bytes(script_file)
+        
+        # UTF-8 BOM이 있으면 바로 디코딩
+        if data[:3] == b'\xef\xbb\xbf':
+            return data[3:].decode('utf-8', errors='replace')
+        
+        for encoding in ('cp949', 'utf-8'):
+            try:
+                return data.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+        
+        encoding = 'cp949'
+        if _detect_charset is not None:
+            best = _detect_charset(data[:65536]).best()
+            if best is not None and best.encoding != 'ascii':
+                encoding = best.encoding
+        
+        return data.decode(encoding, errors='replace')
+    
     def _determine_script_category(self, file_name: str) -> str:
         """파일명을 기반으로 스크립트 카테고리 결정"""
         file_name_lower = file_name.lower()
         
-        if any(kw in file_name_lower for kw in ['dialog', 'conversation', 'talk', '대화']):
-            return 'dialogs'
-        elif any(kw in file_name_lower for kw in ['quest', 'mission', '퀘스트', '임무']):
-            return 'quests'
-        elif any(kw in file_name_lower for kw in ['item', 'equip', 'weapon', '아이템', '장비', '무기']):
-            return 'items'
-        elif any(kw in file_name_lower for kw in ['skill', 'ability', 'spell', '스킬', '능력']):
-            return 'skills'
-        else:
-            return 'misc' 
\ No newline at end of file
+        # 파일명을 한 번만 스캔해 등장하는 카테고리를 모으고, 여러 개면 표의 우선순위대로 선택
+        found = {match.lastgroup for match in _CATEGORY_RE.finditer(file_name_lower)}
+        return next((category for category, _ in _CATEGORY_TABLE if category in found), 'misc')
@@ -0,0 +1,301 @@
+import os
+import sys
+import codecs
+import hashlib
+import re
+import mmap
+import sqlite3
+import json
+from bisect import bisect_left
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+try:
+    import numpy as np  # 줄바꿈 위치 계산 (선택 사항)
+except ImportError:
+    np = None
+
+try:
+    import orjson as _json_fast  # 빠른 JSON 인코딩/디코딩 (선택 사항)
+except ImportError:
+    _json_fast = json
+
+try:
+    from charset_normalizer import from_bytes as _detect_charset  # 인코딩 감지 (선택 사항)
+except ImportError:
+    _detect_charset = None
+
+# 소스 코드 로더
+# use_llm_analyzer.py / use_multi_llm_analyzer.py가 함께 쓰는 소스 파일 스캔, 청크 분할, 청크 캐시
+
+# 이보다 큰 소스 파일은 생성 코드/데이터로 보고 청크로 나누지 않음
+MAX_SOURCE_BYTES = 8 * 1024 * 1024
+
+# 청크 하나의 목표 크기 (코드 분석 프롬프트가 청크당 3000자까지 쓰므로 잘리지 않는 크기로 맞춤)
+CHUNK_TARGET_BYTES = 3072
+# 청크 경계에 걸친 코드의 문맥을 잃지 않도록 이전 청크와 겹치는 줄 수
+CHUNK_OVERLAP_LINES = 10
+
+# 이보다 작은 소스 파일은 mmap 대신 한 번의 읽기로 메모리에 올림 (페이지 단위 작은 읽기 반복 방지)
+MMAP_MIN_BYTES = 1024 * 1024
+
+# 분석 대상 소스 파일 확장자
+SOURCE_EXTENSIONS = ('.cpp', '.h')
+
+# 파일별 청크 캐시 (경로/수정 시각/크기가 같은 파일은 다음 실행에서 다시 읽지 않음, None이면 사용 안 함)
+CHUNK_CACHE_FILE = ".chunk_cache.sqlite"
+
+def _detect_encoding(head: bytes) -> str:
+    """
+    파일 앞부분 바이트로 인코딩을 한 번만 감지
+    ASCII만 있거나 CP949로 읽히면 CP949, UTF-8로 읽히면 UTF-8, 둘 다 아니면 charset_normalizer 결과 사용
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    
+    # 앞부분을 자른 위치에서 멀티바이트 문자가 잘릴 수 있으므로 증분 디코더로 확인
+    for encoding in ('ascii', 'utf-8', 'cp949'):
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return 'cp949' if encoding == 'ascii' else encoding
+        except UnicodeDecodeError:
+            continue
+    
+    if _detect_charset is not None:
+        best = _detect_charset(head).best()
+        if best is not None:
+            return best.encoding
+    
+    return 'cp949'
+
+def chunk_source(buf, target_bytes: int = CHUNK_TARGET_BYTES,
+                 overlap_lines: int = CHUNK_OVERLAP_LINES) -> List[Tuple[int, int, int, int]]:
+    """
+    소스 버퍼(bytes/mmap)를 약 target_bytes 크기의 줄 단위 구간으로 나눈 (시작 줄, 끝 줄, 시작 바이트, 끝 바이트) 목록 반환
+    각 구간은 target_bytes 이상이 되는 첫 줄 경계에서 끝나고, 다음 구간은 경계 문맥을 위해 overlap_lines줄 겹쳐 시작
+    줄바꿈 탐색과 구간 끝 탐색은 numpy(없으면 정규식/bisect)로 C 수준에서 처리하고, 줄 단위 문자열은 만들지 않음
+    CRLF의 CR은 구간에서 제외하고, 내용이 없는 구간은 건너뜀
+    """
+    # 줄바꿈(0x0A) 위치 (CP949/EUC-KR/UTF-8의 멀티바이트 문자에는 0x0A가 들어가지 않으므로 바이트 단위로 안전)
+    # numpy가 있으면 줄바꿈 위치를 파이썬 정수 목록으로 바꾸지 않고 배열 그대로 searchsorted로 탐색
+    # (줄 수가 아니라 구간 수만큼만 파이썬 수준 연산이 일어남)
+    if np is not None:
+        newlines = np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == 0x0A)
+        find_line_end = newlines.searchsorted
+    else:
+        newlines = [m.start() for m in re.finditer(b'\n', buf)]
+        find_line_end = partial(bisect_left, newlines)
+    
+    size = len(buf)
+    newline_count = len(newlines)
+    total_lines = newline_count + 1
+    spans = []
+    
+    i = 0
+    while i < total_lines:
+        start = int(newlines[i - 1]) + 1 if i > 0 else 0
+        # 구간 크기가 target_bytes 이상이 되는 첫 줄 끝을 이진 탐색 (최소 한 줄은 포함)
+        end_idx = max(int(find_line_end(start + target_bytes)), i) + 1
+        end_idx = min(end_idx, total_lines)
+        end = int(newlines[end_idx - 1]) if end_idx - 1 < newline_count else size
+        
+        # 텍스트 모드로 읽을 때처럼 CRLF 줄바꿈은 LF로 맞춤
+        if end < size and end > start and buf[end - 1] == 0x0D:
+            end -= 1
+        
+        # 빈 구간은 디코딩하지 않도록 제외
+        if start < end:
+            spans.append((i + 1, end_idx, start, end))
+        
+        if end_idx >= total_lines:
+            break
+        # 다음 구간은 overlap_lines줄 앞에서 시작하되 항상 앞으로 진행
+        # (긴 줄 때문에 구간 줄 수가 적으면 겹침을 구간 줄 수의 1/4까지로 줄여 같은 줄이 여러 청크에 반복되지 않게 함)
+        i = max(end_idx - min(overlap_lines, (end_idx - i) // 4), i + 1)
+    
+    return spans
+
+def _iter_chunks(file_path: str, encoding: Optional[str] = None,
+                 target_bytes: int = CHUNK_TARGET_BYTES) -> Iterator[Dict[str, Any]]:
+    """
+    소스 파일을 읽어 줄바꿈 위치를 한 번만 계산한 뒤, 약 target_bytes 크기의 청크를 하나씩 생성
+    MMAP_MIN_BYTES보다 작은 파일은 버퍼 없이 한 번에 읽고, 큰 파일은 mmap으로 열어 각 청크 구간만 디코딩
+    encoding이 None이면 파일 앞부분으로 한 번만 감지
+    """
+    # 네트워크 드라이브에서도 작은 읽기가 반복되지 않도록 버퍼 없이 열어 필요한 만큼 한 번에 읽음
+    with open(file_path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        # 빈 파일은 mmap할 수 없고 청크도 없음
+        if size == 0:
+            return
+        
+        if size < MMAP_MIN_BYTES:
+            yield from _iter_buffer_chunks(f.read(), file_path, encoding, target_bytes)
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield from _iter_buffer_chunks(mm, file_path, encoding, target_bytes)
+
+def _iter_buffer_chunks(buf, file_path: str, encoding: Optional[str],
+                        target_bytes: int) -> Iterator[Dict[str, Any]]:
+    """파일 내용 버퍼(bytes/mmap)를 청크로 나누고 각 구간만 디코딩해 청크를 하나씩 생성"""
+    # 앞부분에 NUL 바이트가 있으면 바이너리 파일로 보고 건너뜀
+    if b'\x00' in buf[:512]:
+        return
+    
+    if encoding is None:
+        encoding = _detect_encoding(buf[:4096])
+    
+    for start_line, end_line, start, end in chunk_source(buf, target_bytes):
+        chunk_content = buf[start:end].decode(encoding, 'replace').replace('\r\n', '\n')
+        # strip()으로 사본을 만들지 않고 공백 여부만 C 수준에서 확인 (비어있지 않은 경우만)
+        if chunk_content and not chunk_content.isspace():
+            yield {
+                'file_path': file_path,
+                'start_line': start_line,
+                'end_line': end_line,
+                'content': chunk_content
+            }
+
+def _chunk_one_file(file_path: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    소스 파일 하나를 청크 목록으로 변환 (프로세스 풀에서 실행할 수 있도록 모듈 수준 함수로 둠)
+    읽기에 실패하면 None (바이너리/빈 파일의 빈 목록과 구분해 캐시에 남기지 않음)
+    """
+    try:
+        # 인코딩을 한 번만 감지해 읽고 청크로 분할 (약 CHUNK_TARGET_BYTES 단위, 경계 부분은 겹침)
+        return list(_iter_chunks(file_path))
+    except Exception as e:
+        print(f"[⚠️] {file_path} 파일 처리 중 오류: {e}")
+        return None
+
+def _open_chunk_cache(cache_file: Optional[str]) -> Optional[sqlite3.Connection]:
+    """청크 캐시 DB 열기 (사용하지 않거나 열 수 없으면 None)"""
+    if not cache_file:
+        return None
+    try:
+        conn = sqlite3.connect(cache_file)
+        conn.execute("CREATE TABLE IF NOT EXISTS chunks "
+                     "(path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, params TEXT, blob BLOB)")
+        return conn
+    except sqlite3.Error as e:
+        print(f"[⚠️] 청크 캐시({cache_file})를 열 수 없어 캐시 없이 진행합니다: {e}")
+        return None
+
+def _walk(directory: str, extensions) -> Iterator[os.DirEntry]:
+    """확장자가 맞는 파일 항목을 os.walk와 같은 순서로 생성 (scandir 항목을 그대로 넘겨 stat 정보를 재사용)"""
+    subdirs = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(extensions):
+                    yield entry
+    except OSError:
+        # os.walk와 마찬가지로 열 수 없는 디렉토리는 건너뜀
+        return
+    for path in subdirs:
+        yield from _walk(path, extensions)
+
+def load_source_files(directory: str, extensions=SOURCE_EXTENSIONS,
+                      max_bytes: int = MAX_SOURCE_BYTES,
+                      cache_file: Optional[str] = CHUNK_CACHE_FILE) -> Iterator[Dict[str, Any]]:
+    """소스 파일 로드 및 청크로 분할 (청크를 하나씩 생성하는 제너레이터)"""
+    chunk_count = 0
+    
+    print(f"[🔍] {directory} 에서 소스 파일 스캔 중...")
+    
+    try:
+        # 대상 파일 목록을 먼저 수집 (빈 파일과 max_bytes보다 큰 파일은 읽지 않음)
+        paths = []
+        # scandir 항목의 stat 결과를 그대로 써서 파일마다 경로를 다시 조합하거나 stat을 반복하지 않음
+        for entry in _walk(directory, extensions):
+            try:
+                st = entry.stat()
+            except OSError as e:
+                print(f"[⚠️] {entry.path} 파일 정보 확인 실패: {e}")
+                continue
+            if 0 < st.st_size <= max_bytes:
+                paths.append((entry.path, st.st_mtime_ns, st.st_size))
+        
+        # 이전 실행과 경로/수정 시각/크기/청크 설정이 모두 같은 파일은 캐시된 청크를 그대로 사용
+        cache = _open_chunk_cache(cache_file)
+        # 마지막 값은 청크 분할 방식 버전 (분할 규칙이 바뀌면 올려서 이전 캐시를 무효화)
+        params = f"{CHUNK_TARGET_BYTES}:{CHUNK_OVERLAP_LINES}:2"
+        cached = {}
+        if cache is not None:
+            cached = {row[0]: row[1:] for row in cache.execute("SELECT path, mtime, size, params FROM chunks")}
+        missing = [path for path, mtime, size in paths if cached.get(path) != (mtime, size, params)]
+        if cache is not None and len(missing) < len(paths):
+            print(f"[ℹ️] 변경되지 않은 파일 {len(paths) - len(missing)}개는 청크 캐시 사용")
+        updates = []
+        
+        # 파일별 읽기/디코딩/청크 분할은 서로 독립적이므로 여러 프로세스에 나눠 처리 (파일 순서 유지)
+        # 전체 목록을 만들지 않고 파일 처리가 끝나는 대로 청크를 하나씩 넘김
+        # 브랜치 복사본 등으로 내용이 똑같은 청크는 처음 것만 분석 대상에 포함 (64비트 내용 해시로 비교)
+        seen_hashes = set()
+        duplicate_count = 0
+        # 청크마다 반복되는 전역/속성 조회를 루프 밖에서 한 번만 수행
+        blake2b = hashlib.blake2b
+        intern = sys.intern
+        seen_add = seen_hashes.add
+        try:
+            with ProcessPoolExecutor() as executor:
+                # 캐시에 없는 파일만 프로세스 풀에서 처리하고, 결과는 원래 파일 순서대로 캐시 결과와 합침
+                computed = executor.map(_chunk_one_file, missing, chunksize=32)
+                for file_path, mtime, size in paths:
+                    if cached.get(file_path) == (mtime, size, params):
+                        blob = cache.execute("SELECT blob FROM chunks WHERE path = ?", (file_path,)).fetchone()[0]
+                        rows = _json_fast.loads(blob)
+                    else:
+                        file_chunks = next(computed)
+                        if file_chunks is None:
+                            continue
+                        rows = [(chunk['start_line'], chunk['end_line'], chunk['content']) for chunk in file_chunks]
+                        if cache is not None:
+                            updates.append((file_path, mtime, size, params, _json_fast.dumps(rows)))
+                    
+                    # 모듈 상수 키와 intern된 경로 하나를 파일의 모든 청크가 공유하도록 구성
+                    file_path = intern(file_path)
+                    for start_line, end_line, content in rows:
+                        content_hash = blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+                        if content_hash in seen_hashes:
+                            duplicate_count += 1
+                            continue
+                        seen_add(content_hash)
+                        chunk_count += 1
+                        yield {
+                            'file_path': file_path,
+                            'start_line': start_line,
+                            'end_line': end_line,
+                            'content': content
+                        }
+        finally:
+            # 새로 청크로 나눈 파일은 한 트랜잭션으로 캐시에 저장
+            # 스캔한 디렉토리 아래에서 이번에 보이지 않은 파일(삭제/이동되었거나 크기 제한을 넘은 파일)의 캐시는 제거
+            if cache is not None:
+                seen_paths = {path for path, _, _ in paths}
+                prefix = os.path.join(directory, '')
+                stale = [(path,) for path in cached if path.startswith(prefix) and path not in seen_paths]
+                try:
+                    with cache:
+                        cache.executemany("INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?)", updates)
+                        cache.executemany("DELETE FROM chunks WHERE path = ?", stale)
+                except sqlite3.Error as e:
+                    print(f"[⚠️] 청크 캐시 저장 실패: {e}")
+                cache.close()
+        
+        if duplicate_count:
+            print(f"[ℹ️] 내용이 중복된 청크 {duplicate_count}개 제외")
+        print(f"[✅] {chunk_count}개 코드 청크 생성 완료")
+        
+    except Exception as e:
+        print(f"[❌] 소스 파일 스캔 중 오류 발생: {e}")
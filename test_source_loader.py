@@ -0,0 +1,28 @@
+from source_loader import chunk_source
+
+
+def _covered_bytes(buf, **kwargs):
+    return sum(end - start for _, _, start, end in chunk_source(buf, **kwargs))
+
+
+def test_long_lines_are_not_repeated_across_many_chunks():
+    # 400바이트 줄 40개: 구간마다 줄 수가 적어도 각 줄이 여러 청크에 반복되지 않아야 함
+    buf = b''.join(b'x' * 399 + b'\n' for _ in range(40))
+    assert _covered_bytes(buf) <= len(buf) * 1.5
+
+
+def test_short_lines_keep_full_overlap():
+    buf = b''.join(b'int a%d = 0;\n' % i for i in range(1000))
+    spans = chunk_source(buf, target_bytes=1024, overlap_lines=10)
+    for (_, prev_end, _, _), (next_start, _, _, _) in zip(spans, spans[1:]):
+        assert prev_end - next_start + 1 == 10
+    assert _covered_bytes(buf, target_bytes=1024, overlap_lines=10) < len(buf) * 1.3
+
+
+def test_spans_cover_every_line():
+    buf = b''.join(b'y' * (i % 700) + b'\n' for i in range(300))
+    spans = chunk_source(buf, target_bytes=3072, overlap_lines=10)
+    assert spans[0][0] == 1
+    assert spans[-1][1] == 301
+    for (_, prev_end, _, _), (next_start, _, _, _) in zip(spans, spans[1:]):
+        assert next_start <= prev_end + 1
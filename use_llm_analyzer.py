@@ -1,7 +1,11 @@
 import os
+import io
+import sys
 import argparse
-from llm_code_analyzer import LLMCodeAnalyzer
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+import logging
+from llm_code_analyzer import LLMCodeAnalyzer, get_logger
+from source_loader import load_source_files
 
 # llm 기반 코드 분석기
 # 버그 리포트 분석 후 소스코드 분석 후 매칭
@@ -15,77 +19,14 @@ from typing import List, Dict, Any
 def load_bug_report(file_path: str) -> str:
     """버그 리포트 파일 로드"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        # 버퍼 없이 한 번에 읽고 한 번만 디코딩 (텍스트 모드처럼 줄바꿈은 \n으로 통일)
+        with open(file_path, 'rb', buffering=0) as f:
+            data = f.read()
+        return data.decode('utf-8', 'replace').replace('\r\n', '\n').replace('\r', '\n')
     except Exception as e:
         print(f"[❌ 오류] 버그 리포트 로드 실패: {e}")
         return ""
 
-def load_source_files(directory: str, extensions=('.cpp', '.h')) -> List[Dict[str, Any]]:
-    """소스 파일 로드 및 청크로 분할"""
-    chunks = []
-    
-    print(f"[🔍] {directory} 에서 소스 파일 스캔 중...")
-    
-    try:
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.endswith(extensions):
-                    file_path = os.path.join(root, file)
-                    
-                    try:
-                        # ANSI(CP949) 인코딩으로 파일 읽기 시도
-                        with open(file_path, 'r', encoding='cp949', errors='replace') as f:
-                            content = f.read()
-                            
-                        # 청크로 분할 (100줄 단위)
-                        lines = content.split('\n')
-                        chunk_size = 100
-                        
-                        for i in range(0, len(lines), chunk_size):
-                            end_idx = min(i + chunk_size, len(lines))
-                            chunk_content = '\n'.join(lines[i:end_idx])
-                            
-                            if chunk_content.strip():  # 비어있지 않은 경우만
-                                chunks.append({
-                                    'file_path': file_path,
-                                    'start_line': i + 1,
-                                    'end_line': end_idx,
-                                    'content': chunk_content
-                                })
-                                
-                    except UnicodeDecodeError:
-                        # CP949 실패 시 EUC-KR로 시도
-                        try:
-                            with open(file_path, 'r', encoding='euc-kr', errors='replace') as f:
-                                content = f.read()
-                                
-                            # 같은 청크 분할 로직 반복
-                            lines = content.split('\n')
-                            for i in range(0, len(lines), chunk_size):
-                                end_idx = min(i + chunk_size, len(lines))
-                                chunk_content = '\n'.join(lines[i:end_idx])
-                                
-                                if chunk_content.strip():
-                                    chunks.append({
-                                        'file_path': file_path,
-                                        'start_line': i + 1,
-                                        'end_line': end_idx,
-                                        'content': chunk_content
-                                    })
-                        except Exception as e2:
-                            print(f"[⚠️] {file_path} 파일 읽기 실패: {e2}")
-                    
-                    except Exception as e:
-                        print(f"[⚠️] {file_path} 파일 처리 중 오류: {e}")
-                        
-        print(f"[✅] {len(chunks)}개 코드 청크 생성 완료")
-        return chunks
-        
-    except Exception as e:
-        print(f"[❌] 소스 파일 스캔 중 오류 발생: {e}")
-        return []
-
 def main():
     """메인 실행 함수"""
     # 명령줄 인자 파싱
@@ -102,9 +43,14 @@ def main():
                         help='사용할 LLM 모델 이름')
     parser.add_argument('--script_dir', type=str, default="C:/data/GCS",
                         help='게임 스크립트 파일 디렉토리 경로')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='코드 청크별 분석 진행 상황까지 출력')
     
     args = parser.parse_args()
     
+    if args.verbose:
+        get_logger().setLevel(logging.DEBUG)
+    
     # 경로 설정
     bug_report_path = args.bug_report
     source_dir = args.source_dir
@@ -128,22 +74,28 @@ def main():
         print("[❌] 버그 리포트가 비어있습니다. 종료합니다.")
         return
     
-    # 2. LLM 분석기 초기화
-    print("\n[🤖] LLM 코드 분석기 초기화 중...")
-    analyzer = LLMCodeAnalyzer(
-        api_url=args.api_url,
-        model_name=args.model,
-        knowledge_file=knowledge_file,
-        script_dir=script_dir
-    )
-    
-    # 3. 버그 리포트 분석
-    print("\n[🔍] 버그 리포트 분석 중...")
-    bug_analysis = analyzer.analyze_bug_report(bug_report)
+    # 소스 코드 로드는 분석기 초기화/버그 리포트 분석(LLM 응답 대기)과 겹치도록 백그라운드 스레드에서 시작
+    # 로더가 파일 처리가 끝나는 대로 넘기는 청크를 바로 토큰화해 사전 필터 인덱스를 함께 만듦
+    print("\n[📂] 소스 코드 로드 시작 (분석기 초기화 및 버그 리포트 분석과 동시 진행)...")
+    with ThreadPoolExecutor(max_workers=1) as loader:
+        source_future = loader.submit(lambda: LLMCodeAnalyzer.build_chunk_index(load_source_files(source_dir)))
+        
+        # 2. LLM 분석기 초기화
+        print("\n[🤖] LLM 코드 분석기 초기화 중...")
+        analyzer = LLMCodeAnalyzer(
+            api_url=args.api_url,
+            model_name=args.model,
+            knowledge_file=knowledge_file,
+            script_dir=script_dir
+        )
+        
+        # 3. 버그 리포트 분석
+        print("\n[🔍] 버그 리포트 분석 중...")
+        bug_analysis = analyzer.analyze_bug_report(bug_report)
+        
+        # 4. 소스 코드 로드 완료 대기 (학습된 사전 필터 인덱스는 분석기에 등록)
+        code_chunks = analyzer.set_chunk_index(source_future.result())
     
-    # 4. 소스 코드 로드
-    print("\n[📂] 소스 코드 로드 중...")
-    code_chunks = load_source_files(source_dir)
     if not code_chunks:
         print("[❌] 소스 코드 로드에 실패했습니다. 종료합니다.")
         return
@@ -153,43 +105,48 @@ def main():
     matching_chunks = analyzer.match_with_code_context(bug_analysis, code_chunks, top_n=5)
     
     # 6. 결과 출력
-    print("\n[📊] === 분석 결과 ===")
-    print(f"버그 유형: {bug_analysis.get('bug_type', '알 수 없음')}")
-    print(f"심각도: {bug_analysis.get('severity', '알 수 없음')}")
-    print(f"버그 요약: {bug_analysis.get('summary', '알 수 없음')}")
-    print(f"관련 키워드: {', '.join(bug_analysis.get('keywords', ['없음']))}")
+    # 청크마다 여러 줄을 출력하므로 버퍼에 모아 한 번에 기록 (느린 콘솔에서 쓰기 호출 횟수 감소)
+    out = io.StringIO()
+    print("\n[📊] === 분석 결과 ===", file=out)
+    print(f"버그 유형: {bug_analysis.get('bug_type', '알 수 없음')}", file=out)
+    print(f"심각도: {bug_analysis.get('severity', '알 수 없음')}", file=out)
+    print(f"버그 요약: {bug_analysis.get('summary', '알 수 없음')}", file=out)
+    print(f"관련 키워드: {', '.join(bug_analysis.get('keywords', ['없음']))}", file=out)
     
-    print("\n[🔍] 의심 코드 영역:")
+    print("\n[🔍] 의심 코드 영역:", file=out)
     for i, chunk in enumerate(matching_chunks, 1):
         file_path = chunk['file_path']
         file_name = os.path.basename(file_path)
         
-        print(f"\n{i}. 파일: {file_name}")
-        print(f"   전체 경로: {file_path}")
-        print(f"   코드 위치: {chunk['start_line']}~{chunk['end_line']} 라인")
+        print(f"\n{i}. 파일: {file_name}", file=out)
+        print(f"   전체 경로: {file_path}", file=out)
+        print(f"   코드 위치: {chunk['start_line']}~{chunk['end_line']} 라인", file=out)
         
         # 의심 라인 정보 출력
         suspected_lines = chunk.get('suspected_lines', [])
         if suspected_lines:
-            print(f"   의심 라인: {', '.join(map(str, suspected_lines))}")
+            print(f"   의심 라인: {', '.join(map(str, suspected_lines))}", file=out)
             
             # 참조된 코드 출력 (새로운 형식)
             referenced_code = chunk.get('referenced_code', [])
             if referenced_code:
-                print("\n   참조된 코드:")
+                print("\n   참조된 코드:", file=out)
                 for ref in referenced_code:
                     line_num = ref.get('line', '?')
                     code = ref.get('code', '코드 정보 없음')
                     reason = ref.get('reason', '')
-                    print(f"   {line_num}번 줄: {code}")
+                    print(f"   {line_num}번 줄: {code}", file=out)
                     if reason:
-                        print(f"      ↳ 이유: {reason}")
+                        print(f"      ↳ 이유: {reason}", file=out)
         
         # 분석 신뢰도 표시
         confidence = chunk.get('confidence', '알 수 없음')
-        print(f"   분석 신뢰도: {confidence}")
-        print(f"   관련성 점수: {chunk.get('relevance_score', 0)}/10")
-        print(f"   분석: {chunk.get('reasoning', '정보 없음')}")
+        print(f"   분석 신뢰도: {confidence}", file=out)
+        print(f"   관련성 점수: {chunk.get('relevance_score', 0)}/10", file=out)
+        print(f"   분석: {chunk.get('reasoning', '정보 없음')}", file=out)
+    
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
     
     # 7. 최상위 매칭에 대한 수정 제안 생성
     if matching_chunks:
@@ -1,177 +1,93 @@
 import os
+import io
+import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import json
+from dataclasses import dataclass
 from multi_llm_analyzer import MultiLLMCodeAnalyzer
-from typing import List, Dict, Any
+from source_loader import load_source_files
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import orjson as _json_fast  # 빠른 JSON 디코딩 (선택 사항)
+except ImportError:
+    _json_fast = json
 
 def load_bug_report(file_path):
     """버그 리포트 로드 함수"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        # 버퍼 없이 한 번에 읽고 한 번만 디코딩 (텍스트 모드처럼 줄바꿈은 \n으로 통일)
+        with open(file_path, 'rb', buffering=0) as f:
+            data = f.read()
+        return data.decode('utf-8', 'replace').replace('\r\n', '\n').replace('\r', '\n')
     except Exception as e:
         print(f"[⚠️] {file_path} 파일 로드 중 오류: {e}")
         return None
 
-def load_source_files(source_dir):
-    """소스 코드 로드 함수"""
-    chunks = []
-    
-    print(f"[🔍] {source_dir} 경로에서 소스 파일 스캔 중...")
-    
-    try:
-        for root, _, files in os.walk(source_dir):
-            for file in files:
-                if file.endswith(('.cpp', '.h')):
-                    file_path = os.path.join(root, file)
-                    
-                    try:
-                        # ANSI(CP949) 인코딩으로 파일 읽기 시도
-                        with open(file_path, 'r', encoding='cp949', errors='replace') as f:
-                            content = f.read()
-                            
-                        # 청크로 분할 (100줄 단위)
-                        lines = content.split('\n')
-                        chunk_size = 100
-                        
-                        for i in range(0, len(lines), chunk_size):
-                            end_idx = min(i + chunk_size, len(lines))
-                            chunk_content = '\n'.join(lines[i:end_idx])
-                            
-                            if chunk_content.strip():  # 비어있지 않은 경우만
-                                chunks.append({
-                                    'file_path': file_path,
-                                    'start_line': i + 1,
-                                    'end_line': end_idx,
-                                    'content': chunk_content
-                                })
-                                
-                    except UnicodeDecodeError:
-                        # CP949 실패 시 EUC-KR로 시도
-                        try:
-                            with open(file_path, 'r', encoding='euc-kr', errors='replace') as f:
-                                content = f.read()
-                                
-                            # 같은 청크 분할 로직 반복
-                            lines = content.split('\n')
-                            for i in range(0, len(lines), chunk_size):
-                                end_idx = min(i + chunk_size, len(lines))
-                                chunk_content = '\n'.join(lines[i:end_idx])
-                                
-                                if chunk_content.strip():
-                                    chunks.append({
-                                        'file_path': file_path,
-                                        'start_line': i + 1,
-                                        'end_line': end_idx,
-                                        'content': chunk_content
-                                    })
-                        except Exception as e2:
-                            print(f"[⚠️] {file_path} 파일 읽기 실패: {e2}")
-                    
-                    except Exception as e:
-                        print(f"[⚠️] {file_path} 파일 처리 중 오류: {e}")
-                        
-        print(f"[✅] {len(chunks)}개 코드 청크 생성 완료")
-        return chunks
-        
-    except Exception as e:
-        print(f"[❌] 소스 파일 스캔 중 오류 발생: {e}")
-        return []
+@dataclass(frozen=True)
+class Config:
+    """명령줄 인자와 config.json을 한 번만 해석한 실행 설정"""
+    bug_report_path: str
+    source_dir: str
+    knowledge_file: Optional[str]
+    script_dir: Optional[str]
+    translator_url: str
+    translator_model: str
+    code_analyzers: Tuple[Dict[str, Any], ...] = ()
 
-def main():
-    """메인 실행 함수"""
-    # 명령줄 인자 파싱
-    parser = argparse.ArgumentParser(description='다중 LLM 기반 코드 분석 도구')
-    parser.add_argument('--bug_report', type=str, default="D:/data/GersangDebugAutomation/bug_report.txt",
-                        help='버그 리포트 파일 경로')
-    parser.add_argument('--source_dir', type=str, default="C:/data/Branch_Trunk_bugfix",
-                        help='소스 코드 디렉토리 경로')
-    parser.add_argument('--knowledge', type=str, default="dev_knowledge.txt",
-                        help='개발자 지식 파일 경로 (없으면 기본 분석 진행)')
-    parser.add_argument('--script_dir', type=str, default="C:/data/GCS",
-                        help='게임 스크립트 파일 디렉토리 경로')
-    
-    # 번역기 LLM 설정
-    parser.add_argument('--translator_url', type=str, default="http://192.168.102.166:1234",
-                        help='번역기 LLM API 서버 주소')
-    parser.add_argument('--translator_model', type=str, default="eeve-korean-instruct-10.8b-v1.0",
-                        help='번역기 LLM 모델 이름')
-    
-    # 코드 분석 LLM 설정을 위한 인자들
-    parser.add_argument('--code_llms', type=str, nargs='+', default=[],
-                        help='코드 분석 LLM 정보 (형식: 이름:주소:모델명:전문분야, 예: qwen:http://localhost:1234:Qwen2.5-7B:code)')
-    parser.add_argument('--config', type=str, default="config.json",
-                        help='LLM 설정 파일 경로')
-    
-    args = parser.parse_args()
-    
+def load_config(args: argparse.Namespace) -> Config:
+    """config.json을 읽고 명령줄 인자와 합쳐 실행 설정 생성 (번역기/코드 분석 LLM은 config 값 우선)"""
     # config.json 파일 로드 시도
-    config = {}
+    raw = {}
     if os.path.exists(args.config):
         try:
-            with open(args.config, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            with open(args.config, 'rb') as f:
+                raw = _json_fast.loads(f.read())
             print(f"[✅] 설정 파일 로드 완료: {args.config}")
         except Exception as e:
             print(f"[⚠️] 설정 파일 로드 실패: {e}")
     else:
         print(f"[ℹ️] 설정 파일({args.config})이 없습니다. 명령줄 인자를 사용합니다.")
     
-    # 경로 설정 (config 값이 있으면 사용, 없으면 명령줄 인자 사용)
-    if config and 'defaults' in config:
-        defaults = config['defaults']
-        bug_report_path = args.bug_report or defaults.get('bug_report_path')
-        source_dir = args.source_dir or defaults.get('source_dir')
-        knowledge_file = (args.knowledge if os.path.exists(args.knowledge) else defaults.get('knowledge_file')) if os.path.exists(args.knowledge) else None
-        script_dir = (args.script_dir if os.path.exists(args.script_dir) else defaults.get('script_dir')) if os.path.exists(args.script_dir) else None
-    else:
-        bug_report_path = args.bug_report
-        source_dir = args.source_dir
-        knowledge_file = args.knowledge if os.path.exists(args.knowledge) else None
-        script_dir = args.script_dir if os.path.exists(args.script_dir) else None
-    
-    # 1. 다중 LLM 분석기 초기화
-    print("\n[🤖] 다중 LLM 코드 분석기 초기화 중...")
-    
-    # 번역기 설정 (config 값이 있으면 사용, 없으면 명령줄 인자 사용)
-    translator_url = args.translator_url
-    translator_model = args.translator_model
+    defaults = raw.get('defaults') or {}
+    servers = raw.get('llm_servers') or {}
+    translator = servers.get('translator') or {}
     
-    if config and 'llm_servers' in config and 'translator' in config['llm_servers']:
-        translator_config = config['llm_servers']['translator']
-        translator_url = translator_config.get('url', translator_url)
-        translator_model = translator_config.get('model', translator_model)
-    
-    analyzer = MultiLLMCodeAnalyzer(
-        translator_url=translator_url,
-        translator_model=translator_model,
-        knowledge_file=knowledge_file,
-        script_dir=script_dir
+    return Config(
+        bug_report_path=args.bug_report or defaults.get('bug_report_path'),
+        source_dir=args.source_dir or defaults.get('source_dir'),
+        knowledge_file=args.knowledge if os.path.exists(args.knowledge) else None,
+        script_dir=args.script_dir if os.path.exists(args.script_dir) else None,
+        translator_url=translator.get('url', args.translator_url),
+        translator_model=translator.get('model', args.translator_model),
+        code_analyzers=tuple(servers.get('code_analyzers') or ())
     )
-    
+
+def run_analysis(analyzer: MultiLLMCodeAnalyzer, config: Config, args: argparse.Namespace):
+    """코드 분석 LLM 등록부터 결과/수정 제안 출력까지 분석 파이프라인 실행"""
     # 2. 코드 분석 LLM 등록
     code_llms_registered = False
     
     # config.json에서 LLM 등록
-    if config and 'llm_servers' in config and 'code_analyzers' in config['llm_servers']:
-        code_analyzers = config['llm_servers']['code_analyzers']
-        if code_analyzers:
-            for llm_config in code_analyzers:
-                try:
-                    name = llm_config.get('name')
-                    url = llm_config.get('url')
-                    model = llm_config.get('model')
-                    specialty = llm_config.get('specialty', 'general')
-                    description = llm_config.get('description', '')
-                    
-                    if name and url and model:
-                        print(f"[🔄] 설정 파일에서 코드 분석 LLM 등록 중: {name} ({description})")
-                        analyzer.add_code_llm(name, url, model, specialty)
-                        code_llms_registered = True
-                    else:
-                        print(f"[⚠️] 설정 파일의 LLM 정보가 불완전합니다: {llm_config}")
-                except Exception as e:
-                    print(f"[⚠️] 설정 파일의 LLM 등록 중 오류: {e}")
+    if config.code_analyzers:
+        for llm_config in config.code_analyzers:
+            try:
+                name = llm_config.get('name')
+                url = llm_config.get('url')
+                model = llm_config.get('model')
+                specialty = llm_config.get('specialty', 'general')
+                description = llm_config.get('description', '')
+                supports_korean = llm_config.get('supports_korean')
+                
+                if name and url and model:
+                    print(f"[🔄] 설정 파일에서 코드 분석 LLM 등록 중: {name} ({description})")
+                    analyzer.add_code_llm(name, url, model, specialty, supports_korean=supports_korean)
+                    code_llms_registered = True
+                else:
+                    print(f"[⚠️] 설정 파일의 LLM 정보가 불완전합니다: {llm_config}")
+            except Exception as e:
+                print(f"[⚠️] 설정 파일의 LLM 등록 중 오류: {e}")
     
     # 명령줄 인자에서 LLM 등록 (config.json에서 등록한 것이 없을 때만)
     if not code_llms_registered and args.code_llms:
@@ -200,19 +116,25 @@ def main():
         analyzer.add_code_llm("default-coder", default_url, default_model, "code")
     
     # 3. 버그 리포트 로드
-    print(f"\n[📄] 버그 리포트 로드 중: {bug_report_path}")
-    bug_report = load_bug_report(bug_report_path)
+    print(f"\n[📄] 버그 리포트 로드 중: {config.bug_report_path}")
+    bug_report = load_bug_report(config.bug_report_path)
     if not bug_report:
         print("[❌] 버그 리포트가 비어있습니다. 종료합니다.")
         return
     
-    # 4. 버그 리포트 분석
-    print("\n[🔍] 버그 리포트 분석 중...")
-    bug_analysis = analyzer.analyze_bug_report(bug_report)
+    # 소스 코드 로드는 버그 리포트 분석(LLM 응답 대기)과 겹치도록 백그라운드 스레드에서 시작
+    print("\n[📂] 소스 코드 로드 시작 (버그 리포트 분석과 동시 진행)...")
+    with ThreadPoolExecutor(max_workers=1) as loader:
+        # 청크가 생성되는 대로 전처리하고 목록은 한 번만 만듦
+        source_future = loader.submit(lambda: analyzer.prepare_chunks(load_source_files(config.source_dir)))
+        
+        # 4. 버그 리포트 분석
+        print("\n[🔍] 버그 리포트 분석 중...")
+        bug_analysis = analyzer.analyze_bug_report(bug_report)
+        
+        # 5. 소스 코드 로드 완료 대기
+        code_chunks = source_future.result()
     
-    # 5. 소스 코드 로드
-    print("\n[📂] 소스 코드 로드 중...")
-    code_chunks = load_source_files(source_dir)
     if not code_chunks:
         print("[❌] 소스 코드 로드에 실패했습니다. 종료합니다.")
         return
@@ -228,48 +150,53 @@ def main():
         return
     
     # 7. 결과 출력
-    print("\n[📊] === 분석 결과 ===")
-    print(f"버그 유형: {bug_analysis.get('bug_type', '알 수 없음')}")
-    print(f"심각도: {bug_analysis.get('severity', '알 수 없음')}")
-    print(f"버그 요약: {bug_analysis.get('summary', '알 수 없음')}")
-    print(f"관련 키워드: {', '.join(bug_analysis.get('keywords', ['없음']))}")
+    # 청크마다 여러 줄을 출력하므로 버퍼에 모아 한 번에 기록 (느린 콘솔에서 쓰기 호출 횟수 감소)
+    out = io.StringIO()
+    print("\n[📊] === 분석 결과 ===", file=out)
+    print(f"버그 유형: {bug_analysis.get('bug_type', '알 수 없음')}", file=out)
+    print(f"심각도: {bug_analysis.get('severity', '알 수 없음')}", file=out)
+    print(f"버그 요약: {bug_analysis.get('summary', '알 수 없음')}", file=out)
+    print(f"관련 키워드: {', '.join(bug_analysis.get('keywords', ['없음']))}", file=out)
     
-    print("\n[🔍] 의심 코드 영역:")
+    print("\n[🔍] 의심 코드 영역:", file=out)
     for i, chunk in enumerate(matching_chunks, 1):
         # file_path 키가 있으면 사용, 없으면 file 키 사용
         file_path = chunk.get('file_path', chunk.get('file', '알 수 없는 파일'))
         # 상대 경로만 있는 경우 전체 경로 생성
-        if '/' not in file_path and '\\' not in file_path and os.path.exists(os.path.join(source_dir, file_path)):
-            file_path = os.path.join(source_dir, file_path)
+        if '/' not in file_path and '\\' not in file_path and os.path.exists(os.path.join(config.source_dir, file_path)):
+            file_path = os.path.join(config.source_dir, file_path)
             
         file_name = os.path.basename(file_path)
         
-        print(f"\n{i}. 파일: {file_name}")
-        print(f"   전체 경로: {file_path}")
-        print(f"   코드 위치: {chunk.get('start_line', 0)}~{chunk.get('end_line', 0)} 라인")
+        print(f"\n{i}. 파일: {file_name}", file=out)
+        print(f"   전체 경로: {file_path}", file=out)
+        print(f"   코드 위치: {chunk.get('start_line', 0)}~{chunk.get('end_line', 0)} 라인", file=out)
         
         # 의심 라인 정보 출력
         suspected_lines = chunk.get('suspected_lines', [])
         if suspected_lines:
-            print(f"   의심 라인: {', '.join(map(str, suspected_lines))}")
+            print(f"   의심 라인: {', '.join(map(str, suspected_lines))}", file=out)
             
             # 참조된 코드 출력
             referenced_code = chunk.get('referenced_code', [])
             if referenced_code:
-                print("\n   참조된 코드:")
+                print("\n   참조된 코드:", file=out)
                 for ref in referenced_code:
                     line_num = ref.get('line', '?')
                     code = ref.get('code', '코드 정보 없음')
                     reason = ref.get('reason', '')
-                    print(f"   {line_num}번 줄: {code}")
+                    print(f"   {line_num}번 줄: {code}", file=out)
                     if reason:
-                        print(f"      ↳ 이유: {reason}")
+                        print(f"      ↳ 이유: {reason}", file=out)
         
         # 분석 신뢰도 표시
         confidence = chunk.get('confidence', '알 수 없음')
-        print(f"   분석 신뢰도: {confidence}")
-        print(f"   관련성 점수: {chunk.get('relevance_score', 0)}/10")
-        print(f"   분석: {chunk.get('reasoning', '정보 없음')}")
+        print(f"   분석 신뢰도: {confidence}", file=out)
+        print(f"   관련성 점수: {chunk.get('relevance_score', 0)}/10", file=out)
+        print(f"   분석: {chunk.get('reasoning', '정보 없음')}", file=out)
+    
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
     
     # 8. 최상위 매칭에 대한 수정 제안 생성
     if matching_chunks:
@@ -286,5 +213,47 @@ def main():
     
     print("\n[✅] 분석 완료")
 
+def main():
+    """메인 실행 함수"""
+    # 명령줄 인자 파싱
+    parser = argparse.ArgumentParser(description='다중 LLM 기반 코드 분석 도구')
+    parser.add_argument('--bug_report', type=str, default="D:/data/GersangDebugAutomation/bug_report.txt",
+                        help='버그 리포트 파일 경로')
+    parser.add_argument('--source_dir', type=str, default="C:/data/Branch_Trunk_bugfix",
+                        help='소스 코드 디렉토리 경로')
+    parser.add_argument('--knowledge', type=str, default="dev_knowledge.txt",
+                        help='개발자 지식 파일 경로 (없으면 기본 분석 진행)')
+    parser.add_argument('--script_dir', type=str, default="C:/data/GCS",
+                        help='게임 스크립트 파일 디렉토리 경로')
+    
+    # 번역기 LLM 설정
+    parser.add_argument('--translator_url', type=str, default="http://192.168.102.166:1234",
+                        help='번역기 LLM API 서버 주소')
+    parser.add_argument('--translator_model', type=str, default="eeve-korean-instruct-10.8b-v1.0",
+                        help='번역기 LLM 모델 이름')
+    
+    # 코드 분석 LLM 설정을 위한 인자들
+    parser.add_argument('--code_llms', type=str, nargs='+', default=[],
+                        help='코드 분석 LLM 정보 (형식: 이름:주소:모델명:전문분야, 예: qwen:http://localhost:1234:Qwen2.5-7B:code)')
+    parser.add_argument('--config', type=str, default="config.json",
+                        help='LLM 설정 파일 경로')
+    
+    args = parser.parse_args()
+    
+    # 설정 해석 (config.json은 한 번만 읽고, 경로 존재 여부도 한 번만 확인)
+    config = load_config(args)
+    
+    # 1. 다중 LLM 분석기 초기화
+    print("\n[🤖] 다중 LLM 코드 분석기 초기화 중...")
+    
+    # 분석기가 가진 세션/연결 유지 스레드/스레드 풀은 분석이 끝나거나 중간에 종료되어도 정리
+    with MultiLLMCodeAnalyzer(
+        translator_url=config.translator_url,
+        translator_model=config.translator_model,
+        knowledge_file=config.knowledge_file,
+        script_dir=config.script_dir
+    ) as analyzer:
+        run_analysis(analyzer, config, args)
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
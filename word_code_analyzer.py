@@ -1,14 +1,51 @@
 import os
 import re
 import json
+import codecs
+import hashlib
+import mmap
+from itertools import islice
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from collections import Counter
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import scipy.sparse as sp
+import joblib
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.pipeline import make_pipeline
 import argparse
 
+try:
+    import orjson  # 빠른 JSON 인코딩 (선택 사항)
+except ImportError:
+    orjson = None
+
+try:
+    from charset_normalizer import from_bytes as _detect_charset  # 인코딩 감지 (선택 사항)
+except ImportError:
+    _detect_charset = None
+
 #키워드 기반 프로젝트 버그 탐색기
 #기계적으로 키워드 추출 후 소스코드 분석 후 매칭
 
+# TF-IDF 해시 특성 공간 크기 (어휘 사전 없이 토큰/2-gram을 이 차원으로 해시)
+HASH_N_FEATURES = 2 ** 18
+
+# 문서 빈도 기준 특성 제거: 거의 모든 청크에 나오는 토큰(int, void 등)만 제거
+# (청크 하나에만 나오는 식별자는 버그 리포트가 가리키는 함수명일 수 있으므로 유지)
+TFIDF_MIN_DF = 1
+TFIDF_MAX_DF = 0.95
+
+# 이보다 큰 소스 파일은 mmap으로 열어 필요한 줄 구간만 디코딩 (작은 파일은 텍스트 모드로 읽음)
+MMAP_MIN_BYTES = 1024 * 1024
+# mmap 파일의 줄바꿈 위치를 찾을 때 한 번에 훑는 바이트 수 (필요한 줄까지만 앞에서부터 찾음)
+MMAP_SCAN_BYTES = 1024 * 1024
+
+# 코드 청크 인덱스(청크 위치 + 학습된 벡터라이저 + 임베딩) 캐시 디렉토리 (None이면 캐시 사용 안 함)
+INDEX_CACHE_DIR = ".tfidf_cache"
+
 # ===== [모듈 1: 버그리포트 수집] =====
 def load_bug_report(file_path):
     """버그 리포트 파일을 로드합니다."""
@@ -20,13 +57,21 @@ def load_bug_report(file_path):
         return None
 
 # ===== [모듈 2: 전처리 및 특징 추출] =====
+# 키워드 추출 정규식 (호출마다 다시 찾지 않도록 모듈 로드 시 한 번만 컴파일)
+_KOREAN_WORD_RE = re.compile(r'[가-힣]{2,}')
+_ERROR_PATTERN_RE = re.compile(r'[A-Za-z0-9_]+\([^)]*\)|[A-Za-z0-9_]+Error|Exception|Bug|[A-Za-z0-9_]+\.cpp|[A-Za-z0-9_]+\.h')
+_WORD_TOKEN_RE = re.compile(r'\b[가-힣a-zA-Z0-9_]+\b')
+
+# 파일 처리 스레드들의 경고 출력이 섞이지 않도록 하는 잠금
+_print_lock = threading.Lock()
+
 def preprocess_bug_report(report_text):
     """버그 리포트 텍스트를 전처리하고 키워드를 추출합니다."""
     # 한글 단어 추출 (2글자 이상)
-    korean_words = re.findall(r'[가-힣]{2,}', report_text)
+    korean_words = _KOREAN_WORD_RE.findall(report_text)
     
     # 에러 메시지나 함수명 추출 시도 (영문+숫자+특수문자)
-    error_patterns = re.findall(r'[A-Za-z0-9_]+\([^)]*\)|[A-Za-z0-9_]+Error|Exception|Bug|[A-Za-z0-9_]+\.cpp|[A-Za-z0-9_]+\.h', report_text)
+    error_patterns = _ERROR_PATTERN_RE.findall(report_text)
     
     # 중복 제거 및 병합
     all_keywords = list(set(korean_words + error_patterns))
@@ -38,29 +83,58 @@ def preprocess_bug_report(report_text):
 
 def extract_keywords_with_nlp(report_text):
     """NLP 기반 핵심 키워드 추출 함수 (간단 구현)"""
-    # 간단한 구현: 단어 빈도수 기반
-    words = re.findall(r'\b[가-힣a-zA-Z0-9_]+\b', report_text)
-    word_freq = {}
-    
-    for word in words:
-        if len(word) > 1:  # 1글자 단어 제외
-            word_freq[word] = word_freq.get(word, 0) + 1
+    # 간단한 구현: 단어 빈도수 기반 (1글자 단어 제외)
+    word_freq = Counter(word for word in _WORD_TOKEN_RE.findall(report_text) if len(word) > 1)
     
     # 빈도수 기준 상위 10개 키워드 추출
-    keywords = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:10]
-    return [k[0] for k in keywords]
+    return [word for word, _ in word_freq.most_common(10)]
 
 # ===== [모듈 3: 코드 분석 및 매칭] =====
-def collect_source_files(src_dir, extensions=('.cpp', '.h')):
-    """지정된 디렉토리에서 소스 코드 파일을 수집합니다."""
+class DocumentFrequencyFilter(BaseEstimator, TransformerMixin):
+    """
+    해시 특성 단어 빈도 행렬에서 문서 빈도가 min_df 미만이거나 max_df 비율을 넘는 열을 0으로 만듭니다.
+    (HashingVectorizer에는 어휘가 없어 TfidfVectorizer의 min_df/max_df를 쓸 수 없으므로 학습 시 열 마스크로 대신함)
+    """
+    
+    def __init__(self, min_df=TFIDF_MIN_DF, max_df=TFIDF_MAX_DF):
+        self.min_df = min_df
+        self.max_df = max_df
+    
+    def fit(self, X, y=None):
+        X = sp.csr_matrix(X)
+        # 행마다 같은 열은 한 번만 저장되므로 열 인덱스 개수가 곧 문서 빈도
+        df = np.bincount(X.indices, minlength=X.shape[1])
+        # 청크 수가 적을 때 max_df * 청크 수가 1 미만이 되어 모든 단어가 지워지지 않도록 최소 1개 문서는 허용
+        keep = (df >= self.min_df) & (df <= max(self.max_df * X.shape[0], 1))
+        if not keep[df > 0].any():
+            print("[⚠️ 경고] 문서 빈도 필터가 모든 단어를 제거하므로 필터를 적용하지 않습니다.")
+            keep = np.ones_like(keep)
+        self.column_mask_ = sp.diags(keep.astype(X.dtype))
+        return self
+    
+    def transform(self, X):
+        X = sp.csr_matrix(X) @ self.column_mask_
+        X.eliminate_zeros()
+        return X
+
+# 빌드 산출물/외부 라이브러리/VCS 디렉토리는 내려가지 않음 (대소문자 무시)
+EXCLUDED_DIRS = frozenset({'.git', '.svn', '.vs', 'build', 'third_party', 'cmakefiles', 'x64', 'debug', 'release'})
+# 코드 생성기가 만든 파일 접두사 (Qt moc/uic/rcc)
+GENERATED_FILE_PREFIXES = ('moc_', 'ui_', 'qrc_')
+
+def collect_source_files(src_dir, extensions=('.cpp', '.h'), excluded_dirs=EXCLUDED_DIRS,
+                         generated_prefixes=GENERATED_FILE_PREFIXES):
+    """지정된 디렉토리에서 소스 코드 파일을 수집합니다. (빌드/외부/생성 코드는 제외)"""
     source_files = []
     
     print(f"[🔍] {src_dir} 경로에서 소스 파일 수집 중...")
     
     try:
-        for root, _, files in os.walk(src_dir):
+        for root, dirs, files in os.walk(src_dir):
+            # 제외 디렉토리는 목록에서 바로 빼서 하위로 내려가지 않도록 함
+            dirs[:] = [d for d in dirs if d.lower() not in excluded_dirs]
             for file in files:
-                if file.endswith(extensions):
+                if file.endswith(extensions) and not file.startswith(generated_prefixes):
                     full_path = os.path.join(root, file)
                     source_files.append(full_path)
         
@@ -70,172 +144,557 @@ def collect_source_files(src_dir, extensions=('.cpp', '.h')):
         print(f"[❌ 오류] 소스 파일 수집 중 오류 발생: {e}")
         return []
 
-def parse_code_into_chunks(file_paths, max_chunk_size=100):
-    """소스 코드 파일을 청크(Chunk)로 분할합니다."""
-    chunks = []
+def _detect_encoding(file_path):
+    """
+    파일 앞부분 4KB로 인코딩을 한 번만 감지합니다.
+    BOM이 있으면 BOM 기준, ASCII만 있거나 CP949로 읽히면 CP949, UTF-8로 읽히면 UTF-8,
+    둘 다 아니면 charset_normalizer 결과를 사용하고 감지하지 못하면 CP949로 봅니다.
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(4096)
     
-    print(f"[🔄] 소스 코드를 청크로 분할 중...")
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
     
-    for file_path in file_paths:
+    # 앞부분을 자른 위치에서 멀티바이트 문자가 잘릴 수 있으므로 증분 디코더로 확인
+    for encoding in ('ascii', 'utf-8', 'cp949'):
         try:
-            # UTF-8에서 CP949(ANSI)로 인코딩 변경
-            with open(file_path, 'r', encoding='cp949', errors='replace') as f:
-                file_content = f.read()
-            
-            # 파일을 최대 chunk_size 줄 단위로 분할
-            lines = file_content.split('\n')
-            total_lines = len(lines)
-            
-            # 각 청크는 최대 max_chunk_size 줄을 포함
-            for i in range(0, total_lines, max_chunk_size):
-                end_idx = min(i + max_chunk_size, total_lines)
-                chunk_content = '\n'.join(lines[i:end_idx])
-                
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return 'cp949' if encoding == 'ascii' else encoding
+        except UnicodeDecodeError:
+            continue
+    
+    if _detect_charset is not None:
+        best = _detect_charset(head).best()
+        if best is not None:
+            return best.encoding
+    
+    return 'cp949'
+
+def _is_ascii_compatible(encoding):
+    """줄바꿈이 항상 0x0A 한 바이트로 저장되는 인코딩인지 확인합니다. (UTF-16/32는 아님)"""
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return False
+    return not name.startswith(('utf-16', 'utf-32'))
+
+class _SourceReader:
+    """
+    소스 파일의 줄 구간을 읽는 도구입니다.
+    
+    MMAP_MIN_BYTES 이상인 큰 파일은 mmap으로 열고 줄바꿈 바이트 위치를 필요한 줄까지만 계산해
+    필요한 구간만 디코딩합니다. (파일 전체 bytes/str 사본을 만들지 않고, 앞부분만 읽으면 뒤쪽은 훑지 않음)
+    작은 파일은 감지한 인코딩의 텍스트 모드로 열어 앞에서부터 필요한 줄만 읽습니다.
+    """
+    
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.encoding = _detect_encoding(file_path)
+        self._mm = None
+        self._newlines = None
+        self._f = None
+        
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size and size >= MMAP_MIN_BYTES and _is_ascii_compatible(self.encoding):
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if self._mm is not None:
+            self._newlines = np.empty(0, dtype=np.intp)
+            self._size = size
+            self._scanned = 0
+        else:
+            self._f = open(file_path, 'r', encoding=self.encoding, errors='replace')
+            self._next_line = 1
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        if self._mm is not None:
+            self._newlines = None
+            self._mm.close()
+            self._mm = None
+        elif self._f is not None:
+            self._f.close()
+            self._f = None
+    
+    def _index_lines(self, count=None):
+        """mmap 파일에서 줄바꿈 위치를 count개(None이면 파일 끝)까지 찾아 둡니다."""
+        parts = [self._newlines]
+        found = len(self._newlines)
+        while (count is None or found < count) and self._scanned < self._size:
+            end = min(self._scanned + MMAP_SCAN_BYTES, self._size)
+            block = np.frombuffer(self._mm, dtype=np.uint8, count=end - self._scanned, offset=self._scanned)
+            positions = np.flatnonzero(block == 0x0A) + self._scanned
+            del block  # mmap을 닫을 수 있도록 버퍼 참조를 바로 해제
+            parts.append(positions)
+            found += len(positions)
+            self._scanned = end
+        if len(parts) > 1:
+            self._newlines = np.concatenate(parts)
+    
+    def read(self, start_line, end_line):
+        """start_line ~ end_line 줄(1부터, 끝 줄 포함)의 내용을 반환합니다."""
+        if self._mm is not None:
+            self._index_lines(end_line)
+            newlines = self._newlines
+            start = int(newlines[start_line - 2]) + 1 if start_line > 1 else 0
+            end = int(newlines[end_line - 1]) + 1 if end_line - 1 < len(newlines) else self._size
+            return self._mm[start:end].decode(self.encoding, 'replace').replace('\r\n', '\n')
+        
+        # 이미 지나간 줄이면 처음부터 다시 읽음
+        if start_line < self._next_line:
+            self._f.seek(0)
+            self._next_line = 1
+        # 청크 시작 줄 앞까지는 읽고 버림
+        skip = start_line - self._next_line
+        if skip > 0:
+            next(islice(self._f, skip, skip), None)
+        text = ''.join(islice(self._f, end_line - start_line + 1))
+        self._next_line = end_line + 1
+        return text
+    
+    def iter_blocks(self, max_chunk_size):
+        """최대 max_chunk_size 줄씩 (시작 줄, 끝 줄, 내용)을 생성합니다."""
+        if self._mm is not None:
+            self._index_lines()
+            # 텍스트 모드로 줄 단위로 읽을 때처럼 마지막 줄바꿈 뒤의 빈 줄은 세지 않음
+            line_count = len(self._newlines) + (0 if self._mm[self._size - 1] == 0x0A else 1)
+            for start_line in range(1, line_count + 1, max_chunk_size):
+                end_line = min(start_line + max_chunk_size - 1, line_count)
+                yield start_line, end_line, self.read(start_line, end_line)
+            return
+        
+        # 파일 전체를 문자열로 읽거나 split/join하지 않고 필요한 줄만 순서대로 읽음
+        start_line = 1
+        for block in iter(lambda: list(islice(self._f, max_chunk_size)), []):
+            end_line = start_line + len(block) - 1
+            yield start_line, end_line, ''.join(block)
+            start_line = end_line + 1
+        self._next_line = start_line
+
+def _print_locked(message):
+    """여러 스레드에서 출력해도 줄이 섞이지 않도록 잠금을 잡고 출력합니다."""
+    with _print_lock:
+        print(message)
+
+def _process_file(file_path, max_chunk_size=100):
+    """소스 파일 하나를 읽어 최대 max_chunk_size 줄 단위 청크 위치 목록으로 분할합니다."""
+    chunks = []
+    try:
+        with _SourceReader(file_path) as reader:
+            for start_line, end_line, text in reader.iter_blocks(max_chunk_size):
                 # 의미 있는 내용이 있을 경우만 청크로 추가
-                if len(chunk_content.strip()) > 0:
+                if text and not text.isspace():
                     chunks.append({
                         'file_path': file_path,
-                        'start_line': i + 1,
-                        'end_line': end_idx,
-                        'content': chunk_content
+                        'start_line': start_line,
+                        'end_line': end_line
                     })
-        except UnicodeDecodeError as e:
-            print(f"[⚠️ 경고] {file_path} 파일 인코딩 문제: {e}")
-            # CP949 실패 시 다른 인코딩 시도
-            try:
-                with open(file_path, 'r', encoding='euc-kr', errors='replace') as f:
-                    file_content = f.read()
-                # 나머지 처리 코드는 동일...
-                lines = file_content.split('\n')
-                total_lines = len(lines)
-                for i in range(0, total_lines, max_chunk_size):
-                    end_idx = min(i + max_chunk_size, total_lines)
-                    chunk_content = '\n'.join(lines[i:end_idx])
-                    if len(chunk_content.strip()) > 0:
-                        chunks.append({
-                            'file_path': file_path,
-                            'start_line': i + 1,
-                            'end_line': end_idx,
-                            'content': chunk_content
-                        })
-            except Exception as e2:
-                print(f"[❌ 오류] {file_path} 파일 읽기 실패: {e2}")
-        except Exception as e:
-            print(f"[⚠️ 경고] {file_path} 파일 파싱 중 오류: {e}")
+    except Exception as e:
+        _print_locked(f"[⚠️ 경고] {file_path} 파일 파싱 중 오류: {e}")
+    return chunks
+
+def parse_code_into_chunks(file_paths, max_chunk_size=100):
+    """
+    소스 코드 파일을 청크(Chunk)로 분할합니다.
+    
+    청크 내용은 보관하지 않고 위치 정보(file_path, start_line, end_line)만 반환합니다.
+    내용은 iter_chunk_texts로 필요할 때 파일에서 다시 읽습니다.
+    """
+    chunks = []
+    
+    print(f"[🔄] 소스 코드를 청크로 분할 중...")
+    
+    # 파일 읽기는 I/O 대기가 대부분이라 스레드로 겹쳐 처리 (결과는 파일 순서대로 합침)
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for file_chunks in executor.map(partial(_process_file, max_chunk_size=max_chunk_size), file_paths):
+            chunks.extend(file_chunks)
     
     print(f"[✅] {len(chunks)}개 코드 청크 생성 완료")
     return chunks
 
-def create_embeddings(text_list):
-    """텍스트 목록에 대한 TF-IDF 임베딩을 생성합니다."""
-    print(f"[🔢] 임베딩할 텍스트 수: {len(text_list)}")
+def iter_chunk_texts(code_chunks):
+    """
+    청크 위치 정보 순서대로 각 청크의 내용을 파일에서 읽어 하나씩 생성합니다.
     
-    # 전체 텍스트 크기 계산 (디버깅용)
-    total_text_size = sum(len(t) for t in text_list)
-    print(f"[📊] 전체 텍스트 크기: {total_text_size:,} 문자")
+    같은 파일의 청크가 이어지면 파일을 한 번만 열고 필요한 줄 구간만 읽습니다.
+    파일을 읽지 못하면 빈 문자열을 넘겨 청크 순서를 유지합니다.
+    """
+    current_path = None
+    reader = None
     
-    # 임베딩 설정 로그
-    print(f"[⚙️] 임베딩 설정: n-gram 범위=(1,2), 최대 특성 수=5000, 한글+영문 토큰화")
+    try:
+        for chunk in code_chunks:
+            if chunk['file_path'] != current_path:
+                if reader is not None:
+                    reader.close()
+                current_path = chunk['file_path']
+                try:
+                    reader = _SourceReader(current_path)
+                except Exception as e:
+                    print(f"[⚠️ 경고] {current_path} 파일 다시 읽기 실패: {e}")
+                    reader = None
+            
+            if reader is None:
+                yield ''
+                continue
+            
+            try:
+                text = reader.read(chunk['start_line'], chunk['end_line'])
+            except Exception as e:
+                print(f"[⚠️ 경고] {current_path} 파일 다시 읽기 실패: {e}")
+                reader.close()
+                reader = None
+                text = ''
+            
+            yield text
+    finally:
+        if reader is not None:
+            reader.close()
+
+def _load_snippet(chunk, n_chars=200, readers=None):
+    """
+    청크 앞부분을 미리보기 길이(n_chars)만큼만 파일에서 읽어 반환합니다. (청크 전체를 읽지 않음)
     
-    vectorizer = TfidfVectorizer(
+    readers(파일 경로 → _SourceReader dict)를 넘기면 같은 파일의 리더를 재사용하며, 닫는 것은 호출자 몫입니다.
+    """
+    parts = []
+    size = 0
+    file_path = chunk['file_path']
+    try:
+        reader = readers.get(file_path) if readers is not None else None
+        if reader is None:
+            reader = _SourceReader(file_path)
+            if readers is not None:
+                readers[file_path] = reader
+        try:
+            # 미리보기 길이를 채울 때까지만 한 줄씩 읽음
+            for line_no in range(chunk['start_line'], chunk['end_line'] + 1):
+                line = reader.read(line_no, line_no)
+                if not line:
+                    break
+                parts.append(line)
+                size += len(line)
+                if size >= n_chars:
+                    break
+        finally:
+            if readers is None:
+                reader.close()
+    except Exception as e:
+        print(f"[⚠️ 경고] {chunk['file_path']} 미리보기 읽기 실패: {e}")
+    return ''.join(parts)[:n_chars]
+
+def _make_hashing_vectorizer():
+    """어휘 사전을 만들지 않는 해시 기반 단어 빈도 벡터라이저를 만듭니다 (상태가 없어 학습 불필요)."""
+    return HashingVectorizer(
         analyzer='word',
         token_pattern=r'\b[가-힣\w]+\b',  # 한글 및 영문 단어 포함
         ngram_range=(1, 2),  # 단일 단어 및 2단어 구문 포함
-        max_features=5000
+        n_features=HASH_N_FEATURES,
+        alternate_sign=False,
+        norm=None,  # 정규화는 IDF 가중치를 적용한 뒤 TfidfTransformer에서 수행
+        dtype=np.float32  # 코사인 유사도에는 float32로 충분 (행렬 메모리/대역폭 절반)
     )
+
+def _fit_tfidf(hashing, counts):
+    """
+    해시 단어 빈도 행렬(counts)로 문서 빈도 필터와 IDF만 학습합니다.
+    
+    토큰화는 이미 끝났으므로 텍스트를 다시 읽지 않으며,
+    학습된 단계들을 파이프라인으로 묶어 버그 리포트 변환에 그대로 쓸 수 있게 반환합니다.
+    
+    Returns:
+        (vectorizer, embeddings)
+    """
+    df_filter = DocumentFrequencyFilter(min_df=TFIDF_MIN_DF, max_df=TFIDF_MAX_DF)
+    tfidf = TfidfTransformer(norm='l2', sublinear_tf=True)  # 긴 청크의 반복 토큰 영향은 log로 완화
+    # 검색 시 버그 리포트 단어(열)별로 해당 청크(행)만 모을 수 있도록 열 단위 CSC(역색인) 형식으로 보관
+    embeddings = tfidf.fit_transform(df_filter.fit_transform(counts)).tocsc()
+    return make_pipeline(hashing, df_filter, tfidf), embeddings
+
+def create_embeddings(texts, verbose=False, return_counts=False):
+    """
+    텍스트 목록에 대한 TF-IDF 임베딩을 생성합니다.
+    
+    texts는 리스트뿐 아니라 제너레이터도 가능하며, 한 번만 순회합니다.
+    verbose가 True일 때만 텍스트 수/크기, 차원, 밀도 등 진단 정보를 집계해 출력합니다.
+    return_counts가 True이면 증분 인덱싱용으로 IDF 적용 전 해시 단어 빈도 행렬도 함께 반환합니다.
+    """
+    # 전체 텍스트 수/크기 계산 (디버깅용, 스트리밍 중 함께 집계)
+    text_stats = {'count': 0, 'size': 0}
+    
+    def counted(iterable):
+        for text in iterable:
+            text_stats['count'] += 1
+            text_stats['size'] += len(text)
+            yield text
+    
+    # 임베딩 설정 로그
+    if verbose:
+        print(f"[⚙️] 임베딩 설정: n-gram 범위=(1,2), 해시 특성 수={HASH_N_FEATURES:,}, "
+              f"min_df={TFIDF_MIN_DF}, max_df={TFIDF_MAX_DF}, sublinear_tf, 한글+영문 토큰화")
     
     # 코드 내용에 대한 임베딩 생성
     try:
         print(f"[🧠] TF-IDF 임베딩 변환 중...")
-        embeddings = vectorizer.fit_transform(text_list)
-        
-        # 임베딩 통계 정보 출력
-        vocab_size = len(vectorizer.vocabulary_)
-        feature_names = vectorizer.get_feature_names_out()
-        
+        # 해시 단어 빈도 → 문서 빈도 필터 → TF-IDF 가중치 (어휘 dict/토큰 카운트 메모리 없음)
+        hashing = _make_hashing_vectorizer()
+        counts = hashing.transform(counted(texts) if verbose else texts)
+        vectorizer, embeddings = _fit_tfidf(hashing, counts)
         print(f"[✅] 임베딩 생성 완료")
-        print(f"[📚] 어휘 크기: {vocab_size:,} 토큰")
-        print(f"[🔍] 임베딩 차원: {embeddings.shape[1]:,} 차원")
-        print(f"[💻] 임베딩 밀도: {embeddings.nnz / (embeddings.shape[0]*embeddings.shape[1])*100:.2f}% (희소 행렬)")
         
-        # 상위 토큰 샘플 출력
-        if len(feature_names) > 0:
-            top_feature_sample = list(feature_names[:10])
-            print(f"[🔤] 어휘 샘플: {', '.join(top_feature_sample)}{'...' if len(feature_names) > 10 else ''}")
+        # 임베딩 통계 정보 출력 (해시 특성이라 어휘 크기/토큰 샘플은 없음)
+        if verbose:
+            # 행 수 * 차원은 큰 코드베이스에서 매우 커지므로 float으로 계산
+            density = embeddings.nnz / (float(embeddings.shape[0]) * embeddings.shape[1])
+            print(f"[🔢] 임베딩한 텍스트 수: {text_stats['count']}")
+            print(f"[📊] 전체 텍스트 크기: {text_stats['size']:,} 문자")
+            print(f"[🔍] 임베딩 차원: {embeddings.shape[1]:,} 차원")
+            print(f"[💻] 임베딩 밀도: {density*100:.2f}% (희소 행렬)")
         
+        if return_counts:
+            return vectorizer, embeddings, counts
         return vectorizer, embeddings
     except Exception as e:
         print(f"[❌ 오류] 임베딩 생성 중 오류 발생: {e}")
+        if return_counts:
+            return None, None, None
         return None, None
 
-def find_matching_chunks(bug_report_text, code_chunks, top_n=10):
-    """버그 리포트와 가장 유사한 코드 청크를 찾습니다."""
+def _index_params(chunk_size):
+    """청크/임베딩 설정 값 (하나라도 바뀌면 캐시된 인덱스를 재사용할 수 없음)"""
+    return {
+        'chunk_size': chunk_size,
+        'n_features': HASH_N_FEATURES,
+        'dtype': 'float32',
+        'min_df': TFIDF_MIN_DF,
+        'max_df': TFIDF_MAX_DF,
+        'sublinear_tf': True
+    }
+
+def _file_stat(path):
+    """증분 인덱싱에서 파일 변경 여부를 판단할 (수정 시각, 크기), 실패하면 (0, -1)"""
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return 0, -1
+
+def load_or_build_index(source_dir_path, source_files, chunk_size=100, cache_dir=INDEX_CACHE_DIR, verbose=False):
+    """
+    코드 청크 위치 정보와 TF-IDF 임베딩(인덱스)을 캐시에서 불러오거나 새로 만듭니다.
+    
+    캐시에는 IDF 적용 전 해시 단어 빈도 행렬을 파일별 행 범위와 함께 저장합니다.
+    바뀐 파일(새 파일, 수정 시각/크기 변경)만 다시 청크로 나누고 토큰화하며,
+    나머지 파일의 행은 캐시에서 그대로 가져옵니다. 문서 빈도/IDF는 합쳐진 빈도 행렬에서
+    다시 계산하므로 전체를 새로 만든 결과와 같습니다.
+    
+    Returns:
+        (code_chunks, vectorizer, chunk_embeddings), 임베딩 생성에 실패하면 vectorizer와 chunk_embeddings는 None
+    """
+    params = _index_params(chunk_size)
+    cache_file = None
+    cached = None
+    if cache_dir:
+        # 소스 디렉토리마다 캐시 파일 하나만 유지 (소스가 바뀌면 덮어씀)
+        dir_key = hashlib.sha1(os.path.abspath(source_dir_path).encode('utf-8')).hexdigest()[:16]
+        cache_file = os.path.join(cache_dir, f"{dir_key}.joblib")
+        try:
+            cached = joblib.load(cache_file)
+            if cached.get('params') != params or 'counts' not in cached:
+                cached = None
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[⚠️ 경고] 인덱스 캐시를 읽지 못했습니다. 새로 만듭니다: {e}")
+            cached = None
+    
+    file_stats = [(path,) + _file_stat(path) for path in source_files]
+    
+    if cached is None:
+        code_chunks = parse_code_into_chunks(source_files, chunk_size)
+        if not code_chunks:
+            return code_chunks, None, None
+        
+        print("\n[🧠] 임베딩 분석 시작 =========")
+        vectorizer, chunk_embeddings, counts = create_embeddings(
+            iter_chunk_texts(code_chunks), verbose=verbose, return_counts=True)
+        changed = True
+    else:
+        # 경로 → (수정 시각, 크기, 시작 행, 청크 수)
+        cached_files = {}
+        row = 0
+        for path, mtime, size, n_chunks in cached['files']:
+            cached_files[path] = (mtime, size, row, n_chunks)
+            row += n_chunks
+        
+        changed_files = [path for path, mtime, size in file_stats
+                         if size < 0 or cached_files.get(path, (None, None))[:2] != (mtime, size)]
+        
+        if changed_files:
+            print(f"[ℹ️] 변경된 파일 {len(changed_files)}개만 다시 분석합니다 (전체 {len(source_files)}개)")
+            new_chunks = parse_code_into_chunks(changed_files, chunk_size)
+        else:
+            new_chunks = []
+        
+        # 새 청크를 파일별로 묶어 두고, source_files 순서대로 캐시/새 행을 이어 붙임
+        new_by_file = {}
+        for i, chunk in enumerate(new_chunks):
+            new_by_file.setdefault(chunk['file_path'], []).append(i)
+        changed_set = set(changed_files)
+        n_cached_rows = cached['counts'].shape[0]
+        cached_chunks = cached['code_chunks']
+        
+        code_chunks = []
+        row_index = []
+        for path in source_files:
+            if path in changed_set:
+                rows = new_by_file.get(path, ())
+                code_chunks.extend(new_chunks[i] for i in rows)
+                row_index.extend(n_cached_rows + i for i in rows)
+            else:
+                _, _, start, n_chunks = cached_files[path]
+                code_chunks.extend(cached_chunks[start:start + n_chunks])
+                row_index.extend(range(start, start + n_chunks))
+        
+        changed = bool(changed_files) or len(cached['files']) != len(source_files) \
+            or any(path not in cached_files for path in source_files)
+        if not changed:
+            print(f"[✅] 소스 코드가 바뀌지 않아 캐시된 인덱스 사용: {cache_file}")
+        if not code_chunks:
+            return code_chunks, None, None
+        
+        print("\n[🧠] 임베딩 분석 시작 =========")
+        hashing = _make_hashing_vectorizer()
+        try:
+            if new_chunks:
+                new_counts = hashing.transform(iter_chunk_texts(new_chunks))
+                counts = sp.vstack([cached['counts'], new_counts], format='csr')
+            else:
+                counts = cached['counts']
+            counts = counts[np.asarray(row_index, dtype=np.intp)]
+            vectorizer, chunk_embeddings = _fit_tfidf(hashing, counts)
+            print(f"[✅] 임베딩 생성 완료")
+        except Exception as e:
+            print(f"[❌ 오류] 임베딩 생성 중 오류 발생: {e}")
+            return code_chunks, None, None
+    
+    if cache_file and chunk_embeddings is not None and changed:
+        # 파일별 청크 수 (code_chunks는 source_files 순서로 파일별 연속 구간)
+        n_by_file = Counter(chunk['file_path'] for chunk in code_chunks)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            joblib.dump({
+                'params': params,
+                'files': [(path, mtime, size, n_by_file.get(path, 0)) for path, mtime, size in file_stats],
+                'code_chunks': code_chunks,
+                'counts': counts
+            }, tmp_file)
+            os.replace(tmp_file, cache_file)
+            print(f"[💾] 인덱스 캐시 저장: {cache_file}")
+        except Exception as e:
+            print(f"[⚠️ 경고] 인덱스 캐시 저장 실패: {e}")
+    
+    return code_chunks, vectorizer, chunk_embeddings
+
+def find_matching_chunks(bug_report_text, code_chunks, top_n=10, vectorizer=None, chunk_embeddings=None,
+                         verbose=False):
+    """
+    버그 리포트와 가장 유사한 코드 청크를 찾습니다.
+    
+    vectorizer와 chunk_embeddings(load_or_build_index 결과)를 넘기면 코드 청크 임베딩을 다시 만들지 않고
+    버그 리포트만 변환해 비교합니다. 넘기지 않으면 코드 청크 내용으로 새로 학습합니다.
+    """
     if not code_chunks:
         print("[⚠️] 코드 청크가 없습니다. 매칭 수행 불가.")
         return []
     
-    # 코드 청크 내용 목록 생성
-    chunk_contents = [chunk['content'] for chunk in code_chunks]
-    
     # 버그 리포트 정보
     print(f"[📄] 버그 리포트 길이: {len(bug_report_text):,} 문자")
     
     # 코드 청크 정보
-    print(f"[📁] 코드 청크 수: {len(chunk_contents):,}")
-    avg_chunk_size = sum(len(c) for c in chunk_contents) / len(chunk_contents) if chunk_contents else 0
-    print(f"[📏] 평균 청크 크기: {avg_chunk_size:.1f} 문자")
+    print(f"[📁] 코드 청크 수: {len(code_chunks):,}")
     
-    # 버그 리포트와 코드 청크를 모두 포함하는 텍스트 목록 생성
-    all_texts = [bug_report_text] + chunk_contents
+    if vectorizer is None or chunk_embeddings is None:
+        print("\n[🧠] 임베딩 분석 시작 =========")
+        # 코드 청크 내용을 메모리에 모으지 않고 순서대로 흘려보내 임베딩 생성
+        vectorizer, chunk_embeddings = create_embeddings(iter_chunk_texts(code_chunks), verbose=verbose)
     
-    print("\n[🧠] 임베딩 분석 시작 =========")
-    # 임베딩 생성
-    vectorizer, embeddings = create_embeddings(all_texts)
-    
-    if embeddings is None:
+    if chunk_embeddings is None:
         print("[❌] 임베딩 생성 실패")
         return []
     
-    # 버그 리포트의 임베딩은 첫 번째 항목
-    bug_report_embedding = embeddings[0:1]
+    # 버그 리포트는 코드 청크로 학습한 벡터라이저로 변환만 수행
+    bug_report_embedding = vectorizer.transform([bug_report_text])
     
-    # 코드 청크의 임베딩은 나머지 항목들
-    code_chunk_embeddings = embeddings[1:]
+    # 코드 청크와 공유하는 단어가 하나도 없으면 모든 유사도가 0이므로 행렬 곱을 건너뜀
+    if bug_report_embedding.nnz == 0:
+        print("[⚠️] 버그 리포트에서 공통 어휘 없음 (코드 청크와 겹치는 단어가 없어 매칭 불가)")
+        return []
     
     print(f"[🔄] 버그 리포트와 {len(code_chunks):,}개 코드 청크 간 유사도 계산 중...")
-    # 코사인 유사도 계산
-    similarities = cosine_similarity(bug_report_embedding, code_chunk_embeddings)
-    
-    # 기본 통계 계산 (평균, 최대, 최소 유사도)
-    avg_similarity = np.mean(similarities[0])
-    max_similarity = np.max(similarities[0])
-    min_similarity = np.min(similarities[0])
-    
-    print(f"[📊] 유사도 통계: 평균={avg_similarity:.4f}, 최대={max_similarity:.4f}, 최소={min_similarity:.4f}")
+    # 코사인 유사도 계산 (TF-IDF 행은 이미 L2 정규화되어 있으므로 희소 행렬 곱 한 번이면 됨)
+    # 버그 리포트에 나온 단어 열만 CSC에서 잘라 곱하므로, 그 단어가 하나도 없는 청크는 건드리지 않고 0으로 남음
+    if chunk_embeddings.format != 'csc':
+        chunk_embeddings = chunk_embeddings.tocsc()
+    column_block = chunk_embeddings[:, bug_report_embedding.indices]
+    sims = column_block @ bug_report_embedding.data
+    
+    if verbose:
+        candidate_count = np.unique(column_block.indices).size
+        print(f"[🔍] 공통 단어가 있는 후보 청크: {candidate_count:,}개 ({candidate_count / sims.size * 100:.1f}%)")
+    
+    # 기본 통계 계산 (평균, 최대, 최소 유사도) - 진단용이라 verbose일 때만 배열을 추가로 순회
+    if verbose:
+        avg_similarity = sims.mean()
+        max_similarity = sims.max()
+        min_similarity = sims.min()
+        
+        print(f"[📊] 유사도 통계: 평균={avg_similarity:.4f}, 최대={max_similarity:.4f}, 최소={min_similarity:.4f}")
     
-    # 유사도가 높은 상위 N개 청크 선택
-    top_indices = np.argsort(similarities[0])[-top_n:][::-1]
+    # 유사도가 높은 상위 N개 청크 선택 (전체 정렬 대신 O(N) 부분 선택 후 N개만 정렬)
+    k = min(top_n, sims.size)
+    if k < sims.size:
+        candidate_indices = np.argpartition(sims, -k)[-k:]
+    else:
+        candidate_indices = np.arange(sims.size)
+    top_indices = candidate_indices[np.argsort(-sims[candidate_indices], kind='stable')]
     
     print(f"[🏆] 상위 {top_n}개 매칭 청크 선택 완료")
     print("[🧠] 임베딩 분석 완료 =========\n")
     
-    # 결과 생성
+    # 결과 생성 (미리보기 스니펫은 상위 청크만 파일에서 다시 읽고, 같은 파일은 리더 하나로 읽음)
     results = []
-    for i, idx in enumerate(top_indices, 1):
-        chunk = code_chunks[idx]
-        similarity = float(similarities[0][idx])
-        file_name = os.path.basename(chunk['file_path'])
-        
-        results.append({
-            'file_path': chunk['file_path'],
-            'start_line': chunk['start_line'],
-            'end_line': chunk['end_line'],
-            'similarity': similarity,
-            'snippet': chunk['content'][:200] + '...'  # 미리보기용 짧은 스니펫
-        })
-        
-        # 상위 매칭 결과 로그로 출력
-        print(f"[🔍 #{i}] {file_name} (유사도: {similarity:.4f})")
+    readers = {}
+    try:
+        for i, idx in enumerate(top_indices, 1):
+            chunk = code_chunks[idx]
+            similarity = float(sims[idx])
+            file_name = os.path.basename(chunk['file_path'])
+            
+            results.append({
+                'file_path': chunk['file_path'],
+                'start_line': chunk['start_line'],
+                'end_line': chunk['end_line'],
+                'similarity': similarity,
+                'snippet': _load_snippet(chunk, readers=readers) + '...'  # 미리보기용 짧은 스니펫
+            })
+            
+            # 상위 매칭 결과 로그로 출력
+            print(f"[🔍 #{i}] {file_name} (유사도: {similarity:.4f})")
+    finally:
+        for reader in readers.values():
+            reader.close()
     
     return results
 
@@ -267,14 +726,19 @@ def format_results(matching_chunks):
 def save_results(matching_chunks, output_file="bug_analysis_results.json"):
     """분석 결과를 JSON 파일로 저장합니다."""
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(matching_chunks, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            # C 구현 인코더로 한 번에 UTF-8 바이트를 만들어 기록
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(matching_chunks, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(matching_chunks, f, ensure_ascii=False, indent=2)
         print(f"[✅] 분석 결과가 {output_file}에 저장되었습니다.")
     except Exception as e:
         print(f"[❌ 오류] 결과 저장 중 오류 발생: {e}")
 
 # ===== [메인 실행 함수] =====
-def main(bug_report_path=None, source_dir_path=None, output_file=None, top_n=10, chunk_size=100):
+def main(bug_report_path=None, source_dir_path=None, output_file=None, top_n=10, chunk_size=100, verbose=False):
     """
     버그 리포트와 소스 코드 매칭 분석을 실행합니다.
     
@@ -291,6 +755,7 @@ def main(bug_report_path=None, source_dir_path=None, output_file=None, top_n=10,
         output_file (str, optional): 결과 저장 파일 경로
         top_n (int, optional): 반환할 상위 매칭 개수
         chunk_size (int, optional): 코드 청크 크기 (줄 단위)
+        verbose (bool, optional): 임베딩 진단 정보(텍스트 크기, 차원, 밀도 등) 출력 여부
     """
     # 인자가 함수 호출로 제공되었는지 확인
     using_direct_args = bug_report_path is not None and source_dir_path is not None
@@ -303,6 +768,7 @@ def main(bug_report_path=None, source_dir_path=None, output_file=None, top_n=10,
         parser.add_argument('--output', type=str, default='bug_analysis_results.json', help='결과 저장 파일 경로')
         parser.add_argument('--top_n', type=int, default=10, help='반환할 상위 매칭 개수')
         parser.add_argument('--chunk_size', type=int, default=100, help='코드 청크 크기 (줄 단위)')
+        parser.add_argument('--verbose', action='store_true', help='임베딩 진단 정보 출력')
         
         try:
             args = parser.parse_args()
@@ -311,6 +777,7 @@ def main(bug_report_path=None, source_dir_path=None, output_file=None, top_n=10,
             output_file = args.output
             top_n = args.top_n
             chunk_size = args.chunk_size
+            verbose = args.verbose
         except SystemExit:
             print("\n[⚠️ 경고] CLI 인자 파싱 실패. 다음과 같이 사용하세요:")
             print("python Main.py --bug_report bug파일경로.txt --source_dir 소스코드경로")
@@ -341,15 +808,19 @@ def main(bug_report_path=None, source_dir_path=None, output_file=None, top_n=10,
         print("[❌] 소스 파일이 없습니다. 경로를 확인해주세요.")
         return
     
-    # 4. 코드 청크 분할
-    code_chunks = parse_code_into_chunks(source_files, chunk_size)
+    # 4. 코드 청크 분할 및 임베딩 (소스가 바뀌지 않았으면 캐시 사용)
+    code_chunks, vectorizer, chunk_embeddings = load_or_build_index(source_dir_path, source_files, chunk_size,
+                                                                    verbose=verbose)
     
     # 5. 버그 리포트와 코드 청크 매칭
     print(f"[🔄] 버그 리포트와 코드 청크 매칭 중...")
     matching_chunks = find_matching_chunks(
         bug_report_text=bug_report,
         code_chunks=code_chunks,
-        top_n=top_n
+        top_n=top_n,
+        vectorizer=vectorizer,
+        chunk_embeddings=chunk_embeddings,
+        verbose=verbose
     )
     
     # 6. 결과 출력 및 저장